@@ -0,0 +1,31 @@
+"""version_change_counter
+
+Revision ID: 3f9a6c1d8e20
+Revises: 0122352b4abf
+Create Date: 2026-10-17 09:12:44.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a6c1d8e20'
+down_revision: Union[str, Sequence[str], None] = '0122352b4abf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'versions',
+        sa.Column('change_counter', sa.Integer(), server_default='0', nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('versions', 'change_counter')
@@ -0,0 +1,85 @@
+"""access_path_indexes
+
+Revision ID: 8d41b7e2c9a3
+Revises: 3f9a6c1d8e20
+Create Date: 2026-10-17 14:03:27.190452
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d41b7e2c9a3'
+down_revision: Union[str, Sequence[str], None] = '3f9a6c1d8e20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Single-column indexes replaced by a composite one starting with the same
+# column: (table, old index, old columns, new index, new columns).
+REPLACED_INDEXES = [
+    ('intent_examples', 'ix_example_localization', ['intent_localization_id'],
+     'ix_example_localization_created', ['intent_localization_id', 'created_at']),
+    ('response_variants', 'ix_response_variant_response', ['response_id'],
+     'ix_response_variant_response_priority', ['response_id', 'priority']),
+    ('story_steps', 'ix_step_story', ['story_id'],
+     'ix_step_story_order', ['story_id', 'timeline_index', 'step_order']),
+    ('rule_steps', 'ix_rule_step_rule', ['rule_id'],
+     'ix_rule_step_rule_order', ['rule_id', 'step_order']),
+    ('rule_conditions', 'ix_rule_condition_rule', ['rule_id'],
+     'ix_rule_condition_rule_order', ['rule_id', 'order_index']),
+]
+
+# Referencing columns of foreign keys, so deleting the referenced row does
+# not scan the whole table: (table, index, column, nullable).
+FOREIGN_KEY_INDEXES = [
+    ('story_steps', 'ix_step_intent', 'intent_id', True),
+    ('story_steps', 'ix_step_action', 'action_id', True),
+    ('story_steps', 'ix_step_response', 'response_id', True),
+    ('story_steps', 'ix_step_form', 'form_id', True),
+    ('rule_steps', 'ix_rule_step_intent', 'intent_id', True),
+    ('rule_steps', 'ix_rule_step_action', 'action_id', True),
+    ('rule_steps', 'ix_rule_step_response', 'response_id', True),
+    ('rule_steps', 'ix_rule_step_form', 'form_id', True),
+    ('story_slot_events', 'ix_story_slot_event_slot', 'slot_id', False),
+    ('rule_slot_events', 'ix_rule_slot_event_slot', 'slot_id', False),
+    ('story_step_entities', 'ix_story_step_entity_entity', 'entity_id', False),
+    ('rule_step_entities', 'ix_rule_step_entity_entity', 'entity_id', False),
+    ('form_required_slots', 'ix_form_required_slot_slot', 'slot_id', False),
+    ('slot_mappings', 'ix_slot_mapping_entity', 'entity_id', True),
+    ('form_slot_mappings', 'ix_form_slot_mapping_entity', 'entity_id', True),
+    ('regexes', 'ix_regex_entity', 'entity_id', False),
+    ('lookups', 'ix_lookup_entity', 'entity_id', False),
+    ('synonyms', 'ix_synonym_entity', 'entity_id', False),
+    ('intent_localizations', 'ix_localization_language', 'language_id', False),
+    ('response_variants', 'ix_response_variant_language', 'language_id', True),
+    ('regex_examples', 'ix_regex_example_language', 'language_id', False),
+    ('lookup_examples', 'ix_lookup_example_language', 'language_id', False),
+    ('synonym_examples', 'ix_synonym_example_language', 'language_id', False),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, old_name, _, new_name, new_columns in REPLACED_INDEXES:
+        op.create_index(new_name, table, new_columns, unique=False)
+        op.drop_index(old_name, table_name=table)
+
+    for table, name, column, nullable in FOREIGN_KEY_INDEXES:
+        # Nullable references are mostly NULL (a step has one of intent,
+        # action, response or form); only the set rows are indexed.
+        where = sa.text(f'{column} IS NOT NULL') if nullable else None
+        op.create_index(name, table, [column], unique=False, postgresql_where=where)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, name, _, _ in reversed(FOREIGN_KEY_INDEXES):
+        op.drop_index(name, table_name=table)
+
+    for table, old_name, old_columns, new_name, _ in reversed(REPLACED_INDEXES):
+        op.create_index(old_name, table, old_columns, unique=False)
+        op.drop_index(new_name, table_name=table)
@@ -0,0 +1,122 @@
+"""cascade_version_foreign_keys
+
+Revision ID: b7c1d2e3f4a5
+Revises: 66beba687ce3
+Create Date: 2026-10-16 09:12:04.518230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c1d2e3f4a5'
+down_revision: Union[str, Sequence[str], None] = '66beba687ce3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Ownership edges of a version tree: (table, column, referenced table).
+CASCADE_FOREIGN_KEYS = [
+    ('actions', 'version_id', 'versions'),
+    ('entities', 'version_id', 'versions'),
+    ('forms', 'version_id', 'versions'),
+    ('intents', 'version_id', 'versions'),
+    ('responses', 'version_id', 'versions'),
+    ('rules', 'version_id', 'versions'),
+    ('session_configs', 'version_id', 'versions'),
+    ('slots', 'version_id', 'versions'),
+    ('stories', 'version_id', 'versions'),
+    ('version_languages', 'version_id', 'versions'),
+    ('lookups', 'version_id', 'versions'),
+    ('regexes', 'version_id', 'versions'),
+    ('synonyms', 'version_id', 'versions'),
+    ('entity_groups', 'entity_id', 'entities'),
+    ('entity_roles', 'entity_id', 'entities'),
+    ('form_required_slots', 'form_id', 'forms'),
+    ('form_slot_mappings', 'form_required_slot_id', 'form_required_slots'),
+    ('intent_localizations', 'intent_id', 'intents'),
+    ('intent_examples', 'intent_localization_id', 'intent_localizations'),
+    ('lookup_examples', 'lookup_id', 'lookups'),
+    ('regex_examples', 'regex_id', 'regexes'),
+    ('synonym_examples', 'synonym_id', 'synonyms'),
+    ('response_variants', 'response_id', 'responses'),
+    ('response_components', 'response_variant_id', 'response_variants'),
+    ('response_conditions', 'response_variant_id', 'response_variants'),
+    ('rule_conditions', 'rule_id', 'rules'),
+    ('rule_steps', 'rule_id', 'rules'),
+    ('rule_slot_events', 'rule_step_id', 'rule_steps'),
+    ('rule_step_entities', 'rule_step_id', 'rule_steps'),
+    ('slot_mappings', 'slot_id', 'slots'),
+    ('story_steps', 'story_id', 'stories'),
+    ('story_slot_events', 'story_step_id', 'story_steps'),
+    ('story_step_entities', 'story_step_id', 'story_steps'),
+]
+
+
+# Cross references between objects of the same version. They stay NO ACTION
+# so deleting a single referenced object still fails, but become deferrable
+# so a whole version can be removed in one cascading statement.
+DEFERRABLE_FOREIGN_KEYS = [
+    ('form_required_slots', 'slot_id', 'slots'),
+    ('lookups', 'entity_id', 'entities'),
+    ('regexes', 'entity_id', 'entities'),
+    ('synonyms', 'entity_id', 'entities'),
+    ('slot_mappings', 'entity_id', 'entities'),
+    ('form_slot_mappings', 'entity_id', 'entities'),
+    ('rule_steps', 'intent_id', 'intents'),
+    ('rule_steps', 'action_id', 'actions'),
+    ('rule_steps', 'response_id', 'responses'),
+    ('rule_steps', 'form_id', 'forms'),
+    ('rule_slot_events', 'slot_id', 'slots'),
+    ('rule_step_entities', 'entity_id', 'entities'),
+    ('story_steps', 'intent_id', 'intents'),
+    ('story_steps', 'action_id', 'actions'),
+    ('story_steps', 'response_id', 'responses'),
+    ('story_steps', 'form_id', 'forms'),
+    ('story_slot_events', 'slot_id', 'slots'),
+    ('story_step_entities', 'entity_id', 'entities'),
+]
+
+
+def _replace_foreign_key(table, column, referent, **options):
+    name = f'{table}_{column}_fkey'
+    op.drop_constraint(name, table, type_='foreignkey')
+    op.create_foreign_key(name, table, referent, [column], ['id'], **options)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column, referent in CASCADE_FOREIGN_KEYS:
+        _replace_foreign_key(table, column, referent, ondelete='CASCADE')
+    for table, column, referent in DEFERRABLE_FOREIGN_KEYS:
+        _replace_foreign_key(
+            table, column, referent, deferrable=True, initially='IMMEDIATE'
+        )
+    _replace_foreign_key(
+        'versions', 'parent_version_id', 'versions', ondelete='SET NULL'
+    )
+
+    # Versions waiting for a background purge.
+    op.drop_constraint('ck_version_status', 'versions', type_='check')
+    op.create_check_constraint(
+        'ck_version_status',
+        'versions',
+        "status IN ('draft','locked','archived','purging')",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('ck_version_status', 'versions', type_='check')
+    op.create_check_constraint(
+        'ck_version_status',
+        'versions',
+        "status IN ('draft','locked','archived')",
+    )
+    _replace_foreign_key('versions', 'parent_version_id', 'versions')
+    for table, column, referent in reversed(DEFERRABLE_FOREIGN_KEYS):
+        _replace_foreign_key(table, column, referent)
+    for table, column, referent in reversed(CASCADE_FOREIGN_KEYS):
+        _replace_foreign_key(table, column, referent)
@@ -1,8 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.core.dependencies import get_db
+from app.core.dependencies import get_async_db, get_db
+from app.core.etag import async_version_etag
+from app.core.pagination import PageParams, page_params, page_response
+from app.db.reads import run_read
 from app.schemas.action import ActionCreate, ActionUpdate, ActionResponse
 from app.services.action_service import (
     create_action,
@@ -48,32 +52,38 @@ def create_action_endpoint(
 @router.get(
     "/{project_code}/versions/{status}/actions",
     response_model=List[ActionResponse],
+    dependencies=[Depends(async_version_etag)],
 )
-def list_actions_endpoint(
+async def list_actions_endpoint(
     project_code: str,
     status: str,
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """List all custom actions for a version."""
     if status not in ("draft", "locked", "archived"):
         raise HTTPException(400, "Invalid version status")
-    return list_actions(db, project_code, status)
+    items = await run_read(db, list_actions, project_code, status, page)
+    return page_response(items, page, ActionResponse, "name")
 
 
 @router.get(
     "/{project_code}/versions/{status}/actions/{action_name}",
     response_model=ActionResponse,
+    dependencies=[Depends(async_version_etag)],
 )
-def get_action_endpoint(
+async def get_action_endpoint(
     project_code: str,
     status: str,
     action_name: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get a specific custom action."""
     if status not in ("draft", "locked", "archived"):
         raise HTTPException(400, "Invalid version status")
-    return get_action(db, project_code, status, action_name)
+    return await run_read(
+        db, get_action, project_code, status, action_name, schema=ActionResponse
+    )
 
 
 @router.put(
@@ -1,8 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.core.dependencies import get_db
+from app.core.dependencies import get_async_db, get_db
+from app.core.etag import async_version_etag
+from app.core.pagination import PageParams, page_params, page_response
+from app.db.reads import run_read
 from app.schemas.entity import EntityCreate, EntityResponse, EntityUpdate
 from app.services.entity_service import (
     create_entity,
@@ -42,32 +46,38 @@ def create_entity_endpoint(
 @router.get(
     "/{project_code}/versions/{status}/entities",
     response_model=List[EntityResponse],
+    dependencies=[Depends(async_version_etag)],
 )
-def list_entities_endpoint(
+async def list_entities_endpoint(
     project_code: str,
     status: str,
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """List all entities for a version."""
     if status not in ("draft", "locked", "archived"):
         raise HTTPException(400, "Invalid version status")
-    return list_entities(db, project_code, status)
+    items = await run_read(db, list_entities, project_code, status, page)
+    return page_response(items, page, EntityResponse, "entity_key")
 
 
 @router.get(
     "/{project_code}/versions/{status}/entities/{entity_key}",
     response_model=EntityResponse,
+    dependencies=[Depends(async_version_etag)],
 )
-def get_entity_endpoint(
+async def get_entity_endpoint(
     project_code: str,
     status: str,
     entity_key: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get a specific entity."""
     if status not in ("draft", "locked", "archived"):
         raise HTTPException(400, "Invalid version status")
-    return get_entity(db, project_code, status, entity_key)
+    return await run_read(
+        db, get_entity, project_code, status, entity_key, schema=EntityResponse
+    )
 
 
 @router.put(
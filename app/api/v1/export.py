@@ -1,45 +1,34 @@
 from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Dict, Any, List
-import io
-import zipfile
-import yaml
-
-from app.core.dependencies import get_db
-from app.models import Project, Version, VersionLanguage, Language
-from app.utils.nlu_yaml_writer import export_nlu_yaml
-from app.utils.domain_yaml_writer import export_domain_yaml
-from app.utils.story_yaml_writer import export_stories_yaml
-from app.utils.rule_yaml_writer import export_rules_yaml
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional, Tuple
+from itertools import chain
+
+from app.core.dependencies import get_async_db, get_db
+from app.core.etag import async_version_etag, version_etag
+from app.db.reads import run_read
+from app.models import Version, VersionLanguage, Language
+from app.services.common import get_version_by_status
+from app.utils.nlu_yaml_writer import (
+    export_nlu_yaml,
+    stream_nlu_yaml,
+    iter_nlu_languages,
+    nlu_document,
+    stream_nlu_document,
+)
+from app.utils.domain_yaml_writer import export_domain_yaml, stream_domain_yaml
+from app.utils.story_yaml_writer import export_stories_yaml, stream_stories_yaml
+from app.utils.rule_yaml_writer import export_rules_yaml, stream_rules_yaml
+from app.utils.export_cache import export_cache
+from app.utils.yaml_stream import dump_yaml
+from app.utils.zip_stream import stream_zip
 
 
 router = APIRouter(prefix="/projects", tags=["Export"])
 
 
-def get_version_by_status(db: Session, project_code: str, status: str) -> Version:
-    project = (
-        db.query(Project)
-        .filter(Project.project_code == project_code)
-        .first()
-    )
-    if not project:
-        raise HTTPException(404, "Project not found")
-
-    version = (
-        db.query(Version)
-        .filter(
-            Version.project_id == project.id,
-            Version.status == status,
-        )
-        .first()
-    )
-    if not version:
-        raise HTTPException(404, f"Version with status '{status}' not found")
-
-    return version
-
-
 def get_version_languages(db: Session, version_id: str) -> List[str]:
     results = (
         db.query(Language.language_code)
@@ -51,20 +40,75 @@ def get_version_languages(db: Session, version_id: str) -> List[str]:
 
 
 def dict_to_yaml(data: Dict[str, Any]) -> str:
-    
-    def str_representer(dumper, data):
-        if '\n' in data:
-            return dumper.represent_scalar('tag:yaml.org,2002:str', data, style='|')
-        return dumper.represent_scalar('tag:yaml.org,2002:str', data)
-    
-    yaml.add_representer(str, str_representer)
-    
-    return yaml.dump(
-        data,
-        default_flow_style=False,
-        allow_unicode=True,
-        sort_keys=False,
-        width=1000
+    return dump_yaml(data)
+
+
+def start_stream(chunks: Iterator[str]) -> Iterator[str]:
+    """
+    Pull the first chunk eagerly so validation errors raised by the writer
+    still turn into a normal HTTP error instead of a broken stream.
+    """
+    first = next(chunks, "")
+    return chain([first], chunks)
+
+
+def cached_stream(
+    version: Version,
+    artifact: str,
+    language: str,
+    render: Callable[[], Iterator[bytes]],
+) -> Iterator[bytes]:
+    """
+    Bytes of an export artifact. Artifacts of locked versions come from the
+    export cache, and are rendered and stored there on a miss; anything
+    else is rendered on every call.
+    """
+    if version.status != "locked":
+        return render()
+
+    key = (version.id, str(version.updated_at), artifact, language)
+    cached = export_cache.get(key)
+    if cached is not None:
+        return cached
+    return export_cache.fill(key, render())
+
+
+def json_export(
+    version: Version,
+    artifact: str,
+    language: str,
+    build: Callable[[], Dict[str, Any]],
+):
+    if version.status != "locked":
+        return build()
+
+    body = b"".join(
+        cached_stream(
+            version,
+            artifact,
+            language,
+            lambda: [JSONResponse(jsonable_encoder(build())).body],
+        )
+    )
+    return Response(body, media_type="application/json")
+
+
+def yaml_download(
+    version: Version,
+    artifact: str,
+    language: str,
+    render: Callable[[], Iterator[str]],
+    filename: str,
+) -> StreamingResponse:
+    def encoded():
+        return (chunk.encode("utf-8") for chunk in start_stream(render()))
+
+    return StreamingResponse(
+        cached_stream(version, artifact, language, encoded),
+        media_type="application/x-yaml",
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}"
+        }
     )
 
 
@@ -135,76 +179,223 @@ def generate_credentials_yaml() -> str:
     return dict_to_yaml(credentials)
 
 
+def zip_member(
+    chunks: Iterator[str],
+    label: str,
+    empty_document: str,
+    missing: Optional[str] = None,
+) -> Iterator[str]:
+    """
+    Text of one ZIP member. The entry is already open in the archive when
+    the writer runs, so its errors are written into the file instead of
+    aborting the download: before the first chunk the member becomes
+    `empty_document` under an error comment (or under `missing` for an
+    HTTPException), later on the partial file ends with the comment.
+    """
+    try:
+        first = next(chunks, "")
+    except HTTPException as e:
+        comment = missing or f"# Error exporting {label}: {e.detail}"
+        yield f"{comment}\n{empty_document}"
+        return
+    except Exception as e:
+        yield f"# Error exporting {label}: {e}\n{empty_document}"
+        return
+
+    yield first
+    try:
+        yield from chunks
+    except Exception as e:
+        yield f"\n# Error exporting {label}: {e}\n"
+
+
+def zip_members(
+    db: Session,
+    project_code: str,
+    status: str,
+    version: Version,
+    languages: List[str],
+    include_config: bool,
+) -> Iterator[Tuple[str, Iterable[str]]]:
+    """
+    Yield (archive name, text chunks) for every file of the ZIP export.
+    Each member is generated only when the archive writer asks for it.
+    """
+    yield "domain.yml", zip_member(
+        stream_domain_yaml(db, version.id), "domain", "version: '3.1'"
+    )
+    yield "data/stories.yml", zip_member(
+        stream_stories_yaml(db, version.id), "stories", "version: '3.1'\nstories: []"
+    )
+    yield "data/rules.yml", zip_member(
+        stream_rules_yaml(db, version.id), "rules", "version: '3.1'\nrules: []"
+    )
+
+    for lang, blocks in iter_nlu_languages(db, version.id, languages):
+        yield f"data/nlu_{lang}.yml", zip_member(
+            stream_nlu_document(blocks),
+            f"NLU for language '{lang}'",
+            "version: '3.1'\nnlu: []",
+            missing=f"# No NLU data for language '{lang}'",
+        )
+
+    if include_config:
+        yield "config.yml", [generate_config_yaml()]
+        yield "endpoints.yml", [generate_endpoints_yaml()]
+        yield "credentials.yml", [generate_credentials_yaml()]
+
+    readme_content = f"""# RASA Bot Export
+        
+Project: {project_code}
+Version: {version.version_label} ({status})
+Languages: {', '.join(languages)}
+
+## Files Included
+
+- `domain.yml` - Domain configuration (intents, entities, slots, forms, responses, actions)
+- `data/stories.yml` - Conversation stories
+- `data/rules.yml` - Conversation rules
+- `data/nlu_*.yml` - NLU training data for each language
+- `config.yml` - RASA configuration template
+- `endpoints.yml` - Endpoints configuration template
+- `credentials.yml` - Channel credentials template
+
+## Getting Started
+
+1. Install RASA: `pip install rasa`
+2. Train the model: `rasa train`
+3. Test in shell: `rasa shell`
+4. Run the bot: `rasa run --enable-api`
 
-@router.get("/{project_code}/versions/{status}/export/nlu/{language_code}")
-def export_nlu(
+## Documentation
+
+- RASA Documentation: https://rasa.com/docs/
+- Model Configuration: https://rasa.com/docs/rasa/model-configuration/
+"""
+    yield "README.md", [readme_content]
+
+
+@router.get(
+    "/{project_code}/versions/{status}/export/nlu/{language_code}",
+    dependencies=[Depends(async_version_etag)],
+)
+async def export_nlu(
     project_code: str,
     status: str,
     language_code: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Dict[str, Any]:
     if status not in ("draft", "locked"):
         raise HTTPException(400, "Invalid version status for export")
-    
-    version = get_version_by_status(db, project_code, status)
-    return export_nlu_yaml(db=db, version_id=version.id, language_code=language_code)
 
+    def build(session: Session):
+        version = get_version_by_status(session, project_code, status)
+        return json_export(
+            version,
+            "nlu",
+            language_code,
+            lambda: export_nlu_yaml(
+                db=session, version_id=version.id, language_code=language_code
+            ),
+        )
 
-@router.get("/{project_code}/versions/{status}/export/domain")
-def export_domain(
+    return await run_read(db, build)
+
+
+@router.get(
+    "/{project_code}/versions/{status}/export/domain",
+    dependencies=[Depends(async_version_etag)],
+)
+async def export_domain(
     project_code: str,
     status: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Dict[str, Any]:
     if status not in ("draft", "locked"):
         raise HTTPException(400, "Invalid version status for export")
-    
-    version = get_version_by_status(db, project_code, status)
-    return export_domain_yaml(db, version.id)
 
+    def build(session: Session):
+        version = get_version_by_status(session, project_code, status)
+        return json_export(version, "domain", "", lambda: export_domain_yaml(session, version.id))
 
-@router.get("/{project_code}/versions/{status}/export/stories")
-def export_stories(
+    return await run_read(db, build)
+
+
+@router.get(
+    "/{project_code}/versions/{status}/export/stories",
+    dependencies=[Depends(async_version_etag)],
+)
+async def export_stories(
     project_code: str,
     status: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Dict[str, Any]:
     if status not in ("draft", "locked"):
         raise HTTPException(400, "Invalid version status for export")
-    
-    version = get_version_by_status(db, project_code, status)
-    return export_stories_yaml(db, version.id)
 
+    def build(session: Session):
+        version = get_version_by_status(session, project_code, status)
+        return json_export(version, "stories", "", lambda: export_stories_yaml(session, version.id))
 
-@router.get("/{project_code}/versions/{status}/export/rules")
-def export_rules(
+    return await run_read(db, build)
+
+
+@router.get(
+    "/{project_code}/versions/{status}/export/rules",
+    dependencies=[Depends(async_version_etag)],
+)
+async def export_rules(
     project_code: str,
     status: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Dict[str, Any]:
     if status not in ("draft", "locked"):
         raise HTTPException(400, "Invalid version status for export")
-    
-    version = get_version_by_status(db, project_code, status)
-    return export_rules_yaml(db, version.id)
 
+    def build(session: Session):
+        version = get_version_by_status(session, project_code, status)
+        return json_export(version, "rules", "", lambda: export_rules_yaml(session, version.id))
 
-@router.get("/{project_code}/versions/{status}/export/all")
-def export_all_json(
+    return await run_read(db, build)
+
+
+@router.get(
+    "/{project_code}/versions/{status}/export/all",
+    dependencies=[Depends(async_version_etag)],
+)
+async def export_all_json(
     project_code: str,
     status: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Dict[str, Any]:
 
     if status not in ("draft", "locked"):
         raise HTTPException(400, "Invalid version status for export")
-    
-    version = get_version_by_status(db, project_code, status)
-    languages = get_version_languages(db, version.id)
-    
-    if not languages:
-        raise HTTPException(400, "No languages configured for this version")
-    
+
+    def build(session: Session):
+        version = get_version_by_status(session, project_code, status)
+        languages = get_version_languages(session, version.id)
+
+        if not languages:
+            raise HTTPException(400, "No languages configured for this version")
+
+        return json_export(
+            version,
+            f"all:{project_code}",
+            ",".join(languages),
+            lambda: build_all_json(session, project_code, status, version, languages),
+        )
+
+    return await run_read(db, build)
+
+
+def build_all_json(
+    db: Session,
+    project_code: str,
+    status: str,
+    version: Version,
+    languages: List[str],
+) -> Dict[str, Any]:
     result = {
         "project_code": project_code,
         "version_status": status,
@@ -224,20 +415,19 @@ def export_all_json(
         }
     }
     
-    for lang in languages:
+    for lang, blocks in iter_nlu_languages(db, version.id, languages):
         try:
-            result["files"]["nlu"][lang] = export_nlu_yaml(
-                db=db, 
-                version_id=version.id, 
-                language_code=lang
-            )
+            result["files"]["nlu"][lang] = nlu_document(blocks)
         except HTTPException:
             pass
     
     return result
 
 
-@router.get("/{project_code}/versions/{status}/export/zip")
+@router.get(
+    "/{project_code}/versions/{status}/export/zip",
+    dependencies=[Depends(version_etag)],
+)
 def export_all_zip(
     project_code: str,
     status: str,
@@ -254,78 +444,30 @@ def export_all_zip(
     if not languages:
         raise HTTPException(400, "No languages configured for this version")
     
-    zip_buffer = io.BytesIO()
-    
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        try:
-            domain_data = export_domain_yaml(db, version.id)
-            zip_file.writestr("domain.yml", dict_to_yaml(domain_data))
-        except Exception as e:
-            zip_file.writestr("domain.yml", f"# Error exporting domain: {e}\nversion: '3.1'")
-        
-        try:
-            stories_data = export_stories_yaml(db, version.id)
-            zip_file.writestr("data/stories.yml", dict_to_yaml(stories_data))
-        except Exception as e:
-            zip_file.writestr("data/stories.yml", f"# Error exporting stories: {e}\nversion: '3.1'\nstories: []")
-        
+    filename = f"{project_code}_{version.version_label}_{status}_rasa_export.zip"
+
+    def close_session_after(chunks):
         try:
-            rules_data = export_rules_yaml(db, version.id)
-            zip_file.writestr("data/rules.yml", dict_to_yaml(rules_data))
-        except Exception as e:
-            zip_file.writestr("data/rules.yml", f"# Error exporting rules: {e}\nversion: '3.1'\nrules: []")
-        
-        for lang in languages:
-            try:
-                nlu_data = export_nlu_yaml(db=db, version_id=version.id, language_code=lang)
-                zip_file.writestr(f"data/nlu_{lang}.yml", dict_to_yaml(nlu_data))
-            except HTTPException as e:
-                zip_file.writestr(
-                    f"data/nlu_{lang}.yml", 
-                    f"# No NLU data for language '{lang}'\nversion: '3.1'\nnlu: []"
+            yield from chunks
+        finally:
+            db.close()
+
+    def render():
+        return close_session_after(
+            stream_zip(
+                zip_members(
+                    db, project_code, status, version, languages, include_config
                 )
-        
-        if include_config:
-            zip_file.writestr("config.yml", generate_config_yaml())
-            zip_file.writestr("endpoints.yml", generate_endpoints_yaml())
-            zip_file.writestr("credentials.yml", generate_credentials_yaml())
-        
-        readme_content = f"""# RASA Bot Export
-        
-Project: {project_code}
-Version: {version.version_label} ({status})
-Languages: {', '.join(languages)}
-
-## Files Included
-
-- `domain.yml` - Domain configuration (intents, entities, slots, forms, responses, actions)
-- `data/stories.yml` - Conversation stories
-- `data/rules.yml` - Conversation rules
-- `data/nlu_*.yml` - NLU training data for each language
-- `config.yml` - RASA configuration template
-- `endpoints.yml` - Endpoints configuration template
-- `credentials.yml` - Channel credentials template
-
-## Getting Started
-
-1. Install RASA: `pip install rasa`
-2. Train the model: `rasa train`
-3. Test in shell: `rasa shell`
-4. Run the bot: `rasa run --enable-api`
-
-## Documentation
+            )
+        )
 
-- RASA Documentation: https://rasa.com/docs/
-- Model Configuration: https://rasa.com/docs/rasa/model-configuration/
-"""
-        zip_file.writestr("README.md", readme_content)
-    
-    zip_buffer.seek(0)
-    
-    filename = f"{project_code}_{version.version_label}_{status}_rasa_export.zip"
-    
     return StreamingResponse(
-        zip_buffer,
+        cached_stream(
+            version,
+            f"zip:{project_code}:{include_config}",
+            ",".join(languages),
+            render,
+        ),
         media_type="application/zip",
         headers={
             "Content-Disposition": f"attachment; filename={filename}"
@@ -333,7 +475,10 @@ Languages: {', '.join(languages)}
     )
 
 
-@router.get("/{project_code}/versions/{status}/export/nlu/{language_code}/download")
+@router.get(
+    "/{project_code}/versions/{status}/export/nlu/{language_code}/download",
+    dependencies=[Depends(version_etag)],
+)
 def download_nlu_yaml(
     project_code: str,
     status: str,
@@ -344,20 +489,19 @@ def download_nlu_yaml(
         raise HTTPException(400, "Invalid version status for export")
     
     version = get_version_by_status(db, project_code, status)
-    data = export_nlu_yaml(db=db, version_id=version.id, language_code=language_code)
-    
-    yaml_content = dict_to_yaml(data)
-    
-    return StreamingResponse(
-        io.BytesIO(yaml_content.encode('utf-8')),
-        media_type="application/x-yaml",
-        headers={
-            "Content-Disposition": f"attachment; filename=nlu_{language_code}.yml"
-        }
+    return yaml_download(
+        version,
+        "nlu.yml",
+        language_code,
+        lambda: stream_nlu_yaml(db, version.id, language_code),
+        f"nlu_{language_code}.yml",
     )
 
 
-@router.get("/{project_code}/versions/{status}/export/domain/download")
+@router.get(
+    "/{project_code}/versions/{status}/export/domain/download",
+    dependencies=[Depends(version_etag)],
+)
 def download_domain_yaml(
     project_code: str,
     status: str,
@@ -367,20 +511,19 @@ def download_domain_yaml(
         raise HTTPException(400, "Invalid version status for export")
     
     version = get_version_by_status(db, project_code, status)
-    data = export_domain_yaml(db, version.id)
-    
-    yaml_content = dict_to_yaml(data)
-    
-    return StreamingResponse(
-        io.BytesIO(yaml_content.encode('utf-8')),
-        media_type="application/x-yaml",
-        headers={
-            "Content-Disposition": "attachment; filename=domain.yml"
-        }
+    return yaml_download(
+        version,
+        "domain.yml",
+        "",
+        lambda: stream_domain_yaml(db, version.id),
+        "domain.yml",
     )
 
 
-@router.get("/{project_code}/versions/{status}/export/stories/download")
+@router.get(
+    "/{project_code}/versions/{status}/export/stories/download",
+    dependencies=[Depends(version_etag)],
+)
 def download_stories_yaml(
     project_code: str,
     status: str,
@@ -390,20 +533,19 @@ def download_stories_yaml(
         raise HTTPException(400, "Invalid version status for export")
     
     version = get_version_by_status(db, project_code, status)
-    data = export_stories_yaml(db, version.id)
-    
-    yaml_content = dict_to_yaml(data)
-    
-    return StreamingResponse(
-        io.BytesIO(yaml_content.encode('utf-8')),
-        media_type="application/x-yaml",
-        headers={
-            "Content-Disposition": "attachment; filename=stories.yml"
-        }
+    return yaml_download(
+        version,
+        "stories.yml",
+        "",
+        lambda: stream_stories_yaml(db, version.id),
+        "stories.yml",
     )
 
 
-@router.get("/{project_code}/versions/{status}/export/rules/download")
+@router.get(
+    "/{project_code}/versions/{status}/export/rules/download",
+    dependencies=[Depends(version_etag)],
+)
 def download_rules_yaml(
     project_code: str,
     status: str,
@@ -413,15 +555,11 @@ def download_rules_yaml(
         raise HTTPException(400, "Invalid version status for export")
     
     version = get_version_by_status(db, project_code, status)
-    data = export_rules_yaml(db, version.id)
-    
-    yaml_content = dict_to_yaml(data)
-    
-    return StreamingResponse(
-        io.BytesIO(yaml_content.encode('utf-8')),
-        media_type="application/x-yaml",
-        headers={
-            "Content-Disposition": "attachment; filename=rules.yml"
-        }
+    return yaml_download(
+        version,
+        "rules.yml",
+        "",
+        lambda: stream_rules_yaml(db, version.id),
+        "rules.yml",
     )
 
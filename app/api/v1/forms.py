@@ -1,8 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.core.dependencies import get_db
+from app.core.dependencies import get_async_db, get_db
+from app.core.etag import async_version_etag, version_etag
+from app.core.pagination import PageParams, page_params, page_response
+from app.db.reads import run_read
 from app.schemas.form import (
     FormCreate,
     FormResponse,
@@ -57,32 +61,38 @@ def create_form_endpoint(
 @router.get(
     "/{project_code}/versions/{status}/forms",
     response_model=List[FormResponse],
+    dependencies=[Depends(async_version_etag)],
 )
-def list_forms_endpoint(
+async def list_forms_endpoint(
     project_code: str,
     status: str,
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """List all forms for a version."""
     if status not in ("draft", "locked", "archived"):
         raise HTTPException(400, "Invalid version status")
-    return list_forms(db, project_code, status)
+    items = await run_read(db, list_forms, project_code, status, page)
+    return page_response(items, page, FormResponse, "name")
 
 
 @router.get(
     "/{project_code}/versions/{status}/forms/{form_name}",
     response_model=FormResponse,
+    dependencies=[Depends(async_version_etag)],
 )
-def get_form_endpoint(
+async def get_form_endpoint(
     project_code: str,
     status: str,
     form_name: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get a specific form."""
     if status not in ("draft", "locked", "archived"):
         raise HTTPException(400, "Invalid version status")
-    return get_form(db, project_code, status, form_name)
+    return await run_read(
+        db, get_form, project_code, status, form_name, schema=FormResponse
+    )
 
 
 @router.put(
@@ -141,6 +151,7 @@ def add_required_slot_endpoint(
 @router.get(
     "/{project_code}/versions/{status}/forms/{form_name}/slots",
     response_model=List[FormRequiredSlotResponse],
+    dependencies=[Depends(version_etag)],
 )
 def list_required_slots_endpoint(
     project_code: str,
@@ -214,6 +225,7 @@ def add_form_slot_mapping_endpoint(
 @router.get(
     "/{project_code}/versions/{status}/forms/{form_name}/slots/{slot_name}/mappings",
     response_model=List[FormSlotMappingResponse],
+    dependencies=[Depends(version_etag)],
 )
 def list_form_slot_mappings_endpoint(
     project_code: str,
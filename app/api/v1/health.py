@@ -0,0 +1,21 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter
+
+from app.db.engine import async_engine, engine, pool_metrics
+
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+
+@router.get("/db-pool")
+def db_pool_endpoint() -> Dict[str, Any]:
+    """
+    Connection pool state (size, checked out, overflow) and counters of
+    checkouts, timeouts and time spent waiting for a connection, for the
+    sync and the async engine.
+    """
+    return {
+        "sync": pool_metrics(engine),
+        "async": pool_metrics(async_engine.sync_engine),
+    }
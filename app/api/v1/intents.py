@@ -1,8 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+import json
+from typing import List, Dict, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Dict
 
-from app.core.dependencies import get_db
+from app.core.dependencies import get_async_db, get_db
+from app.core.etag import async_version_etag, version_etag
+from app.core.pagination import PageParams, page_params, page_response
+from app.db.reads import run_read
 from app.schemas.intent import (
     IntentCreate,
     IntentResponse,
@@ -15,6 +22,7 @@ from app.services.intent_service import (
     list_intents,
     get_intent,
     get_intent_examples,
+    iter_intent_examples,
     update_intent,
     delete_intent,
     delete_intent_examples,
@@ -41,33 +49,38 @@ def create_intent_endpoint(
 @router.get(
     "/{project_code}/versions/{status}/intents",
     response_model=List[IntentResponse],
+    dependencies=[Depends(async_version_etag)],
 )
-def list_intents_endpoint(
+async def list_intents_endpoint(
     project_code: str,
     status: str,
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """List all intents for a version."""
     if status not in ("draft", "locked", "archived"):
         raise HTTPException(400, "Invalid version status")
-    intents = list_intents(db, project_code, status)
-    return [IntentResponse(id=i.id, intent_name=i.intent_name) for i in intents]
+    items = await run_read(db, list_intents, project_code, status, page)
+    return page_response(items, page, IntentResponse, "intent_name")
 
 
 @router.get(
     "/{project_code}/versions/{status}/intents/{intent_name}",
     response_model=IntentResponse,
+    dependencies=[Depends(async_version_etag)],
 )
-def get_intent_endpoint(
+async def get_intent_endpoint(
     project_code: str,
     status: str,
     intent_name: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get a specific intent."""
     if status not in ("draft", "locked", "archived"):
         raise HTTPException(400, "Invalid version status")
-    return get_intent(db, project_code, status, intent_name)
+    return await run_read(
+        db, get_intent, project_code, status, intent_name, schema=IntentResponse
+    )
 
 
 @router.put(
@@ -119,6 +132,7 @@ def upsert_examples_endpoint(
 
 @router.get(
     "/{project_code}/versions/{status}/intents/{intent_name}/examples",
+    dependencies=[Depends(version_etag)],
 )
 def get_intent_examples_endpoint(
     project_code: str,
@@ -132,6 +146,30 @@ def get_intent_examples_endpoint(
     return get_intent_examples(db, project_code, status, intent_name)
 
 
+@router.get(
+    "/{project_code}/versions/{status}/intent-examples",
+    dependencies=[Depends(version_etag)],
+)
+def bulk_intent_examples_endpoint(
+    project_code: str,
+    status: str,
+    intent: Optional[List[str]] = Query(None, description="Only these intents"),
+    language: Optional[List[str]] = Query(None, description="Only these languages"),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    """
+    Stream examples of all (or the selected) intents grouped by language,
+    one JSON object per intent and line (NDJSON).
+    """
+    if status not in ("draft", "locked", "archived"):
+        raise HTTPException(400, "Invalid version status")
+    intents = iter_intent_examples(db, project_code, status, intent, language)
+    return StreamingResponse(
+        (json.dumps(item, ensure_ascii=False) + "\n" for item in intents),
+        media_type="application/x-ndjson",
+    )
+
+
 @router.delete(
     "/{project_code}/versions/draft/intents/{intent_name}/examples/{language_code}",
     status_code=204,
@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.core.dependencies import get_db
+from app.core.dependencies import get_async_db, get_db
+from app.db.reads import run_read
 from app.schemas.language import LanguageCreate, LanguageResponse
 from app.services.language_service import create_language, list_languages
 from app.models.language import Language
@@ -40,6 +42,6 @@ def create_new_language(
     "/",
     response_model=List[LanguageResponse],
 )
-def get_languages(db: Session = Depends(get_db)):
+async def get_languages(db: AsyncSession = Depends(get_async_db)):
     """List all languages."""
-    return list_languages(db)
+    return await run_read(db, list_languages)
@@ -1,8 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.core.dependencies import get_db
+from app.core.dependencies import get_async_db, get_db
+from app.core.etag import async_version_etag, version_etag
+from app.core.pagination import PageParams, page_params, page_response
+from app.db.reads import run_read
 from app.schemas.lookup import (
     LookupCreate,
     LookupResponse,
@@ -45,32 +49,38 @@ def create_lookup_endpoint(
 @router.get(
     "/{project_code}/versions/{status}/lookups",
     response_model=List[LookupResponse],
+    dependencies=[Depends(async_version_etag)],
 )
-def list_lookups_endpoint(
+async def list_lookups_endpoint(
     project_code: str,
     status: str,
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """List all lookups for a version."""
     if status not in ("draft", "locked", "archived"):
         raise HTTPException(400, "Invalid version status")
-    return list_lookups(db, project_code, status)
+    items = await run_read(db, list_lookups, project_code, status, page)
+    return page_response(items, page, LookupResponse, "lookup_name")
 
 
 @router.get(
     "/{project_code}/versions/{status}/lookups/{lookup_name}",
     response_model=LookupResponse,
+    dependencies=[Depends(async_version_etag)],
 )
-def get_lookup_endpoint(
+async def get_lookup_endpoint(
     project_code: str,
     status: str,
     lookup_name: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get a specific lookup."""
     if status not in ("draft", "locked", "archived"):
         raise HTTPException(400, "Invalid version status")
-    return get_lookup(db, project_code, status, lookup_name)
+    return await run_read(
+        db, get_lookup, project_code, status, lookup_name, schema=LookupResponse
+    )
 
 
 @router.delete(
@@ -108,6 +118,7 @@ def upsert_lookup_examples_endpoint(
 
 @router.get(
     "/{project_code}/versions/{status}/lookups/{lookup_name}/examples/{language_code}",
+    dependencies=[Depends(version_etag)],
 )
 def get_lookup_examples_endpoint(
     project_code: str,
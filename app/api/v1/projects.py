@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.core.dependencies import get_db
+from app.core.dependencies import get_async_db, get_db
+from app.core.etag import version_etag
+from app.db.reads import run_read
 from app.schemas.project import ProjectCreate, ProjectResponse, ProjectLanguageCreate
 from app.schemas.version import VersionResponse, VersionLanguageCreate, VersionLanguageResponse
 from app.services.project_service import create_project, list_projects
@@ -11,6 +14,12 @@ from app.services.version_service import list_project_versions
 from app.services.version_language_service import add_language_to_draft_version, list_version_languages
 from app.services.promotion_service import promote_draft_to_production
 from app.services.rollback_service import rollback_production
+from app.schemas.promotion_job import PromotionJobResponse
+from app.services.promotion_job_service import (
+    submit_promotion_job,
+    get_promotion_job,
+    cancel_promotion_job,
+)
 
 
 router = APIRouter(prefix="/projects", tags=["Projects"])
@@ -37,9 +46,9 @@ def create_new_project(
     "/",
     response_model=List[ProjectResponse],
 )
-def get_projects(db: Session = Depends(get_db)):
+async def get_projects(db: AsyncSession = Depends(get_async_db)):
     """List all projects."""
-    return list_projects(db)
+    return await run_read(db, list_projects)
 
 
 # -------------------------------------------------
@@ -85,21 +94,12 @@ def get_project_languages(
     "/{project_code}/versions",
     response_model=List[VersionResponse],
 )
-def get_project_versions(
+async def get_project_versions(
     project_code: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """List all versions for a project."""
-    versions = list_project_versions(db, project_code)
-    return [
-        VersionResponse(
-            id=v.id,
-            version_label=v.version_label,
-            status=v.status,
-            created_at=v.created_at,
-        )
-        for v in versions
-    ]
+    return await run_read(db, list_project_versions, project_code)
 
 
 # -------------------------------------------------
@@ -121,6 +121,7 @@ def add_language_to_draft(
 
 @router.get(
     "/{project_code}/versions/{status}/languages",
+    dependencies=[Depends(version_etag)],
 )
 def get_version_languages(
     project_code: str,
@@ -150,10 +151,16 @@ def get_version_languages(
 )
 def promote(
     project_code: str,
+    background_tasks: BackgroundTasks,
+    background_purge: bool = Query(False),
     db: Session = Depends(get_db),
 ):
     """Promote draft version to production."""
-    return promote_draft_to_production(db, project_code)
+    return promote_draft_to_production(
+        db,
+        project_code,
+        background_tasks if background_purge else None,
+    )
 
 
 @router.post(
@@ -161,7 +168,69 @@ def promote(
 )
 def rollback(
     project_code: str,
+    background_tasks: BackgroundTasks,
+    background_purge: bool = Query(False),
     db: Session = Depends(get_db),
 ):
     """Rollback production to archived version."""
-    return rollback_production(db, project_code)
+    return rollback_production(
+        db,
+        project_code,
+        background_tasks if background_purge else None,
+    )
+
+
+# -------------------------------------------------
+# PROMOTION / ROLLBACK JOBS
+# -------------------------------------------------
+
+@router.post(
+    "/{project_code}/promote/jobs",
+    response_model=PromotionJobResponse,
+    status_code=202,
+)
+def submit_promote_job(
+    project_code: str,
+    db: Session = Depends(get_db),
+):
+    """Queue promotion of the draft version as a background job."""
+    return submit_promotion_job(db, project_code, "promote")
+
+
+@router.post(
+    "/{project_code}/rollback/jobs",
+    response_model=PromotionJobResponse,
+    status_code=202,
+)
+def submit_rollback_job(
+    project_code: str,
+    db: Session = Depends(get_db),
+):
+    """Queue rollback to the archived version as a background job."""
+    return submit_promotion_job(db, project_code, "rollback")
+
+
+@router.get(
+    "/{project_code}/jobs/{job_id}",
+    response_model=PromotionJobResponse,
+)
+def get_job(
+    project_code: str,
+    job_id: str,
+    db: Session = Depends(get_db),
+):
+    """Get phase, copied row counts and elapsed time of a job."""
+    return get_promotion_job(db, project_code, job_id)
+
+
+@router.post(
+    "/{project_code}/jobs/{job_id}/cancel",
+    response_model=PromotionJobResponse,
+)
+def cancel_job(
+    project_code: str,
+    job_id: str,
+    db: Session = Depends(get_db),
+):
+    """Cancel a queued or running job. A running job rolls back."""
+    return cancel_promotion_job(db, project_code, job_id)
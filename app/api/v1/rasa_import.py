@@ -0,0 +1,49 @@
+import tempfile
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.core.dependencies import get_db
+from app.schemas.rasa_import import RasaImportResponse
+from app.services.import_service import import_rasa_zip
+
+
+router = APIRouter(prefix="/projects", tags=["Import"])
+
+# Uploads larger than this are spooled to a temporary file.
+UPLOAD_SPOOL_SIZE = 16 * 1024 * 1024
+
+
+@router.post(
+    "/{project_code}/versions/draft/import",
+    response_model=RasaImportResponse,
+)
+async def import_rasa_project_api(
+    project_code: str,
+    request: Request,
+    replace: bool = Query(False, description="Replace the draft's content"),
+    language: Optional[str] = Query(
+        None, description="Language of NLU files not named nlu_<code>.yml"
+    ),
+    db: Session = Depends(get_db),
+):
+    """
+    Import a Rasa project into the draft version in one transaction.
+
+    The request body is a ZIP archive holding domain.yml (or domain/) and
+    data/*.yml, such as the one produced by the ZIP export:
+    ```
+    curl -X POST --data-binary @bot.zip -H "Content-Type: application/zip" \\
+        ".../projects/P1/versions/draft/import?replace=true"
+    ```
+    The draft must be empty unless `replace` is set.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_SIZE) as archive:
+        async for chunk in request.stream():
+            archive.write(chunk)
+        archive.seek(0)
+        return await run_in_threadpool(
+            import_rasa_zip, db, project_code, archive, replace, language
+        )
@@ -1,8 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.core.dependencies import get_db
+from app.core.dependencies import get_async_db, get_db
+from app.core.etag import async_version_etag, version_etag
+from app.core.pagination import PageParams, page_params, page_response
+from app.db.reads import run_read
 from app.schemas.regex import (
     RegexCreate,
     RegexResponse,
@@ -44,32 +48,38 @@ def create_regex_endpoint(
 @router.get(
     "/{project_code}/versions/{status}/regexes",
     response_model=List[RegexResponse],
+    dependencies=[Depends(async_version_etag)],
 )
-def list_regexes_endpoint(
+async def list_regexes_endpoint(
     project_code: str,
     status: str,
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """List all regexes for a version."""
     if status not in ("draft", "locked", "archived"):
         raise HTTPException(400, "Invalid version status")
-    return list_regexes(db, project_code, status)
+    items = await run_read(db, list_regexes, project_code, status, page)
+    return page_response(items, page, RegexResponse, "regex_name")
 
 
 @router.get(
     "/{project_code}/versions/{status}/regexes/{regex_name}",
     response_model=RegexResponse,
+    dependencies=[Depends(async_version_etag)],
 )
-def get_regex_endpoint(
+async def get_regex_endpoint(
     project_code: str,
     status: str,
     regex_name: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get a specific regex."""
     if status not in ("draft", "locked", "archived"):
         raise HTTPException(400, "Invalid version status")
-    return get_regex(db, project_code, status, regex_name)
+    return await run_read(
+        db, get_regex, project_code, status, regex_name, schema=RegexResponse
+    )
 
 
 @router.delete(
@@ -107,6 +117,7 @@ def upsert_regex_examples_endpoint(
 
 @router.get(
     "/{project_code}/versions/{status}/regexes/{regex_name}/examples/{language_code}",
+    dependencies=[Depends(version_etag)],
 )
 def get_regex_examples_endpoint(
     project_code: str,
@@ -1,8 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.core.dependencies import get_db
+from app.core.dependencies import get_async_db, get_db
+from app.core.etag import async_version_etag, version_etag
+from app.core.pagination import PageParams, page_params, page_response
+from app.db.reads import run_read
 from app.schemas.response import (
     ResponseCreate, ResponseUpdate, ResponseResponse, ResponseDetailResponse,
     ResponseVariantCreate, ResponseVariantResponse, ResponseUpsert
@@ -51,32 +55,39 @@ def create_response_endpoint(
 @router.get(
     "/{project_code}/versions/{status}/responses",
     response_model=List[ResponseResponse],
+    dependencies=[Depends(async_version_etag)],
 )
-def list_responses_endpoint(
+async def list_responses_endpoint(
     project_code: str,
     status: str,
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """List all responses for a version."""
     if status not in ("draft", "locked", "archived"):
         raise HTTPException(400, "Invalid version status")
-    return list_responses(db, project_code, status)
+    items = await run_read(db, list_responses, project_code, status, page)
+    return page_response(items, page, ResponseResponse, "name")
 
 
 @router.get(
     "/{project_code}/versions/{status}/responses/{response_name}",
     response_model=ResponseDetailResponse,
+    dependencies=[Depends(async_version_etag)],
 )
-def get_response_endpoint(
+async def get_response_endpoint(
     project_code: str,
     status: str,
     response_name: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get a specific response with all its variants."""
     if status not in ("draft", "locked", "archived"):
         raise HTTPException(400, "Invalid version status")
-    return get_response(db, project_code, status, response_name)
+    return await run_read(
+        db, get_response, project_code, status, response_name,
+        schema=ResponseDetailResponse,
+    )
 
 
 @router.put(
@@ -134,6 +145,7 @@ def add_variant_endpoint(
 @router.get(
     "/{project_code}/versions/{status}/responses/{response_name}/variants",
     response_model=List[ResponseVariantResponse],
+    dependencies=[Depends(version_etag)],
 )
 def list_variants_endpoint(
     project_code: str,
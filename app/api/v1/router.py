@@ -16,6 +16,8 @@ from app.api.v1 import (
     rules,
     session_config,
     export,
+    rasa_import,
+    health,
 )
 
 router = APIRouter()
@@ -35,3 +37,5 @@ router.include_router(stories.router)
 router.include_router(rules.router)
 router.include_router(session_config.router)
 router.include_router(export.router)
+router.include_router(rasa_import.router)
+router.include_router(health.router)
@@ -1,8 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.core.dependencies import get_db
+from app.core.dependencies import get_async_db, get_db
+from app.core.etag import async_version_etag
+from app.core.pagination import PageParams, page_params, page_response
+from app.db.reads import run_read
 from app.schemas.rule import (
     RuleCreate,
     RuleResponse,
@@ -17,6 +21,8 @@ from app.schemas.rule import (
     RuleConditionUpdate,
     RuleStepEntityCreate,
     RuleStepEntityResponse,
+    RuleWrite,
+    RuleWriteResponse,
 )
 from app.services.rule_service import (
     create_rule,
@@ -37,6 +43,7 @@ from app.services.rule_service import (
     add_rule_step_entity,
     list_rule_step_entities,
     delete_rule_step_entity,
+    write_rule,
 )
 
 
@@ -64,33 +71,38 @@ def create_rule_api(
 @router.get(
     "/{project_code}/versions/{status}/rules",
     response_model=List[RuleResponse],
+    dependencies=[Depends(async_version_etag)],
 )
-def list_rules_api(
+async def list_rules_api(
     project_code: str,
     status: str,
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """List all rules for a version."""
     if status not in ("draft", "locked", "archived"):
         raise HTTPException(400, "Invalid version status")
-    rules = list_rules(db, project_code, status)
-    return [RuleResponse(id=r.id, name=r.name) for r in rules]
+    items = await run_read(db, list_rules, project_code, status, page)
+    return page_response(items, page, RuleResponse, "name")
 
 
 @router.get(
     "/{project_code}/versions/{status}/rules/{rule_name}",
     response_model=RuleResponse,
+    dependencies=[Depends(async_version_etag)],
 )
-def get_rule_api(
+async def get_rule_api(
     project_code: str,
     status: str,
     rule_name: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get a specific rule."""
     if status not in ("draft", "locked", "archived"):
         raise HTTPException(400, "Invalid version status")
-    return get_rule(db, project_code, status, rule_name)
+    return await run_read(
+        db, get_rule, project_code, status, rule_name, schema=RuleResponse
+    )
 
 
 @router.put(
@@ -121,6 +133,37 @@ def delete_rule_api(
     return None
 
 
+@router.put(
+    "/{project_code}/versions/draft/rules/{rule_name}/contents",
+    response_model=RuleWriteResponse,
+)
+def write_rule_api(
+    project_code: str,
+    rule_name: str,
+    payload: RuleWrite,
+    db: Session = Depends(get_db),
+):
+    """
+    Create or replace a whole rule in one request.
+
+    The rule's existing conditions, steps, slot events and entity
+    annotations are replaced by the payload. `order_index` and
+    `step_order` default to the position in their list.
+    ```json
+    {
+        "conditions": [{"condition_type": "active_loop", "active_loop": "request_form"}],
+        "steps": [
+            {"step_type": "intent", "intent_name": "inform",
+             "entities": [{"entity_key": "city"}]},
+            {"step_type": "action", "form_name": "request_form"},
+            {"step_type": "active_loop", "active_loop_value": null}
+        ]
+    }
+    ```
+    """
+    return write_rule(db, project_code, rule_name, payload)
+
+
 # -------------------------------------------------
 # RULE CONDITIONS
 # -------------------------------------------------
@@ -1,8 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.core.dependencies import get_db
+from app.core.dependencies import get_async_db, get_db
+from app.core.etag import async_version_etag, version_etag
+from app.core.pagination import PageParams, page_params, page_response
+from app.db.reads import run_read
 from app.schemas.slot import (
     SlotCreate,
     SlotResponse,
@@ -51,32 +55,38 @@ def create_slot_endpoint(
 @router.get(
     "/{project_code}/versions/{status}/slots",
     response_model=List[SlotResponse],
+    dependencies=[Depends(async_version_etag)],
 )
-def list_slots_endpoint(
+async def list_slots_endpoint(
     project_code: str,
     status: str,
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """List all slots for a version."""
     if status not in ("draft", "locked", "archived"):
         raise HTTPException(400, "Invalid version status")
-    return list_slots(db, project_code, status)
+    items = await run_read(db, list_slots, project_code, status, page)
+    return page_response(items, page, SlotResponse, "name")
 
 
 @router.get(
     "/{project_code}/versions/{status}/slots/{slot_name}",
     response_model=SlotResponse,
+    dependencies=[Depends(async_version_etag)],
 )
-def get_slot_endpoint(
+async def get_slot_endpoint(
     project_code: str,
     status: str,
     slot_name: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get a specific slot."""
     if status not in ("draft", "locked", "archived"):
         raise HTTPException(400, "Invalid version status")
-    return get_slot(db, project_code, status, slot_name)
+    return await run_read(
+        db, get_slot, project_code, status, slot_name, schema=SlotResponse
+    )
 
 
 @router.put(
@@ -140,6 +150,7 @@ def create_slot_mapping_endpoint(
 @router.get(
     "/{project_code}/versions/{status}/slots/{slot_name}/mappings",
     response_model=List[SlotMappingResponse],
+    dependencies=[Depends(version_etag)],
 )
 def list_slot_mappings_endpoint(
     project_code: str,
@@ -156,6 +167,7 @@ def list_slot_mappings_endpoint(
 @router.get(
     "/{project_code}/versions/{status}/slots/{slot_name}/mappings/{mapping_id}",
     response_model=SlotMappingResponse,
+    dependencies=[Depends(version_etag)],
 )
 def get_slot_mapping_endpoint(
     project_code: str,
@@ -1,8 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.core.dependencies import get_db
+from app.core.dependencies import get_async_db, get_db
+from app.core.etag import async_version_etag
+from app.core.pagination import PageParams, page_params, page_response
+from app.db.reads import run_read
 from app.schemas.story import (
     StoryCreate,
     StoryResponse,
@@ -16,6 +20,8 @@ from app.schemas.story import (
     StoryStepEntityResponse,
     OrGroupCreate,
     OrGroupResponse,
+    StoryWrite,
+    StoryWriteResponse,
 )
 from app.services.story_service import (
     create_story,
@@ -32,6 +38,7 @@ from app.services.story_service import (
     add_story_step_entity,
     list_story_step_entities,
     delete_story_step_entity,
+    write_story,
 )
 
 
@@ -59,33 +66,38 @@ def create_story_api(
 @router.get(
     "/{project_code}/versions/{status}/stories",
     response_model=List[StoryResponse],
+    dependencies=[Depends(async_version_etag)],
 )
-def list_stories_api(
+async def list_stories_api(
     project_code: str,
     status: str,
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """List all stories for a version."""
     if status not in ("draft", "locked", "archived"):
         raise HTTPException(400, "Invalid version status")
-    stories = list_stories(db, project_code, status)
-    return [StoryResponse(id=s.id, name=s.name) for s in stories]
+    items = await run_read(db, list_stories, project_code, status, page)
+    return page_response(items, page, StoryResponse, "name")
 
 
 @router.get(
     "/{project_code}/versions/{status}/stories/{story_name}",
     response_model=StoryResponse,
+    dependencies=[Depends(async_version_etag)],
 )
-def get_story_api(
+async def get_story_api(
     project_code: str,
     status: str,
     story_name: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Get a specific story."""
     if status not in ("draft", "locked", "archived"):
         raise HTTPException(400, "Invalid version status")
-    return get_story(db, project_code, status, story_name)
+    return await run_read(
+        db, get_story, project_code, status, story_name, schema=StoryResponse
+    )
 
 
 @router.put(
@@ -116,6 +128,37 @@ def delete_story_api(
     return None
 
 
+@router.put(
+    "/{project_code}/versions/draft/stories/{story_name}/timeline",
+    response_model=StoryWriteResponse,
+)
+def write_story_api(
+    project_code: str,
+    story_name: str,
+    payload: StoryWrite,
+    db: Session = Depends(get_db),
+):
+    """
+    Create or replace a whole story in one request.
+
+    The story's existing steps, slot events and entity annotations are
+    replaced by the payload. `step_order` defaults to the step's position
+    within its timeline.
+    ```json
+    {
+        "steps": [
+            {"step_type": "intent", "intent_name": "inform",
+             "entities": [{"entity_key": "city", "value": "Delhi"}]},
+            {"step_type": "slot", "slot_events": [{"slot_name": "city", "value": "Delhi"}]},
+            {"step_type": "action", "response_name": "utter_ack"},
+            {"step_type": "or", "or_intents": ["affirm", "deny"]}
+        ]
+    }
+    ```
+    """
+    return write_story(db, project_code, story_name, payload)
+
+
 # -------------------------------------------------
 # STORY STEPS
 # -------------------------------------------------
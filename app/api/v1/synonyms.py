@@ -1,9 +1,15 @@
-from fastapi import APIRouter, Depends
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.dependencies import get_db
-from app.schemas.synonym import SynonymUpsert, SynonymResponse
-from app.services.synonym_service import upsert_synonym
+from app.core.dependencies import get_async_db, get_db
+from app.core.etag import async_version_etag
+from app.core.pagination import PageParams, page_params, page_response
+from app.db.reads import run_read
+from app.schemas.synonym import SynonymUpsert, SynonymResponse, SynonymListResponse
+from app.services.synonym_service import upsert_synonym, list_synonyms
 
 
 router = APIRouter(prefix="/projects", tags=["Synonyms"])
@@ -21,3 +27,21 @@ def upsert_synonym_endpoint(
 ):
     """Create or update a synonym in the draft version."""
     return upsert_synonym(db, project_code, payload)
+
+
+@router.get(
+    "/{project_code}/versions/{status}/synonyms",
+    response_model=List[SynonymListResponse],
+    dependencies=[Depends(async_version_etag)],
+)
+async def list_synonyms_endpoint(
+    project_code: str,
+    status: str,
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """List all synonyms for a version."""
+    if status not in ("draft", "locked", "archived"):
+        raise HTTPException(400, "Invalid version status")
+    items = await run_read(db, list_synonyms, project_code, status, page)
+    return page_response(items, page, SynonymListResponse, "canonical_value")
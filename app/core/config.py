@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from pathlib import Path
+from typing import Optional
 
 
 BASE_DIR = Path(__file__).resolve().parents[2]
@@ -7,6 +8,28 @@ BASE_DIR = Path(__file__).resolve().parents[2]
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # Async read endpoints; defaults to DATABASE_URL with the asyncpg driver
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    # Engine and connection pool (see app/db/engine.py)
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Per-statement limit in milliseconds; 0 disables it
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+    DB_EXECUTEMANY_PAGE_SIZE: int = 1000
+
+    # Process-wide cache of project/version/language ids
+    RESOLVER_CACHE_TTL: float = 300.0
+    RESOLVER_CACHE_MAX_ENTRIES: int = 10_000
+
+    # Export cache for locked versions: "memory", "disk" or "none"
+    EXPORT_CACHE_BACKEND: str = "memory"
+    EXPORT_CACHE_DIR: str = str(BASE_DIR / ".export_cache")
+    EXPORT_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
 
     class Config:
         env_file = BASE_DIR / ".env"
@@ -0,0 +1,105 @@
+"""
+Conditional GET for version-scoped read endpoints.
+
+Everything under /{project_code}/versions/{status}/... is a function of the
+version's content, which only changes together with its change counter.
+The ETag is derived from the version id, the counter and the query string,
+so it can be checked with one small query before the handler loads anything.
+"""
+
+import hashlib
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.dependencies import get_async_db, get_db
+from app.models import Project, Version
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def _version_row_query(project_code: str, status: str):
+    return (
+        select(Version.id, Version.change_counter)
+        .join(Project, Project.id == Version.project_id)
+        .where(
+            Project.project_code == project_code,
+            Version.status == status,
+        )
+        .limit(1)
+    )
+
+
+def _check_etag(request: Request, row) -> None:
+    if row is None:
+        # Unknown project or status; the handler reports it.
+        return
+
+    version_id, change_counter = row
+    query = "&".join(sorted(request.url.query.split("&")))
+    digest = hashlib.sha1(f"{version_id}:{change_counter}:{query}".encode()).hexdigest()
+    etag = f'"{digest}"'
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(304, headers={"ETag": etag})
+
+    request.state.etag = etag
+
+
+def version_etag(
+    request: Request,
+    project_code: str,
+    status: str,
+    db: Session = Depends(get_db),
+) -> None:
+    """
+    Answer 304 when If-None-Match still matches the version, otherwise leave
+    the ETag for ETagMiddleware to put on the response.
+    """
+    row = db.execute(_version_row_query(project_code, status)).first()
+    _check_etag(request, row)
+
+
+async def async_version_etag(
+    request: Request,
+    project_code: str,
+    status: str,
+    db: AsyncSession = Depends(get_async_db),
+) -> None:
+    """`version_etag` for endpoints on the async session."""
+    row = (await db.execute(_version_row_query(project_code, status))).first()
+    _check_etag(request, row)
+
+
+class ETagMiddleware:
+    """Adds the ETag computed by `version_etag` to successful responses."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_etag(message: Message):
+            if message["type"] == "http.response.start":
+                etag = scope.get("state", {}).get("etag")
+                if etag and 200 <= message["status"] < 300:
+                    MutableHeaders(scope=message).setdefault("etag", etag)
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
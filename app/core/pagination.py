@@ -0,0 +1,138 @@
+"""
+Keyset pagination, filtering and field selection for version-scoped list
+endpoints.
+
+Collections are ordered by their name column, with the row id breaking
+ties. A page is requested with `limit`; when more rows follow, the response
+carries an opaque cursor in the X-Next-Cursor header, which is passed back
+as `after` to fetch the next page. Without `limit` the whole collection is
+returned, as before.
+
+`q` filters on the name (case-insensitive prefix, or substring with
+`match=substring`) and `fields` limits each item to the listed fields.
+"""
+
+import base64
+import binascii
+import json
+from typing import List, Literal, Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException, Query
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import Select, tuple_
+
+
+MAX_PAGE_SIZE = 1000
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class PageParams:
+    def __init__(
+        self,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[str, str]] = None,
+        q: Optional[str] = None,
+        match: str = "prefix",
+        fields: Optional[List[str]] = None,
+    ):
+        self.limit = limit
+        self.after = after
+        self.q = q
+        self.match = match
+        self.fields = fields
+
+
+def encode_cursor(key: str, row_id: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([key, row_id]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        key, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeError, ValueError, TypeError):
+        raise HTTPException(400, "Invalid cursor")
+    if not isinstance(key, str) or not isinstance(row_id, str):
+        raise HTTPException(400, "Invalid cursor")
+    return key, row_id
+
+
+def page_params(
+    limit: Optional[int] = Query(
+        None, ge=1, le=MAX_PAGE_SIZE, description="Page size; all items when omitted"
+    ),
+    after: Optional[str] = Query(
+        None, description=f"Cursor from the {NEXT_CURSOR_HEADER} header of the previous page"
+    ),
+    q: Optional[str] = Query(None, min_length=1, description="Filter on the name"),
+    match: Literal["prefix", "substring"] = Query(
+        "prefix", description="How `q` is matched against the name"
+    ),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to include in each item"
+    ),
+) -> PageParams:
+    return PageParams(
+        limit=limit,
+        after=decode_cursor(after) if after else None,
+        q=q,
+        match=match,
+        fields=[f.strip() for f in fields.split(",") if f.strip()] if fields else None,
+    )
+
+
+def paginate(query: Select, key, page: Optional[PageParams]) -> Select:
+    """
+    Apply the filter, cursor, order and limit of `page` to a column query.
+    `key` is the name column the collection is ordered by; the id of its
+    table breaks ties. One row more than the page is fetched to tell
+    whether another page follows.
+    """
+    id_column = key.class_.id
+    query = query.order_by(key, id_column)
+    if page is None:
+        return query
+
+    if page.q:
+        if page.match == "substring":
+            query = query.where(key.icontains(page.q, autoescape=True))
+        else:
+            query = query.where(key.istartswith(page.q, autoescape=True))
+
+    if page.after:
+        query = query.where(tuple_(key, id_column) > tuple_(*page.after))
+
+    if page.limit:
+        query = query.limit(page.limit + 1)
+
+    return query
+
+
+def page_response(
+    items: Sequence,
+    page: PageParams,
+    schema: Type[BaseModel],
+    key: str,
+) -> JSONResponse:
+    """
+    Serialize one page of `items` (rows or dicts) with `schema`, keeping
+    only the requested fields, and add the next cursor when more follow.
+    `key` names the field the collection is ordered by.
+    """
+    if page.fields:
+        unknown = [f for f in page.fields if f not in schema.model_fields]
+        if unknown:
+            raise HTTPException(400, f"Unknown fields: {', '.join(unknown)}")
+
+    headers = {}
+    if page.limit and len(items) > page.limit:
+        items = items[: page.limit]
+        last = schema.model_validate(items[-1])
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(getattr(last, key), last.id)
+
+    include = set(page.fields) if page.fields else None
+    content = [
+        schema.model_validate(item).model_dump(mode="json", include=include)
+        for item in items
+    ]
+    return JSONResponse(content, headers=headers)
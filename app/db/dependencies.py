@@ -1,11 +0,0 @@
-from typing import Generator
-from sqlalchemy.orm import Session
-from app.db.engine import SessionLocal
-
-
-def get_db() -> Generator[Session, None, None]:
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
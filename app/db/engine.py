@@ -1,15 +1,188 @@
-from sqlalchemy import create_engine
+"""
+The application's database engine.
+
+`create_db_engine` builds the engine from `Settings`; the module-level
+`engine` and `SessionLocal` are the single instances used by the API,
+background jobs and scripts. SQL echo is off unless DB_ECHO is set.
+
+`async_engine` and `AsyncSessionLocal` are the asyncpg counterparts used
+by the async read endpoints. They share the pool settings; the URL is
+ASYNC_DATABASE_URL, or DATABASE_URL with the asyncpg driver. asyncpg does
+not take libpq's query options: `sslmode` is passed on as `ssl`, and
+options asyncpg has no equivalent for (connect_timeout, application_name,
+...) are dropped. Set ASYNC_DATABASE_URL when those matter.
+
+The pool records how many connections were checked out and how long
+callers waited for one, so workers can be sized against Postgres'
+connection limit (see `PoolMetrics.snapshot`).
+"""
+
+import threading
+import time
+
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.engine import URL, Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from app.core.config import settings
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import Settings, settings
+
+
+class PoolMetrics:
+    """Checkout counts and wait times of one connection pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def snapshot(self, pool) -> dict:
+        with self._lock:
+            counters = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_seconds, 6),
+                "wait_seconds_max": round(self.max_wait_seconds, 6),
+            }
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            **counters,
+        }
+
+
+class _MeteredPool:
+    """Pool mixin that reports the time spent waiting for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # Keep the counters when the pool is rebuilt (e.g. engine.dispose()).
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class MeteredQueuePool(_MeteredPool, QueuePool):
+    pass
+
+
+class MeteredAsyncQueuePool(_MeteredPool, AsyncAdaptedQueuePool):
+    pass
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    echo=True,
-    future=True,
-)
+
+def _pool_options(config: Settings) -> dict:
+    return {
+        "echo": config.DB_ECHO,
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_timeout": config.DB_POOL_TIMEOUT,
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+    }
+
+
+def create_db_engine(config: Settings = settings) -> Engine:
+    url = make_url(config.DATABASE_URL)  # MUST be sync URL
+    options = {"poolclass": MeteredQueuePool, **_pool_options(config)}
+
+    if url.get_backend_name() == "postgresql":
+        if config.DB_STATEMENT_TIMEOUT_MS:
+            options["connect_args"] = {
+                "options": f"-c statement_timeout={config.DB_STATEMENT_TIMEOUT_MS}"
+            }
+        if url.get_driver_name() == "psycopg2":
+            # Batch executemany() for INSERT (VALUES lists) and for
+            # UPDATE/DELETE (execute_batch) instead of one round trip per row.
+            options["executemany_mode"] = "values_plus_batch"
+            options["insertmanyvalues_page_size"] = config.DB_EXECUTEMANY_PAGE_SIZE
+            options["executemany_batch_page_size"] = config.DB_EXECUTEMANY_PAGE_SIZE
+
+    return create_engine(url, **options)
+
+
+# libpq query options asyncpg.connect accepts, by their asyncpg name.
+_ASYNCPG_QUERY_OPTIONS = {
+    "host": "host",
+    "port": "port",
+    "sslmode": "ssl",
+    "ssl": "ssl",
+    "target_session_attrs": "target_session_attrs",
+    "prepared_statement_cache_size": "prepared_statement_cache_size",
+}
+
+
+def _async_url(url: URL) -> URL:
+    """The sync DATABASE_URL with the asyncpg driver and asyncpg options."""
+    query = {
+        _ASYNCPG_QUERY_OPTIONS[key]: value
+        for key, value in url.query.items()
+        if key in _ASYNCPG_QUERY_OPTIONS
+    }
+    return url.set(drivername="postgresql+asyncpg", query=query)
+
+
+def create_async_db_engine(config: Settings = settings) -> AsyncEngine:
+    if config.ASYNC_DATABASE_URL:
+        url = make_url(config.ASYNC_DATABASE_URL)
+    else:
+        url = _async_url(make_url(config.DATABASE_URL))
+    options = {"poolclass": MeteredAsyncQueuePool, **_pool_options(config)}
+
+    if config.DB_STATEMENT_TIMEOUT_MS:
+        options["connect_args"] = {
+            "server_settings": {"statement_timeout": str(config.DB_STATEMENT_TIMEOUT_MS)}
+        }
+
+    return create_async_engine(url, **options)
+
+
+def pool_metrics(bind: Engine) -> dict:
+    """Current pool state and counters, or {} for pools without metrics."""
+    pool = bind.pool
+    metrics = getattr(pool, "metrics", None)
+    return metrics.snapshot(pool) if metrics else {}
+
+
+engine = create_db_engine()
 
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
     bind=engine,
 )
+
+async_engine = create_async_db_engine()
+
+AsyncSessionLocal = async_sessionmaker(
+    autoflush=False,
+    expire_on_commit=False,
+    bind=async_engine,
+)
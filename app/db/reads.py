@@ -0,0 +1,98 @@
+"""
+Read-only column queries for list endpoints.
+
+List endpoints only need a handful of columns per row. Selecting those
+columns instead of the mapped classes returns plain rows: no ORM instances
+are built and nothing enters the session's identity map. Rows support
+attribute access, so they validate against the response schemas
+(`from_attributes=True`) exactly like the ORM objects did.
+
+Child collections (an entity's roles, an intent's examples, ...) are
+loaded for a whole page of parents at once with `fetch_grouped`, instead
+of one query per parent.
+
+`run_read` runs any of these sync read paths on an AsyncSession, so async
+endpoints reuse the same services without a thread per request.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Type
+
+from pydantic import BaseModel
+from sqlalchemy import Row, Select, inspect, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+def select_for(schema: Type[BaseModel], model, **columns) -> Select:
+    """
+    SELECT the columns named by the fields of `schema`.
+
+    Fields are taken from the mapped columns of `model` unless given in
+    `columns` (for example a column of a joined table); fields that are
+    neither and have a default are left to the schema.
+    """
+    model_columns = inspect(model).columns
+    selected = []
+    for name, field in schema.model_fields.items():
+        if name in columns:
+            selected.append(columns[name].label(name))
+        elif name in model_columns:
+            selected.append(getattr(model, name))
+        elif field.is_required():
+            raise ValueError(f"No column for field '{name}' of {schema.__name__}")
+    return select(*selected)
+
+
+def fetch_rows(db: Session, query: Select) -> List[Row]:
+    """Execute a column query and return its rows."""
+    return db.execute(query).all()
+
+
+def fetch_grouped(
+    db: Session,
+    key,
+    value,
+    keys: Iterable[Any],
+    *order_by,
+) -> Dict[Any, list]:
+    """
+    Load a child column for many parents with one query.
+
+    Returns {key: [value, ...]} for every key in `keys`; keys without
+    children map to an empty list. Values are in `order_by` order, or in
+    insertion order when none is given.
+    """
+    grouped = {k: [] for k in keys}
+    if not grouped:
+        return grouped
+
+    if not order_by:
+        order_by = (literal_column(f"{key.class_.__tablename__}.ctid"),)
+
+    rows = db.execute(
+        select(key, value).where(key.in_(list(grouped))).order_by(*order_by)
+    )
+    for k, v in rows:
+        grouped[k].append(v)
+    return grouped
+
+
+async def run_read(
+    db: AsyncSession,
+    read: Callable[..., Any],
+    *args,
+    schema: Optional[Type[BaseModel]] = None,
+) -> Any:
+    """
+    Call `read(session, *args)` with the sync facade of an AsyncSession.
+
+    The function runs in a greenlet on the event loop and every query is
+    awaited on the async driver. ORM objects should be validated with
+    `schema` here: once the call returns, lazy loads are no longer possible.
+    """
+
+    def call(session: Session):
+        result = read(session, *args)
+        return schema.model_validate(result) if schema else result
+
+    return await db.run_sync(call)
@@ -1,16 +1,31 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.router import router as v1_router
+from app.core.etag import ETagMiddleware
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.services.promotion_job_service import resume_promotion_jobs
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pick up promotion jobs interrupted by a restart
+    resume_promotion_jobs()
+    yield
+
 
-app = FastAPI(title="RASA Management API", version="1.0.0")
+app = FastAPI(title="RASA Management API", version="1.0.0", lifespan=lifespan)
 
+app.add_middleware(ETagMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", NEXT_CURSOR_HEADER],
 )
 
 app.include_router(v1_router, prefix="/api/v1")
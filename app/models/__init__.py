@@ -13,6 +13,7 @@ from .slot import Slot, SlotMapping
 from .form import Form, FormSlotMapping, FormRequiredSlot
 from .story import Story, StoryStep, StorySlotEvent, StoryStepEntity
 from .rule import Rule, RuleStep, RuleSlotEvent, RuleCondition, RuleStepEntity
+from .promotion_job import PromotionJob
 
 __all__ = [
     "Project",
@@ -50,4 +51,5 @@ __all__ = [
     "RuleStep",
     "RuleSlotEvent",
     "RuleCondition",
+    "PromotionJob",
 ]
@@ -17,7 +17,7 @@ class Action(Base):
     __tablename__ = "actions"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    version_id = Column(String, ForeignKey("versions.id"), nullable=False)
+    version_id = Column(String, ForeignKey("versions.id", ondelete="CASCADE"), nullable=False)
     name = Column(String, nullable=False)
     description = Column(String, nullable=True)
     created_at = Column(DateTime, server_default=func.now())
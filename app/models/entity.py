@@ -15,7 +15,7 @@ class Entity(Base):
     __tablename__ = "entities"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    version_id = Column(String, ForeignKey("versions.id"), nullable=False)
+    version_id = Column(String, ForeignKey("versions.id", ondelete="CASCADE"), nullable=False)
     entity_key = Column(String, nullable=False)
     entity_type = Column(String, nullable=False)
     use_regex = Column(Boolean, default=False)
@@ -40,7 +40,7 @@ class EntityRole(Base):
     __tablename__ = "entity_roles"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    entity_id = Column(String, ForeignKey("entities.id"), nullable=False)
+    entity_id = Column(String, ForeignKey("entities.id", ondelete="CASCADE"), nullable=False)
     role = Column(String, nullable=False)
     entity = relationship("Entity", back_populates="roles")
 
@@ -53,7 +53,7 @@ class EntityGroup(Base):
     __tablename__ = "entity_groups"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    entity_id = Column(String, ForeignKey("entities.id"), nullable=False)
+    entity_id = Column(String, ForeignKey("entities.id", ondelete="CASCADE"), nullable=False)
     group_name = Column(String, nullable=False)
     entity = relationship("Entity", back_populates="groups")
 
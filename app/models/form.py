@@ -10,6 +10,7 @@ from sqlalchemy import (
     UniqueConstraint,
     CheckConstraint,
     Index,
+    text,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -22,7 +23,7 @@ class Form(Base):
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String, nullable=False)
-    version_id = Column(String, ForeignKey("versions.id"), nullable=False)
+    version_id = Column(String, ForeignKey("versions.id", ondelete="CASCADE"), nullable=False)
     ignored_intents = Column(JSON, nullable=True)  # List of intent names to ignore during form
     created_at = Column(DateTime, server_default=func.now())
     
@@ -43,8 +44,8 @@ class FormRequiredSlot(Base):
     __tablename__ = "form_required_slots"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    form_id = Column(String, ForeignKey("forms.id"), nullable=False)
-    slot_id = Column(String, ForeignKey("slots.id"), nullable=False)
+    form_id = Column(String, ForeignKey("forms.id", ondelete="CASCADE"), nullable=False)
+    slot_id = Column(String, ForeignKey("slots.id", deferrable=True, initially="IMMEDIATE"), nullable=False)
     order = Column(Integer, nullable=False)
     required = Column(Boolean, default=True)
     
@@ -55,6 +56,7 @@ class FormRequiredSlot(Base):
     __table_args__ = (
         UniqueConstraint("form_id", "slot_id", name="uq_form_required_slot"),
         Index("ix_form_required_slot_form", "form_id"),
+        Index("ix_form_required_slot_slot", "slot_id"),
     )
 
 
@@ -64,12 +66,12 @@ class FormSlotMapping(Base):
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     form_required_slot_id = Column(
-        String, ForeignKey("form_required_slots.id"), nullable=False
+        String, ForeignKey("form_required_slots.id", ondelete="CASCADE"), nullable=False
     )
     mapping_type = Column(String, nullable=False)
     
     # For from_entity mapping
-    entity_id = Column(String, ForeignKey("entities.id"), nullable=True)
+    entity_id = Column(String, ForeignKey("entities.id", deferrable=True, initially="IMMEDIATE"), nullable=True)
     
     # For from_intent mapping
     intent = Column(String, nullable=True)
@@ -86,4 +88,9 @@ class FormSlotMapping(Base):
             name="ck_form_slot_mapping_type",
         ),
         Index("ix_form_slot_mapping_frs", "form_required_slot_id"),
+        Index(
+            "ix_form_slot_mapping_entity",
+            "entity_id",
+            postgresql_where=text("entity_id IS NOT NULL"),
+        ),
     )
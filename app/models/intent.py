@@ -17,7 +17,7 @@ class Intent(Base):
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     intent_name = Column(String, nullable=False)
-    version_id = Column(String, ForeignKey("versions.id"), nullable=False)
+    version_id = Column(String, ForeignKey("versions.id", ondelete="CASCADE"), nullable=False)
     version = relationship("Version", back_populates="intents")
     localizations = relationship(
         "IntentLocalization",
@@ -35,7 +35,7 @@ class IntentLocalization(Base):
     __tablename__ = "intent_localizations"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    intent_id = Column(String, ForeignKey("intents.id"), nullable=False)
+    intent_id = Column(String, ForeignKey("intents.id", ondelete="CASCADE"), nullable=False)
     language_id = Column(String, ForeignKey("languages.id"), nullable=False)
     created_at = Column(DateTime, server_default=func.now())
     intent = relationship("Intent", back_populates="localizations")
@@ -49,6 +49,7 @@ class IntentLocalization(Base):
     __table_args__ = (
         UniqueConstraint("intent_id", "language_id", name="uq_intent_language"),
         Index("ix_localization_intent", "intent_id"),
+        Index("ix_localization_language", "language_id"),
     )
 
 
@@ -57,12 +58,12 @@ class IntentExample(Base):
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     intent_localization_id = Column(
-        String, ForeignKey("intent_localizations.id"), nullable=False
+        String, ForeignKey("intent_localizations.id", ondelete="CASCADE"), nullable=False
     )
     example = Column(String, nullable=False)
     created_at = Column(DateTime, server_default=func.now())
     localization = relationship("IntentLocalization", back_populates="examples")
 
     __table_args__ = (
-        Index("ix_example_localization", "intent_localization_id"),
+        Index("ix_example_localization_created", "intent_localization_id", "created_at"),
     )
@@ -16,9 +16,9 @@ class Lookup(Base):
     __tablename__ = "lookups"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    version_id = Column(String, ForeignKey("versions.id"), nullable=False)
+    version_id = Column(String, ForeignKey("versions.id", ondelete="CASCADE"), nullable=False)
     lookup_name = Column(String, nullable=False)
-    entity_id = Column(String, ForeignKey("entities.id"), nullable=False)
+    entity_id = Column(String, ForeignKey("entities.id", deferrable=True, initially="IMMEDIATE"), nullable=False)
     created_at = Column(DateTime, server_default=func.now())
     version = relationship("Version", back_populates="lookups")
     entity = relationship("Entity", back_populates="lookups")
@@ -27,6 +27,7 @@ class Lookup(Base):
     __table_args__ = (
         UniqueConstraint("version_id", "lookup_name", name="uq_lookup_name_per_version"),
         Index("ix_lookup_version", "version_id"),
+        Index("ix_lookup_entity", "entity_id"),
     )
 
 
@@ -34,7 +35,7 @@ class LookupExample(Base):
     __tablename__ = "lookup_examples"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    lookup_id = Column(String, ForeignKey("lookups.id"), nullable=False)
+    lookup_id = Column(String, ForeignKey("lookups.id", ondelete="CASCADE"), nullable=False)
     language_id = Column(String, ForeignKey("languages.id"), nullable=False)
     example = Column(String, nullable=False)
     created_at = Column(DateTime, server_default=func.now())
@@ -44,4 +45,5 @@ class LookupExample(Base):
     __table_args__ = (
         UniqueConstraint("lookup_id", "language_id", "example", name="uq_lookup_example_per_language"),
         Index("ix_lookup_example_lookup", "lookup_id"),
+        Index("ix_lookup_example_language", "language_id"),
     )
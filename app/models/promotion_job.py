@@ -0,0 +1,50 @@
+import uuid
+from sqlalchemy import (
+    Column,
+    String,
+    Boolean,
+    JSON,
+    ForeignKey,
+    DateTime,
+    CheckConstraint,
+    Index,
+    text,
+)
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+
+class PromotionJob(Base):
+    __tablename__ = "promotion_jobs"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    project_id = Column(String, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    kind = Column(String, nullable=False)  # promote | rollback
+    status = Column(String, nullable=False, default="queued")
+    phase = Column(String, nullable=True)
+    rows_copied = Column(JSON, nullable=False, default=dict)
+    result = Column(JSON, nullable=True)
+    error = Column(String, nullable=True)
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime, server_default=func.now())
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    project = relationship("Project")
+
+    __table_args__ = (
+        CheckConstraint("kind IN ('promote','rollback')", name="ck_promotion_job_kind"),
+        CheckConstraint(
+            "status IN ('queued','running','succeeded','failed','cancelled')",
+            name="ck_promotion_job_status",
+        ),
+        Index("ix_promotion_job_project", "project_id"),
+        Index("ix_promotion_job_status", "status"),
+        # One queued or running job per project.
+        Index(
+            "uq_promotion_job_active_project",
+            "project_id",
+            unique=True,
+            postgresql_where=text("status IN ('queued','running')"),
+        ),
+    )
@@ -16,9 +16,9 @@ class Regex(Base):
     __tablename__ = "regexes"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    version_id = Column(String, ForeignKey("versions.id"), nullable=False)
+    version_id = Column(String, ForeignKey("versions.id", ondelete="CASCADE"), nullable=False)
     regex_name = Column(String, nullable=False)
-    entity_id = Column(String, ForeignKey("entities.id"), nullable=False)
+    entity_id = Column(String, ForeignKey("entities.id", deferrable=True, initially="IMMEDIATE"), nullable=False)
     created_at = Column(DateTime, server_default=func.now())
     version = relationship("Version", back_populates="regexes")
     entity = relationship("Entity", back_populates="regexes")
@@ -27,6 +27,7 @@ class Regex(Base):
     __table_args__ = (
         UniqueConstraint("version_id", "regex_name", name="uq_regex_name_per_version"),
         Index("ix_regex_version", "version_id"),
+        Index("ix_regex_entity", "entity_id"),
     )
 
 
@@ -34,7 +35,7 @@ class RegexExample(Base):
     __tablename__ = "regex_examples"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    regex_id = Column(String, ForeignKey("regexes.id"), nullable=False)
+    regex_id = Column(String, ForeignKey("regexes.id", ondelete="CASCADE"), nullable=False)
     language_id = Column(String, ForeignKey("languages.id"), nullable=False)
     example = Column(String, nullable=False)
     created_at = Column(DateTime, server_default=func.now())
@@ -44,4 +45,5 @@ class RegexExample(Base):
     __table_args__ = (
         UniqueConstraint("regex_id", "language_id", "example", name="uq_regex_example_per_language"),
         Index("ix_regex_example_regex", "regex_id"),
+        Index("ix_regex_example_language", "language_id"),
     )
@@ -9,6 +9,7 @@ from sqlalchemy import (
     UniqueConstraint,
     CheckConstraint,
     Index,
+    text,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -20,7 +21,7 @@ class Response(Base):
     __tablename__ = "responses"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    version_id = Column(String, ForeignKey("versions.id"), nullable=False)
+    version_id = Column(String, ForeignKey("versions.id", ondelete="CASCADE"), nullable=False)
     name = Column(String, nullable=False)
     created_at = Column(DateTime, server_default=func.now())
     version = relationship("Version", back_populates="responses")
@@ -39,7 +40,7 @@ class ResponseVariant(Base):
     __tablename__ = "response_variants"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    response_id = Column(String, ForeignKey("responses.id"), nullable=False)
+    response_id = Column(String, ForeignKey("responses.id", ondelete="CASCADE"), nullable=False)
     language_id = Column(String, ForeignKey("languages.id"), nullable=True)
     priority = Column(Integer, default=0)
     created_at = Column(DateTime, server_default=func.now())
@@ -52,7 +53,14 @@ class ResponseVariant(Base):
         "ResponseComponent", back_populates="variant", cascade="all, delete-orphan"
     )
 
-    __table_args__ = (Index("ix_response_variant_response", "response_id"),)
+    __table_args__ = (
+        Index("ix_response_variant_response_priority", "response_id", "priority"),
+        Index(
+            "ix_response_variant_language",
+            "language_id",
+            postgresql_where=text("language_id IS NOT NULL"),
+        ),
+    )
 
 
 class ResponseCondition(Base):
@@ -61,7 +69,7 @@ class ResponseCondition(Base):
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     response_variant_id = Column(
-        String, ForeignKey("response_variants.id"), nullable=False
+        String, ForeignKey("response_variants.id", ondelete="CASCADE"), nullable=False
     )
     condition_type = Column(String, nullable=False)
     slot_name = Column(String, nullable=True)
@@ -85,7 +93,7 @@ class ResponseComponent(Base):
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     response_variant_id = Column(
-        String, ForeignKey("response_variants.id"), nullable=False
+        String, ForeignKey("response_variants.id", ondelete="CASCADE"), nullable=False
     )
     component_type = Column(String, nullable=False)
     payload = Column(JSON, nullable=True)
@@ -8,6 +8,7 @@ from sqlalchemy import (
     UniqueConstraint,
     CheckConstraint,
     Index,
+    text,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -20,7 +21,7 @@ class Rule(Base):
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String, nullable=False)
-    version_id = Column(String, ForeignKey("versions.id"), nullable=False)
+    version_id = Column(String, ForeignKey("versions.id", ondelete="CASCADE"), nullable=False)
     created_at = Column(DateTime, server_default=func.now())
     
     # Relationships
@@ -39,17 +40,17 @@ class RuleStep(Base):
     __tablename__ = "rule_steps"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    rule_id = Column(String, ForeignKey("rules.id"), nullable=False)
+    rule_id = Column(String, ForeignKey("rules.id", ondelete="CASCADE"), nullable=False)
     step_order = Column(Integer, nullable=False)
     step_type = Column(String, nullable=False)
     
     # For intent steps
-    intent_id = Column(String, ForeignKey("intents.id"), nullable=True)
+    intent_id = Column(String, ForeignKey("intents.id", deferrable=True, initially="IMMEDIATE"), nullable=True)
     
     # For action steps - can reference action, response, or form
-    action_id = Column(String, ForeignKey("actions.id"), nullable=True)  # Custom actions (action_*)
-    response_id = Column(String, ForeignKey("responses.id"), nullable=True)  # Utterances (utter_*)
-    form_id = Column(String, ForeignKey("forms.id"), nullable=True)  # Forms (form activation)
+    action_id = Column(String, ForeignKey("actions.id", deferrable=True, initially="IMMEDIATE"), nullable=True)  # Custom actions (action_*)
+    response_id = Column(String, ForeignKey("responses.id", deferrable=True, initially="IMMEDIATE"), nullable=True)  # Utterances (utter_*)
+    form_id = Column(String, ForeignKey("forms.id", deferrable=True, initially="IMMEDIATE"), nullable=True)  # Forms (form activation)
     
     # For active_loop steps
     active_loop_value = Column(String, nullable=True)  # Form name or null to deactivate
@@ -70,7 +71,11 @@ class RuleStep(Base):
             "step_type IN ('intent','action','active_loop','slot')",
             name="ck_rule_step_type",
         ),
-        Index("ix_rule_step_rule", "rule_id"),
+        Index("ix_rule_step_rule_order", "rule_id", "step_order"),
+        Index("ix_rule_step_intent", "intent_id", postgresql_where=text("intent_id IS NOT NULL")),
+        Index("ix_rule_step_action", "action_id", postgresql_where=text("action_id IS NOT NULL")),
+        Index("ix_rule_step_response", "response_id", postgresql_where=text("response_id IS NOT NULL")),
+        Index("ix_rule_step_form", "form_id", postgresql_where=text("form_id IS NOT NULL")),
     )
 
 
@@ -79,8 +84,8 @@ class RuleSlotEvent(Base):
     __tablename__ = "rule_slot_events"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    rule_step_id = Column(String, ForeignKey("rule_steps.id"), nullable=False)
-    slot_id = Column(String, ForeignKey("slots.id"), nullable=False)
+    rule_step_id = Column(String, ForeignKey("rule_steps.id", ondelete="CASCADE"), nullable=False)
+    slot_id = Column(String, ForeignKey("slots.id", deferrable=True, initially="IMMEDIATE"), nullable=False)
     value = Column(String, nullable=True)
     created_at = Column(DateTime, server_default=func.now())
     
@@ -90,6 +95,7 @@ class RuleSlotEvent(Base):
 
     __table_args__ = (
         Index("ix_rule_slot_event_step", "rule_step_id"),
+        Index("ix_rule_slot_event_slot", "slot_id"),
     )
 
 
@@ -98,8 +104,8 @@ class RuleStepEntity(Base):
     __tablename__ = "rule_step_entities"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    rule_step_id = Column(String, ForeignKey("rule_steps.id"), nullable=False)
-    entity_id = Column(String, ForeignKey("entities.id"), nullable=False)
+    rule_step_id = Column(String, ForeignKey("rule_steps.id", ondelete="CASCADE"), nullable=False)
+    entity_id = Column(String, ForeignKey("entities.id", deferrable=True, initially="IMMEDIATE"), nullable=False)
     value = Column(String, nullable=True)  # The expected entity value
     role = Column(String, nullable=True)  # Optional role
     group = Column(String, nullable=True)  # Optional group
@@ -111,6 +117,7 @@ class RuleStepEntity(Base):
 
     __table_args__ = (
         Index("ix_rule_step_entity_step", "rule_step_id"),
+        Index("ix_rule_step_entity_entity", "entity_id"),
     )
 
 
@@ -119,7 +126,7 @@ class RuleCondition(Base):
     __tablename__ = "rule_conditions"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    rule_id = Column(String, ForeignKey("rules.id"), nullable=False)
+    rule_id = Column(String, ForeignKey("rules.id", ondelete="CASCADE"), nullable=False)
     condition_type = Column(String, nullable=False)
     
     # For slot conditions
@@ -140,5 +147,5 @@ class RuleCondition(Base):
             "condition_type IN ('slot','active_loop')",
             name="ck_rule_condition_type",
         ),
-        Index("ix_rule_condition_rule", "rule_id"),
+        Index("ix_rule_condition_rule_order", "rule_id", "order_index"),
     )
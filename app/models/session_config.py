@@ -18,7 +18,7 @@ class SessionConfig(Base):
     __tablename__ = "session_configs"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    version_id = Column(String, ForeignKey("versions.id"), nullable=False)
+    version_id = Column(String, ForeignKey("versions.id", ondelete="CASCADE"), nullable=False)
     session_expiration_time = Column(Integer, nullable=False, default=60)
     carry_over_slots_to_new_session = Column(Boolean, default=True)
     created_at = Column(DateTime, server_default=func.now())
@@ -11,6 +11,7 @@ from sqlalchemy import (
     UniqueConstraint,
     CheckConstraint,
     Index,
+    text,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -22,7 +23,7 @@ class Slot(Base):
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String, nullable=False)
-    version_id = Column(String, ForeignKey("versions.id"), nullable=False)
+    version_id = Column(String, ForeignKey("versions.id", ondelete="CASCADE"), nullable=False)
 
     slot_type = Column(String, nullable=False)
     influence_conversation = Column(Boolean, default=True)
@@ -65,12 +66,12 @@ class SlotMapping(Base):
     __tablename__ = "slot_mappings"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    slot_id = Column(String, ForeignKey("slots.id"), nullable=False)
+    slot_id = Column(String, ForeignKey("slots.id", ondelete="CASCADE"), nullable=False)
 
     mapping_type = Column(String, nullable=False)
 
     # from_entity mapping fields
-    entity_id = Column(String, ForeignKey("entities.id"), nullable=True)
+    entity_id = Column(String, ForeignKey("entities.id", deferrable=True, initially="IMMEDIATE"), nullable=True)
     role = Column(String, nullable=True)
     group = Column(String, nullable=True)
 
@@ -98,5 +99,10 @@ class SlotMapping(Base):
             name="ck_slot_mapping_type",
         ),
         Index("ix_slot_mapping_slot", "slot_id"),
+        Index(
+            "ix_slot_mapping_entity",
+            "entity_id",
+            postgresql_where=text("entity_id IS NOT NULL"),
+        ),
     )
 
@@ -8,6 +8,7 @@ from sqlalchemy import (
     UniqueConstraint,
     CheckConstraint,
     Index,
+    text,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -20,7 +21,7 @@ class Story(Base):
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     name = Column(String, nullable=False)
-    version_id = Column(String, ForeignKey("versions.id"), nullable=False)
+    version_id = Column(String, ForeignKey("versions.id", ondelete="CASCADE"), nullable=False)
     created_at = Column(DateTime, server_default=func.now())
     
     # Relationships
@@ -38,18 +39,18 @@ class StoryStep(Base):
     __tablename__ = "story_steps"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    story_id = Column(String, ForeignKey("stories.id"), nullable=False)
+    story_id = Column(String, ForeignKey("stories.id", ondelete="CASCADE"), nullable=False)
     timeline_index = Column(Integer, nullable=False)  # For branching stories
     step_order = Column(Integer, nullable=False)
     step_type = Column(String, nullable=False)
     
     # For intent steps
-    intent_id = Column(String, ForeignKey("intents.id"), nullable=True)
+    intent_id = Column(String, ForeignKey("intents.id", deferrable=True, initially="IMMEDIATE"), nullable=True)
     
     # For action steps - can reference action, response, or form
-    action_id = Column(String, ForeignKey("actions.id"), nullable=True)  # Custom actions (action_*)
-    response_id = Column(String, ForeignKey("responses.id"), nullable=True)  # Utterances (utter_*)
-    form_id = Column(String, ForeignKey("forms.id"), nullable=True)  # Forms
+    action_id = Column(String, ForeignKey("actions.id", deferrable=True, initially="IMMEDIATE"), nullable=True)  # Custom actions (action_*)
+    response_id = Column(String, ForeignKey("responses.id", deferrable=True, initially="IMMEDIATE"), nullable=True)  # Utterances (utter_*)
+    form_id = Column(String, ForeignKey("forms.id", deferrable=True, initially="IMMEDIATE"), nullable=True)  # Forms
     
     # For active_loop steps
     active_loop_value = Column(String, nullable=True)  # Form name or null
@@ -77,8 +78,12 @@ class StoryStep(Base):
             "step_type IN ('intent','action','slot','active_loop','checkpoint','or')",
             name="ck_story_step_type",
         ),
-        Index("ix_step_story", "story_id"),
+        Index("ix_step_story_order", "story_id", "timeline_index", "step_order"),
         Index("ix_step_or_group", "or_group_id"),  # NEW
+        Index("ix_step_intent", "intent_id", postgresql_where=text("intent_id IS NOT NULL")),
+        Index("ix_step_action", "action_id", postgresql_where=text("action_id IS NOT NULL")),
+        Index("ix_step_response", "response_id", postgresql_where=text("response_id IS NOT NULL")),
+        Index("ix_step_form", "form_id", postgresql_where=text("form_id IS NOT NULL")),
     )
 
 
@@ -87,8 +92,8 @@ class StorySlotEvent(Base):
     __tablename__ = "story_slot_events"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    story_step_id = Column(String, ForeignKey("story_steps.id"), nullable=False)
-    slot_id = Column(String, ForeignKey("slots.id"), nullable=False)
+    story_step_id = Column(String, ForeignKey("story_steps.id", ondelete="CASCADE"), nullable=False)
+    slot_id = Column(String, ForeignKey("slots.id", deferrable=True, initially="IMMEDIATE"), nullable=False)
     value = Column(String, nullable=True)
     created_at = Column(DateTime, server_default=func.now())
     
@@ -98,6 +103,7 @@ class StorySlotEvent(Base):
 
     __table_args__ = (
         Index("ix_story_slot_event_step", "story_step_id"),
+        Index("ix_story_slot_event_slot", "slot_id"),
     )
 
 
@@ -106,8 +112,8 @@ class StoryStepEntity(Base):
     __tablename__ = "story_step_entities"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    story_step_id = Column(String, ForeignKey("story_steps.id"), nullable=False)
-    entity_id = Column(String, ForeignKey("entities.id"), nullable=False)
+    story_step_id = Column(String, ForeignKey("story_steps.id", ondelete="CASCADE"), nullable=False)
+    entity_id = Column(String, ForeignKey("entities.id", deferrable=True, initially="IMMEDIATE"), nullable=False)
     value = Column(String, nullable=True)  # The expected entity value
     role = Column(String, nullable=True)  # Optional role
     group = Column(String, nullable=True)  # Optional group
@@ -119,4 +125,5 @@ class StoryStepEntity(Base):
 
     __table_args__ = (
         Index("ix_story_step_entity_step", "story_step_id"),
+        Index("ix_story_step_entity_entity", "entity_id"),
     )
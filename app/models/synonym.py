@@ -16,9 +16,9 @@ class Synonym(Base):
     __tablename__ = "synonyms"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    version_id = Column(String, ForeignKey("versions.id"), nullable=False)
+    version_id = Column(String, ForeignKey("versions.id", ondelete="CASCADE"), nullable=False)
     canonical_value = Column(String, nullable=False)
-    entity_id = Column(String, ForeignKey("entities.id"), nullable=False)
+    entity_id = Column(String, ForeignKey("entities.id", deferrable=True, initially="IMMEDIATE"), nullable=False)
     created_at = Column(DateTime, server_default=func.now())
     version = relationship("Version", back_populates="synonyms")
     entity = relationship("Entity", back_populates="synonyms")
@@ -27,6 +27,7 @@ class Synonym(Base):
     __table_args__ = (
         UniqueConstraint("version_id", "canonical_value", "entity_id", name="uq_synonym_per_version_entity"),
         Index("ix_synonym_version", "version_id"),
+        Index("ix_synonym_entity", "entity_id"),
     )
 
 
@@ -34,7 +35,7 @@ class SynonymExample(Base):
     __tablename__ = "synonym_examples"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    synonym_id = Column(String, ForeignKey("synonyms.id"), nullable=False)
+    synonym_id = Column(String, ForeignKey("synonyms.id", ondelete="CASCADE"), nullable=False)
     language_id = Column(String, ForeignKey("languages.id"), nullable=False)
     example = Column(String, nullable=False)
     created_at = Column(DateTime, server_default=func.now())
@@ -44,4 +45,5 @@ class SynonymExample(Base):
     __table_args__ = (
         UniqueConstraint("synonym_id", "language_id", "example", name="uq_synonym_example_per_language"),
         Index("ix_synonym_example_synonym", "synonym_id"),
+        Index("ix_synonym_example_language", "language_id"),
     )
@@ -2,6 +2,7 @@ import uuid
 from sqlalchemy import (
     Column,
     String,
+    Integer,
     Boolean,
     ForeignKey,
     DateTime,
@@ -19,12 +20,14 @@ class Version(Base):
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     project_id = Column(String, ForeignKey("projects.id"), nullable=False)
-    parent_version_id = Column(String, ForeignKey("versions.id"), nullable=True)
+    parent_version_id = Column(String, ForeignKey("versions.id", ondelete="SET NULL"), nullable=True)
     version_label = Column(String, nullable=False)
     status = Column(String, nullable=False)
     created_by = Column(String, nullable=True)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    # Bumped by every write to the version's content; see touch_version()
+    change_counter = Column(Integer, nullable=False, default=0, server_default="0")
     project = relationship("Project", back_populates="versions")
     parent_version = relationship("Version", remote_side=[id], backref="child_versions")
     intents = relationship("Intent", back_populates="version", cascade="all, delete-orphan")
@@ -43,7 +46,7 @@ class Version(Base):
 
     __table_args__ = (
         UniqueConstraint("project_id", "status", name="uq_project_single_version_per_status"),
-        CheckConstraint("status IN ('draft','locked','archived')", name="ck_version_status"),
+        CheckConstraint("status IN ('draft','locked','archived','purging')", name="ck_version_status"),
         Index("ix_version_project", "project_id"),
     )
 
@@ -52,7 +55,7 @@ class VersionLanguage(Base):
     __tablename__ = "version_languages"
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    version_id = Column(String, ForeignKey("versions.id"), nullable=False)
+    version_id = Column(String, ForeignKey("versions.id", ondelete="CASCADE"), nullable=False)
     language_id = Column(String, ForeignKey("languages.id"), nullable=False)
     is_default = Column(Boolean, default=False)
     created_at = Column(DateTime, server_default=func.now())
@@ -26,3 +26,6 @@ class IntentExampleResponse(BaseModel):
     intent_name: str
     language_code: str
     example_count: int
+    added: int
+    removed: int
+    unchanged: int
@@ -24,3 +24,6 @@ class LookupExampleResponse(BaseModel):
     lookup_name: str
     language_code: str
     example_count: int
+    added: int
+    removed: int
+    unchanged: int
@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+from typing import Dict, List
+
+
+class RasaImportResponse(BaseModel):
+    project_code: str
+    version_id: str
+    counts: Dict[str, int]  # Rows inserted per table
+    warnings: List[str]
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Literal, List
 
 
@@ -218,3 +218,44 @@ class RuleConditionResponse(BaseModel):
     active_loop: Optional[str] = None
     order_index: int
 
+
+
+# -------------------------------------------------
+# RULE BATCH WRITE SCHEMAS
+# -------------------------------------------------
+
+class RuleWriteStep(BaseModel):
+    """One step of a whole-rule write, with its slot events and entities."""
+    step_type: Literal["intent", "action", "active_loop", "slot"]
+    intent_name: Optional[str] = None
+    action_name: Optional[str] = None
+    response_name: Optional[str] = None
+    form_name: Optional[str] = None
+    active_loop_value: Optional[str] = None
+    step_order: Optional[int] = None  # Position in the rule when omitted
+    entities: Optional[List[RuleStepEntityCreate]] = None
+    slot_events: Optional[List[RuleSlotEventCreate]] = None
+
+
+class RuleWriteCondition(BaseModel):
+    condition_type: Literal["slot", "active_loop"]
+    slot_name: Optional[str] = None
+    slot_value: Optional[str] = None
+    active_loop: Optional[str] = None
+    order_index: Optional[int] = None  # Position in the list when omitted
+
+
+class RuleWrite(BaseModel):
+    """Conditions and steps of a rule; they replace the existing ones."""
+    conditions: List[RuleWriteCondition] = Field(default_factory=list)
+    steps: List[RuleWriteStep] = Field(default_factory=list)
+
+
+class RuleWriteResponse(BaseModel):
+    id: str
+    name: str
+    created: bool
+    conditions: int
+    steps: int
+    slot_events: int
+    entities: int
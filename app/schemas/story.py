@@ -117,3 +117,37 @@ class OrGroupResponse(BaseModel):
     intent_names: List[str]
     timeline_index: int
     step_order: int
+
+
+# -------------------------------------------------
+# STORY BATCH WRITE SCHEMAS
+# -------------------------------------------------
+
+class StoryWriteStep(BaseModel):
+    """One step of a whole-story write, with its slot events and entities."""
+    step_type: Literal["intent", "action", "slot", "active_loop", "checkpoint", "or"]
+    intent_name: Optional[str] = None
+    action_name: Optional[str] = None
+    response_name: Optional[str] = None
+    form_name: Optional[str] = None
+    active_loop_value: Optional[str] = None
+    checkpoint_name: Optional[str] = None
+    timeline_index: int = 0
+    step_order: Optional[int] = None  # Position within its timeline when omitted
+    entities: Optional[List[StoryStepEntityCreate]] = None
+    or_intents: Optional[List[str]] = None
+    slot_events: Optional[List[StorySlotEventCreate]] = None
+
+
+class StoryWrite(BaseModel):
+    """All steps of a story; they replace the story's existing steps."""
+    steps: List[StoryWriteStep] = Field(default_factory=list)
+
+
+class StoryWriteResponse(BaseModel):
+    id: str
+    name: str
+    created: bool
+    steps: int
+    slot_events: int
+    entities: int
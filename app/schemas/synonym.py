@@ -14,6 +14,9 @@ class SynonymResponse(BaseModel):
     canonical_value: str
     language_code: str
     example_count: int
+    added: int
+    removed: int
+    unchanged: int
 
 
 class SynonymListResponse(BaseModel):
@@ -1,30 +1,19 @@
+from typing import Optional
+
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
-from app.models import Action, Version, Project
-from app.schemas.action import ActionCreate, ActionUpdate
-
-
-def get_version_by_status(db: Session, project_code: str, status: str) -> Version:
-    """Get version by project code and status."""
-    project = db.query(Project).filter(Project.project_code == project_code).first()
-    if not project:
-        raise HTTPException(404, "Project not found")
-
-    version = (
-        db.query(Version)
-        .filter(Version.project_id == project.id, Version.status == status)
-        .first()
-    )
-    if not version:
-        raise HTTPException(404, f"Version with status '{status}' not found")
-
-    return version
+from app.models import Action
+from app.schemas.action import ActionCreate, ActionResponse, ActionUpdate
+from app.services.common import get_version_by_status, touch_version
+from app.core.pagination import PageParams, paginate
+from app.db.reads import fetch_rows, select_for
 
 
 def create_action(db: Session, project_code: str, payload: ActionCreate) -> Action:
     """Create a new custom action in the draft version."""
     version = get_version_by_status(db, project_code, "draft")
+    touch_version(db, version.id)
 
     # Check for duplicate
     existing = (
@@ -54,16 +43,20 @@ def create_action(db: Session, project_code: str, payload: ActionCreate) -> Acti
     return action
 
 
-def list_actions(db: Session, project_code: str, status: str) -> list:
+def list_actions(
+    db: Session,
+    project_code: str,
+    status: str,
+    page: Optional[PageParams] = None,
+) -> list:
     """List all actions for a version."""
     version = get_version_by_status(db, project_code, status)
 
-    return (
-        db.query(Action)
-        .filter(Action.version_id == version.id)
-        .order_by(Action.name)
-        .all()
+    query = (
+        select_for(ActionResponse, Action)
+        .where(Action.version_id == version.id)
     )
+    return fetch_rows(db, paginate(query, Action.name, page))
 
 
 def get_action(db: Session, project_code: str, status: str, action_name: str) -> Action:
@@ -86,6 +79,7 @@ def update_action(
 ) -> Action:
     """Update an action in the draft version."""
     version = get_version_by_status(db, project_code, "draft")
+    touch_version(db, version.id)
 
     action = (
         db.query(Action)
@@ -128,6 +122,7 @@ def update_action(
 def delete_action(db: Session, project_code: str, action_name: str) -> None:
     """Delete an action from the draft version."""
     version = get_version_by_status(db, project_code, "draft")
+    touch_version(db, version.id)
 
     action = (
         db.query(Action)
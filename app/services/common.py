@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
-from app.models import Project, Version
+from app.models import Language, Project, Version, VersionLanguage
+from app.utils.resolver_cache import resolver_cache
 
 
 def get_project(db: Session, project_code: str) -> Project:
@@ -20,7 +21,26 @@ def get_version_by_status(
     project_code: str,
     status: str,
 ) -> Version:
-    """Get version by project_code and status."""
+    """
+    Get version by project_code and status.
+
+    The version id is memoized on the session and in the process-wide
+    resolver cache; a hit costs one primary-key load (none when the
+    version is already in the session) and is checked against the
+    version's current status.
+    """
+    key = (project_code, status)
+    memo = db.info.setdefault("resolved_versions", {})
+
+    version_id = memo.get(key) or resolver_cache.versions.get(key)
+    if version_id is not None:
+        version = db.get(Version, version_id)
+        if version is not None and version.status == status:
+            memo[key] = version_id
+            return version
+        memo.pop(key, None)
+        resolver_cache.versions.pop(key)
+
     project = get_project(db, project_code)
     
     version = (
@@ -33,7 +53,9 @@ def get_version_by_status(
     )
     if not version:
         raise HTTPException(404, f"Version with status '{status}' not found")
-    
+
+    memo[key] = version.id
+    resolver_cache.versions.set(key, version.id)
     return version
 
 
@@ -42,6 +64,54 @@ def get_draft_version(db: Session, project_code: str) -> Version:
     return get_version_by_status(db, project_code, "draft")
 
 
+def get_language_id(db: Session, language_code: str) -> str:
+    """Get the id of a language by code; cached process-wide."""
+    language_id = resolver_cache.languages.get(language_code)
+    if language_id is not None:
+        return language_id
+
+    language_id = (
+        db.query(Language.id)
+        .filter(Language.language_code == language_code)
+        .scalar()
+    )
+    if language_id is None:
+        raise HTTPException(404, "Language not found")
+
+    resolver_cache.languages.set(language_code, language_id)
+    return language_id
+
+
+def require_version_language(db: Session, version_id: str, language_id: str) -> None:
+    """Raise 400 unless the language is enabled in the (draft) version."""
+    enabled = (
+        db.query(VersionLanguage.id)
+        .filter(
+            VersionLanguage.version_id == version_id,
+            VersionLanguage.language_id == language_id,
+        )
+        .first()
+    )
+    if not enabled:
+        raise HTTPException(400, "Language not enabled in draft version")
+
+
+def touch_version(db: Session, version_id: str) -> None:
+    """Record a change to a version's content by bumping its change counter."""
+    db.query(Version).filter(Version.id == version_id).update(
+        {Version.change_counter: Version.change_counter + 1},
+        synchronize_session=False,
+    )
+
+
+def lock_version(db: Session, version_id: str) -> None:
+    """
+    Lock a version row until the end of the transaction, so concurrent
+    writers that create rows by name in it run one after the other.
+    """
+    db.query(Version.id).filter(Version.id == version_id).with_for_update().one()
+
+
 def validate_status(status: str) -> None:
     """Validate version status."""
     if status not in ("draft", "locked", "archived"):
@@ -1,11 +1,17 @@
+from typing import Optional
+
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from app.models.entity import Entity, EntityRole, EntityGroup
-from app.services.common import get_version_by_status, get_draft_version
+from app.services.common import get_version_by_status, get_draft_version, touch_version
+from app.core.pagination import PageParams, paginate
+from app.db.reads import fetch_grouped, fetch_rows, select_for
+from app.schemas.entity import EntityResponse
 
 
 def create_entity(db: Session, project_code: str, payload):
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     if payload.entity_type not in ("text", "numeric"):
         raise HTTPException(400, "entity_type must be 'text' or 'numeric'")
@@ -51,41 +57,39 @@ def create_entity(db: Session, project_code: str, payload):
     return entity, roles, groups
 
 
-def list_entities(db: Session, project_code: str, status: str):
-    version = get_version_by_status(db, project_code, status)
+def _with_roles_and_groups(db: Session, entities) -> list:
+    """Entity dicts with their roles and groups, two queries for all entities."""
+    ids = [e.id for e in entities]
+    roles = fetch_grouped(db, EntityRole.entity_id, EntityRole.role, ids)
+    groups = fetch_grouped(db, EntityGroup.entity_id, EntityGroup.group_name, ids)
+
+    return [
+        {
+            "id": e.id,
+            "entity_key": e.entity_key,
+            "entity_type": e.entity_type,
+            "use_regex": e.use_regex,
+            "use_lookup": e.use_lookup,
+            "influence_conversation": e.influence_conversation,
+            "roles": roles[e.id],
+            "groups": groups[e.id],
+        }
+        for e in entities
+    ]
 
-    entities = (
-        db.query(Entity)
-        .filter(Entity.version_id == version.id)
-        .order_by(Entity.entity_key)
-        .all()
-    )
 
-    response = []
-    for e in entities:
-        roles = [
-            r.role
-            for r in db.query(EntityRole).filter(EntityRole.entity_id == e.id).all()
-        ]
-        groups = [
-            g.group_name
-            for g in db.query(EntityGroup).filter(EntityGroup.entity_id == e.id).all()
-        ]
-
-        response.append(
-            {
-                "id": e.id,
-                "entity_key": e.entity_key,
-                "entity_type": e.entity_type,
-                "use_regex": e.use_regex,
-                "use_lookup": e.use_lookup,
-                "influence_conversation": e.influence_conversation,
-                "roles": roles,
-                "groups": groups,
-            }
-        )
+def list_entities(
+    db: Session,
+    project_code: str,
+    status: str,
+    page: Optional[PageParams] = None,
+):
+    version = get_version_by_status(db, project_code, status)
 
-    return response
+    query = select_for(EntityResponse, Entity).where(Entity.version_id == version.id)
+    entities = fetch_rows(db, paginate(query, Entity.entity_key, page))
+
+    return _with_roles_and_groups(db, entities)
 
 
 def get_entity(db: Session, project_code: str, status: str, entity_key: str):
@@ -102,29 +106,12 @@ def get_entity(db: Session, project_code: str, status: str, entity_key: str):
     if not entity:
         raise HTTPException(404, "Entity not found")
 
-    roles = [
-        r.role
-        for r in db.query(EntityRole).filter(EntityRole.entity_id == entity.id).all()
-    ]
-    groups = [
-        g.group_name
-        for g in db.query(EntityGroup).filter(EntityGroup.entity_id == entity.id).all()
-    ]
-
-    return {
-        "id": entity.id,
-        "entity_key": entity.entity_key,
-        "entity_type": entity.entity_type,
-        "use_regex": entity.use_regex,
-        "use_lookup": entity.use_lookup,
-        "influence_conversation": entity.influence_conversation,
-        "roles": roles,
-        "groups": groups,
-    }
+    return _with_roles_and_groups(db, [entity])[0]
 
 
 def update_entity(db: Session, project_code: str, entity_key: str, payload):
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     entity = (
         db.query(Entity)
@@ -160,29 +147,12 @@ def update_entity(db: Session, project_code: str, entity_key: str, payload):
     db.commit()
     db.refresh(entity)
 
-    roles = [
-        r.role
-        for r in db.query(EntityRole).filter(EntityRole.entity_id == entity.id).all()
-    ]
-    groups = [
-        g.group_name
-        for g in db.query(EntityGroup).filter(EntityGroup.entity_id == entity.id).all()
-    ]
-
-    return {
-        "id": entity.id,
-        "entity_key": entity.entity_key,
-        "entity_type": entity.entity_type,
-        "use_regex": entity.use_regex,
-        "use_lookup": entity.use_lookup,
-        "influence_conversation": entity.influence_conversation,
-        "roles": roles,
-        "groups": groups,
-    }
+    return _with_roles_and_groups(db, [entity])[0]
 
 
 def delete_entity(db: Session, project_code: str, entity_key: str):
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     entity = (
         db.query(Entity)
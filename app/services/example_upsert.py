@@ -0,0 +1,59 @@
+from collections import Counter
+from typing import Any, Dict, List
+
+from sqlalchemy import delete, insert, literal_column, select
+from sqlalchemy.orm import Session
+
+
+def clean_examples(examples: List[str]) -> List[str]:
+    """Strip examples and drop blank ones."""
+    return [text.strip() for text in examples if text.strip()]
+
+
+def sync_examples(
+    db: Session,
+    model,
+    scope: Dict[str, Any],
+    examples: List[str],
+) -> Dict[str, int]:
+    """
+    Make the examples of `model` matching `scope` (owner id and language id
+    columns) the same multiset as `examples`.
+
+    Stored rows whose text is still wanted are kept untouched, with their
+    id and created_at, so their export order does not change; only rows
+    no longer wanted are deleted and only new texts are inserted (in
+    request order, after the kept ones, with one multi-row INSERT per
+    batch). Returns {"added": n, "removed": n, "unchanged": n}.
+    """
+    filters = [getattr(model, column) == value for column, value in scope.items()]
+    rows = db.execute(
+        select(model.id, model.example)
+        .where(*filters)
+        .order_by(model.created_at, literal_column(f"{model.__tablename__}.ctid"))
+    ).all()
+
+    missing = Counter(clean_examples(examples))
+    removed_ids = []
+    for row_id, example in rows:
+        if missing[example] > 0:
+            missing[example] -= 1
+        else:
+            removed_ids.append(row_id)
+
+    added = []
+    for example in clean_examples(examples):
+        if missing[example] > 0:
+            missing[example] -= 1
+            added.append(example)
+
+    if removed_ids:
+        db.execute(delete(model).where(model.id.in_(removed_ids)))
+    if added:
+        db.execute(insert(model), [{**scope, "example": example} for example in added])
+
+    return {
+        "added": len(added),
+        "removed": len(removed_ids),
+        "unchanged": len(rows) - len(removed_ids),
+    }
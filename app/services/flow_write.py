@@ -0,0 +1,125 @@
+"""
+Shared pieces of the story and rule batch writes.
+
+A batch carries names (intents, actions, responses, forms, slots,
+entities); `resolve_references` turns all of them into ids with one query
+per type, and `insert_rows` writes a table's rows with one multi-row
+INSERT per batch. Ids are generated here, so steps and their slot events
+and entities can be linked before anything is inserted.
+"""
+
+from typing import Dict, Iterable, List
+
+from fastapi import HTTPException
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.models import Action, Entity, Form, Intent, Response, Slot
+
+
+# kind -> (name column, label used in errors)
+REFERENCE_COLUMNS = {
+    "intent": (Intent.intent_name, "Intent"),
+    "action": (Action.name, "Action"),
+    "response": (Response.name, "Response"),
+    "form": (Form.name, "Form"),
+    "slot": (Slot.name, "Slot"),
+    "entity": (Entity.entity_key, "Entity"),
+}
+
+
+def collect_step_references(steps: Iterable) -> Dict[str, Dict[str, str]]:
+    """
+    Names referenced by step payloads, per kind, each mapped to the
+    position (`steps[i]`) of the first step that uses it.
+    """
+    names = {kind: {} for kind in REFERENCE_COLUMNS}
+
+    def use(kind, name, where):
+        if name:
+            names[kind].setdefault(name, where)
+
+    for position, step in enumerate(steps):
+        where = f"steps[{position}]"
+        use("intent", step.intent_name, where)
+        for intent_name in getattr(step, "or_intents", None) or []:
+            use("intent", intent_name, where)
+        use("action", step.action_name, where)
+        use("response", step.response_name, where)
+        use("form", step.form_name, where)
+        for event in step.slot_events or []:
+            use("slot", event.slot_name, where)
+        for entity in step.entities or []:
+            use("entity", entity.entity_key, where)
+    return names
+
+
+def resolve_references(
+    db: Session, version_id: str, names: Dict[str, Dict[str, str]]
+) -> Dict[str, Dict[str, str]]:
+    """
+    Map the names of each kind to their ids in `version_id`, one query per
+    kind. Raises one 400 listing every name that does not exist, with the
+    step that uses it.
+    """
+    resolved = {}
+    for kind, wanted in names.items():
+        column, _ = REFERENCE_COLUMNS[kind]
+        if not wanted:
+            resolved[kind] = {}
+            continue
+        model = column.class_
+        rows = db.execute(
+            select(column, model.id).where(
+                model.version_id == version_id, column.in_(list(wanted))
+            )
+        )
+        resolved[kind] = dict(rows.all())
+
+    errors = missing_references(names, resolved)
+    if errors:
+        raise HTTPException(400, "; ".join(errors))
+    return resolved
+
+
+def missing_references(
+    names: Dict[str, Dict[str, str]], resolved: Dict[str, Dict[str, str]]
+) -> List[str]:
+    """One message per kind listing the `names` absent from `resolved`."""
+    errors = []
+    for kind, wanted in names.items():
+        missing = sorted(name for name in wanted if name not in resolved[kind])
+        if missing:
+            errors.append(
+                f"{REFERENCE_COLUMNS[kind][1]} not found in same version: "
+                + ", ".join(f"{name} ({wanted[name]})" for name in missing)
+            )
+    return errors
+
+
+def check_action_step(step, where: str) -> None:
+    """An action step names exactly one of action, response or form."""
+    provided = sum(
+        [bool(step.action_name), bool(step.response_name), bool(step.form_name)]
+    )
+    if provided == 0:
+        raise HTTPException(
+            400,
+            f"{where}: action_name, response_name, or form_name "
+            "is required for action step",
+        )
+    if provided > 1:
+        raise HTTPException(
+            400,
+            f"{where}: provide only one of action_name, response_name, "
+            "or form_name",
+        )
+
+
+def insert_rows(db: Session, model, rows: List[dict]) -> None:
+    """INSERT `rows` into `model`'s table, batched into multi-row statements."""
+    # A Core INSERT on the table: the ORM bulk path splits rows into one
+    # statement per run of rows whose NULL columns differ, which for
+    # alternating intent/action steps means one statement per step.
+    if rows:
+        db.execute(insert(model.__table__), rows)
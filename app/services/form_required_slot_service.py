@@ -3,11 +3,12 @@ from fastapi import HTTPException
 
 from app.models import Form, Slot, FormSlotMapping
 from app.models.form import FormRequiredSlot
-from app.services.common import get_version_by_status, get_draft_version
+from app.services.common import get_version_by_status, get_draft_version, touch_version
 
 
 def add_required_slot(db: Session, project_code: str, form_name: str, payload):
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     form = (
         db.query(Form)
@@ -110,6 +111,7 @@ def update_required_slot(
     db: Session, project_code: str, form_name: str, slot_name: str, payload
 ):
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     form = (
         db.query(Form)
@@ -164,6 +166,7 @@ def remove_required_slot(
     db: Session, project_code: str, form_name: str, slot_name: str
 ):
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     form = (
         db.query(Form)
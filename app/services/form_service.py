@@ -1,8 +1,13 @@
+from typing import Optional
+
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
 from app.models import Form, FormRequiredSlot, FormSlotMapping, Intent
-from app.services.common import get_version_by_status, get_draft_version
+from app.services.common import get_version_by_status, get_draft_version, touch_version
+from app.core.pagination import PageParams, paginate
+from app.db.reads import fetch_rows, select_for
+from app.schemas.form import FormResponse
 
 
 def validate_ignored_intents(
@@ -27,6 +32,7 @@ def validate_ignored_intents(
 
 def create_form(db: Session, project_code: str, payload):
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     existing = (
         db.query(Form)
@@ -54,12 +60,19 @@ def create_form(db: Session, project_code: str, payload):
     return form
 
 
-def list_forms(db: Session, project_code: str, status: str):
+def list_forms(
+    db: Session,
+    project_code: str,
+    status: str,
+    page: Optional[PageParams] = None,
+):
     version = get_version_by_status(db, project_code, status)
 
-    return (
-        db.query(Form).filter(Form.version_id == version.id).order_by(Form.name).all()
+    query = (
+        select_for(FormResponse, Form)
+        .where(Form.version_id == version.id)
     )
+    return fetch_rows(db, paginate(query, Form.name, page))
 
 
 def get_form(db: Session, project_code: str, status: str, form_name: str):
@@ -81,6 +94,7 @@ def get_form(db: Session, project_code: str, status: str, form_name: str):
 
 def update_form(db: Session, project_code: str, form_name: str, payload):
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     form = (
         db.query(Form)
@@ -117,6 +131,7 @@ def update_form(db: Session, project_code: str, form_name: str, payload):
 
 def delete_form(db: Session, project_code: str, form_name: str):
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     form = (
         db.query(Form)
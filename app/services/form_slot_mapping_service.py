@@ -3,7 +3,7 @@ from fastapi import HTTPException
 
 from app.models import Form, Slot, Entity, Intent
 from app.models.form import FormSlotMapping, FormRequiredSlot
-from app.services.common import get_version_by_status, get_draft_version
+from app.services.common import get_version_by_status, get_draft_version, touch_version
 
 
 def add_form_slot_mapping(
@@ -23,6 +23,7 @@ def add_form_slot_mapping(
     - from_trigger_intent: Set value from triggering intent
     """
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     # Get form
     form = (
@@ -254,6 +255,7 @@ def update_form_slot_mapping(
 ):
     """Update a form slot mapping."""
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     # Get form
     form = (
@@ -351,6 +353,7 @@ def delete_form_slot_mapping(
 ):
     """Delete a form slot mapping."""
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     # Get form
     form = (
@@ -1,4 +1,5 @@
 from fastapi import HTTPException, status
+from sqlalchemy import and_, func
 from sqlalchemy.orm import Session
 
 from app.models import (
@@ -10,6 +11,53 @@ from app.models import (
 )
 
 
+def find_intent_example_violations(
+    db: Session,
+    version_id: str,
+    minimum: int = 10,
+):
+    """
+    Return every (intent, language) pair of the version with fewer than
+    `minimum` examples, counted in a single grouped query.
+    """
+    example_count = func.count(IntentExample.id)
+
+    rows = (
+        db.query(
+            Intent.intent_name,
+            Language.language_code,
+            example_count,
+        )
+        .join(VersionLanguage, VersionLanguage.version_id == Intent.version_id)
+        .join(Language, Language.id == VersionLanguage.language_id)
+        .outerjoin(
+            IntentLocalization,
+            and_(
+                IntentLocalization.intent_id == Intent.id,
+                IntentLocalization.language_id == VersionLanguage.language_id,
+            ),
+        )
+        .outerjoin(
+            IntentExample,
+            IntentExample.intent_localization_id == IntentLocalization.id,
+        )
+        .filter(Intent.version_id == version_id)
+        .group_by(Intent.id, Intent.intent_name, Language.language_code)
+        .having(example_count < minimum)
+        .order_by(Intent.intent_name, Language.language_code)
+        .all()
+    )
+
+    return [
+        {
+            "intent": intent_name,
+            "language": language_code,
+            "examples": count,
+        }
+        for intent_name, language_code, count in rows
+    ]
+
+
 def validate_all_intents_for_version(
     db: Session,
     version_id: str,
@@ -21,59 +69,45 @@ def validate_all_intents_for_version(
     - At least one language is enabled for the version
     - At least one intent exists
     - Every intent has >= minimum examples for every enabled language
+
+    All violating intent/language pairs are reported together.
     """
     # Enabled languages
-    version_languages = (
-        db.query(VersionLanguage, Language)
-        .join(Language, VersionLanguage.language_id == Language.id)
+    has_languages = (
+        db.query(VersionLanguage.id)
         .filter(VersionLanguage.version_id == version_id)
-        .all()
+        .first()
     )
 
-    if not version_languages:
+    if not has_languages:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot promote: no languages enabled in version",
         )
 
     # Intents
-    intents = db.query(Intent).filter(Intent.version_id == version_id).all()
+    has_intents = db.query(Intent.id).filter(Intent.version_id == version_id).first()
 
-    if not intents:
+    if not has_intents:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot promote: no intents defined in version",
         )
 
     # Validate examples
-    for intent in intents:
-        for _, language in version_languages:
-            localization = (
-                db.query(IntentLocalization)
-                .filter(
-                    IntentLocalization.intent_id == intent.id,
-                    IntentLocalization.language_id == language.id,
-                )
-                .first()
-            )
-
-            example_count = 0
-            if localization:
-                example_count = (
-                    db.query(IntentExample)
-                    .filter(IntentExample.intent_localization_id == localization.id)
-                    .count()
-                )
+    violations = find_intent_example_violations(db, version_id, minimum)
 
-            if example_count < minimum:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=(
-                        f"Intent '{intent.intent_name}' has only "
-                        f"{example_count} examples for language "
-                        f"'{language.language_code}'. "
-                        f"Minimum required is {minimum}."
-                    ),
-                )
+    if violations:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "message": (
+                    f"Cannot promote: {len(violations)} intent/language "
+                    f"pairs have fewer than {minimum} examples"
+                ),
+                "minimum": minimum,
+                "violations": violations,
+            },
+        )
 
     return True
@@ -0,0 +1,946 @@
+"""
+Import a Rasa project (domain.yml + data/*.yml) into a project's draft.
+
+Everything is written in one transaction. Names are resolved in memory:
+each table's name -> id map is built as its rows are generated. Rows are
+inserted with multi-row INSERTs through a buffer that is flushed every
+IMPORT_BATCH_SIZE rows, parents first. Data files are read item by item
+(see app.utils.rasa_project_reader), in two passes: NLU data first, then
+stories and rules, each written as soon as it is read. Memory is bounded
+by the batch size and the largest single item, not by the number of
+examples or steps. Only the name maps and the synonym blocks (which wait
+for the entity annotations of every example) grow with the data.
+
+What the Rasa format does not carry is inferred or reported:
+
+  * response variants are imported without a language, as the export
+    writes them;
+  * a regex or lookup table is attached to the entity of the same name,
+    and a synonym to the entities its value is annotated with in the
+    training examples; blocks that cannot be attached are skipped with
+    a warning;
+  * intents with NLU examples and actions used in stories or rules but
+    missing from the domain are created, with a warning.
+"""
+
+import json
+import re
+import uuid
+from collections import defaultdict
+from typing import IO, Any, Dict, List, Optional
+
+import yaml
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import exists, update
+from sqlalchemy.orm import Session
+
+from app.models import (
+    Action,
+    Entity,
+    EntityGroup,
+    EntityRole,
+    Form,
+    FormRequiredSlot,
+    FormSlotMapping,
+    Intent,
+    IntentExample,
+    IntentLocalization,
+    Language,
+    Lookup,
+    LookupExample,
+    Regex,
+    RegexExample,
+    Response,
+    ResponseComponent,
+    ResponseCondition,
+    ResponseVariant,
+    Rule,
+    RuleCondition,
+    RuleSlotEvent,
+    RuleStep,
+    RuleStepEntity,
+    SessionConfig,
+    Slot,
+    SlotMapping,
+    Story,
+    StorySlotEvent,
+    StoryStep,
+    StoryStepEntity,
+    Synonym,
+    SynonymExample,
+    VersionLanguage,
+)
+from app.schemas.rule import RuleWriteCondition, RuleWriteStep
+from app.schemas.story import StoryWriteStep
+from app.services.common import get_draft_version, lock_version, touch_version
+from app.services.flow_write import (
+    collect_step_references,
+    insert_rows,
+    missing_references,
+)
+from app.services.promotion_helpers import VERSION_TABLES, delete_version_data
+from app.services.rule_service import check_rule_write_step, rule_rows
+from app.services.story_service import check_story_write_step, story_step_rows
+from app.utils.rasa_project_reader import (
+    RasaProjectFiles,
+    iter_yaml_sections,
+    load_yaml,
+    split_examples,
+)
+
+
+IMPORT_BATCH_SIZE = 5000
+
+# An import replaces the draft's content but keeps its languages.
+IMPORTED_TABLES = [t for t in VERSION_TABLES if t != "version_languages"]
+
+# A draft holding any of these is not empty. A session config alone is
+# replaced without asking.
+CONTENT_MODELS = [Intent, Entity, Slot, Form, Response, Action, Story, Rule]
+
+# Insert order of buffered rows: every table after the ones it references.
+INSERT_ORDER = [
+    Intent,
+    Entity,
+    EntityRole,
+    EntityGroup,
+    Slot,
+    SlotMapping,
+    Form,
+    FormRequiredSlot,
+    FormSlotMapping,
+    Response,
+    ResponseVariant,
+    ResponseCondition,
+    ResponseComponent,
+    Action,
+    SessionConfig,
+    IntentLocalization,
+    IntentExample,
+    Regex,
+    RegexExample,
+    Lookup,
+    LookupExample,
+    Synonym,
+    SynonymExample,
+    Story,
+    StoryStep,
+    StorySlotEvent,
+    StoryStepEntity,
+    Rule,
+    RuleCondition,
+    RuleStep,
+    RuleSlotEvent,
+    RuleStepEntity,
+]
+
+# Sections read by the second pass over the data files.
+FLOW_KEYS = ("stories", "rules")
+
+COMPONENT_TYPES = ("text", "buttons", "image", "custom", "attachment")
+
+_NLU_FILE_LANGUAGE = re.compile(r"^nlu[_-]([A-Za-z0-9_-]+)$")
+# Entity annotations: [text](entity:value) and [text]{"entity": .., "value": ..}
+_ANNOTATION_LEGACY = re.compile(r"\]\(([^)]+)\)")
+_ANNOTATION_JSON = re.compile(r"\](\{[^}]*\})")
+
+
+def _new_id() -> str:
+    return str(uuid.uuid4())
+
+
+def _text(value: Any) -> Optional[str]:
+    """A YAML scalar as stored in the String value columns."""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _named(item: Any, where: str):
+    """A `name` or `{name: spec}` list item as (name, spec)."""
+    if isinstance(item, dict) and len(item) == 1:
+        name, spec = next(iter(item.items()))
+        return str(name), spec or {}
+    if isinstance(item, (str, int)):
+        return str(item), {}
+    raise HTTPException(400, f"{where}: expected a name, got {item!r}")
+
+
+def _mapping(value: Any, where: str) -> dict:
+    """A YAML mapping, with a missing/empty one read as {}."""
+    if value is None:
+        return {}
+    if not isinstance(value, dict):
+        raise HTTPException(400, f"{where}: expected a mapping, got {value!r}")
+    return value
+
+
+def _list(value: Any, where: str) -> list:
+    """A YAML list, with a missing/empty one read as []."""
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        raise HTTPException(400, f"{where}: expected a list, got {value!r}")
+    return value
+
+
+class _RowBuffer:
+    """Rows waiting to be inserted, flushed in INSERT_ORDER."""
+
+    def __init__(self, db: Session, batch_size: int):
+        self.db = db
+        self.batch_size = batch_size
+        self.rows = {model: [] for model in INSERT_ORDER}
+        self.pending = 0
+        self.counts = defaultdict(int)
+
+    def add(self, model, row: dict):
+        self.rows[model].append(row)
+        self.pending += 1
+        if self.pending >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        for model, rows in self.rows.items():
+            if rows:
+                insert_rows(self.db, model, rows)
+                self.counts[model.__tablename__] += len(rows)
+                rows.clear()
+        self.pending = 0
+
+
+class _RasaImporter:
+    def __init__(self, db: Session, version_id: str, language_code: Optional[str]):
+        self.db = db
+        self.version_id = version_id
+        self.buffer = _RowBuffer(db, IMPORT_BATCH_SIZE)
+        self.warnings: List[str] = []
+
+        # name -> id of everything inserted so far
+        self.intents: Dict[str, str] = {}
+        self.entities: Dict[str, str] = {}
+        self.slots: Dict[str, str] = {}
+        self.forms: Dict[str, str] = {}
+        self.responses: Dict[str, str] = {}
+        self.actions: Dict[str, str] = {}
+
+        # (intent_id, language_id) -> localization id
+        self.localizations: Dict[tuple, str] = {}
+        # name -> (id, {(language_id, example)}) of regexes / lookups
+        self.regexes: Dict[str, tuple] = {}
+        self.lookups: Dict[str, tuple] = {}
+        # synonyms wait for the annotations of all intent examples
+        self.synonym_blocks: List[tuple] = []
+        self.annotated: Dict[str, set] = defaultdict(set)
+        self.skipped: set = set()
+
+        self.languages = dict(
+            db.query(Language.language_code, Language.id)
+            .join(VersionLanguage, VersionLanguage.language_id == Language.id)
+            .filter(VersionLanguage.version_id == version_id)
+            .all()
+        )
+        self.default_language_id = self._default_language(language_code)
+
+    def warn(self, message: str):
+        self.warnings.append(message)
+
+    def _default_language(self, language_code: Optional[str]) -> Optional[str]:
+        """Language of NLU files whose name or folder does not give one."""
+        if language_code is not None:
+            if language_code not in self.languages:
+                raise HTTPException(400, "Language not enabled in draft version")
+            return self.languages[language_code]
+
+        default = (
+            self.db.query(VersionLanguage.language_id)
+            .filter(
+                VersionLanguage.version_id == self.version_id,
+                VersionLanguage.is_default.is_(True),
+            )
+            .scalar()
+        )
+        if default is None and len(self.languages) == 1:
+            default = next(iter(self.languages.values()))
+        return default
+
+    def _file_language(self, name: str) -> str:
+        """nlu_<code>.yml and data/<code>/... name their language."""
+        parts = name.split("/")
+        stem = parts[-1].rsplit(".", 1)[0]
+        match = _NLU_FILE_LANGUAGE.match(stem)
+        candidates = ([match.group(1)] if match else []) + parts[:-1]
+
+        for code in candidates:
+            if code in self.languages:
+                return self.languages[code]
+        if match and self.db.query(
+            exists().where(Language.language_code == match.group(1))
+        ).scalar():
+            raise HTTPException(
+                400, f"{name}: language '{match.group(1)}' is not enabled in draft version"
+            )
+        if self.default_language_id is None:
+            raise HTTPException(
+                400,
+                f"{name}: cannot tell the language of the file; "
+                "pass a language enabled in the draft version",
+            )
+        return self.default_language_id
+
+    # -----------------------------
+    # DOMAIN
+    # -----------------------------
+    def load_domain(self, files: RasaProjectFiles):
+        domain: Dict[str, Any] = {}
+        for name in files.domain_files:
+            doc = _read_file(files, name, load_yaml) or {}
+            if not isinstance(doc, dict):
+                raise HTTPException(400, f"{name}: expected a mapping at the top level")
+            for key, value in doc.items():
+                if value is None:
+                    continue
+                if isinstance(value, list) and isinstance(domain.get(key, []), list):
+                    domain.setdefault(key, []).extend(value)
+                elif isinstance(value, dict) and isinstance(domain.get(key, {}), dict):
+                    domain.setdefault(key, {}).update(value)
+                else:
+                    domain[key] = value
+
+        for item in _list(domain.get("intents"), "intents"):
+            name, _ = _named(item, "intents")
+            self.add_intent(name)
+        for item in _list(domain.get("entities"), "entities"):
+            name, spec = _named(item, "entities")
+            self.add_entity(name, _mapping(spec, f"entities.{name}"))
+        for name, spec in _mapping(domain.get("slots"), "slots").items():
+            self.add_slot(str(name), _mapping(spec, f"slots.{name}"))
+        for name, spec in _mapping(domain.get("forms"), "forms").items():
+            self.add_form(str(name), _mapping(spec, f"forms.{name}"))
+        for name, variants in _mapping(domain.get("responses"), "responses").items():
+            self.add_response(str(name), _list(variants, f"responses.{name}"))
+        for item in _list(domain.get("actions"), "actions"):
+            name, _ = _named(item, "actions")
+            if name in self.responses or name in self.forms:
+                # Rasa lets responses and forms be listed as actions too;
+                # steps naming them are bound to the response / form.
+                kind = "response" if name in self.responses else "form"
+                self.warn(f"Action '{name}' names a {kind}; not imported as an action")
+                continue
+            self.add_action(name)
+
+        if domain.get("session_config") is not None:
+            session_config = _mapping(domain["session_config"], "session_config")
+            expiration = session_config.get("session_expiration_time", 60)
+            carry_over = session_config.get("carry_over_slots_to_new_session", True)
+            if isinstance(expiration, bool) or not isinstance(expiration, (int, float)):
+                raise HTTPException(
+                    400,
+                    f"session_config.session_expiration_time: expected a number, "
+                    f"got {expiration!r}",
+                )
+            if not isinstance(carry_over, bool):
+                raise HTTPException(
+                    400,
+                    f"session_config.carry_over_slots_to_new_session: expected true "
+                    f"or false, got {carry_over!r}",
+                )
+            self.buffer.add(SessionConfig, {
+                "id": _new_id(),
+                "version_id": self.version_id,
+                "session_expiration_time": int(expiration),
+                "carry_over_slots_to_new_session": carry_over,
+            })
+
+    def add_intent(self, name: str) -> str:
+        if name not in self.intents:
+            self.intents[name] = _new_id()
+            self.buffer.add(
+                Intent,
+                {"id": self.intents[name], "version_id": self.version_id, "intent_name": name},
+            )
+        return self.intents[name]
+
+    def add_entity(self, name: str, spec: dict):
+        if name in self.entities:
+            return
+        entity_id = self.entities[name] = _new_id()
+        self.buffer.add(Entity, {
+            "id": entity_id,
+            "version_id": self.version_id,
+            "entity_key": name,
+            "entity_type": "text",
+            "use_regex": False,
+            "use_lookup": False,
+            "influence_conversation": bool(spec.get("influence_conversation", False)),
+        })
+        roles = _list(spec.get("roles"), f"entities.{name}.roles")
+        for role in dict.fromkeys(_text(r) for r in roles):
+            self.buffer.add(EntityRole, {"id": _new_id(), "entity_id": entity_id, "role": role})
+        groups = _list(spec.get("groups"), f"entities.{name}.groups")
+        for group in dict.fromkeys(_text(g) for g in groups):
+            self.buffer.add(
+                EntityGroup, {"id": _new_id(), "entity_id": entity_id, "group_name": group}
+            )
+
+    def entity_id(self, name: Any, where: str) -> Optional[str]:
+        if name is None:
+            return None
+        if str(name) not in self.entities:
+            raise HTTPException(400, f"{where}: entity '{name}' is not declared in the domain")
+        return self.entities[str(name)]
+
+    def add_slot(self, name: str, spec: dict):
+        if spec.get("type") is None:
+            raise HTTPException(400, f"slots.{name}: type is required")
+        slot_id = self.slots[name] = _new_id()
+        self.buffer.add(Slot, {
+            "id": slot_id,
+            "version_id": self.version_id,
+            "name": name,
+            "slot_type": spec["type"],
+            "influence_conversation": bool(spec.get("influence_conversation", True)),
+            "initial_value": _text(spec.get("initial_value")),
+            "values": spec.get("values"),
+            "min_value": spec.get("min_value"),
+            "max_value": spec.get("max_value"),
+        })
+
+        # The export lists mappings by descending priority.
+        mappings = _list(spec.get("mappings"), f"slots.{name}.mappings")
+        for position, mapping in enumerate(mappings):
+            where = f"slots.{name}.mappings[{position}]"
+            mapping = _mapping(mapping, where)
+            self.buffer.add(SlotMapping, {
+                "id": _new_id(),
+                "slot_id": slot_id,
+                "mapping_type": mapping.get("type"),
+                "entity_id": self.entity_id(mapping.get("entity"), where),
+                "role": _text(mapping.get("role")),
+                "group": _text(mapping.get("group")),
+                "intent": _intent_filter(mapping.get("intent"), where),
+                "not_intent": _intent_filter(mapping.get("not_intent"), where),
+                "value": _text(mapping.get("value")),
+                "conditions": mapping.get("conditions"),
+                "active_loop": None,
+                "priority": len(mappings) - position,
+            })
+
+    def add_form(self, name: str, spec: dict):
+        form_id = self.forms[name] = _new_id()
+        self.buffer.add(Form, {
+            "id": form_id,
+            "version_id": self.version_id,
+            "name": name,
+            "ignored_intents": spec.get("ignored_intents"),
+        })
+
+        required_slots = spec.get("required_slots") or {}
+        where = f"forms.{name}.required_slots"
+        if isinstance(required_slots, list):
+            required_slots = {_named(slot, where)[0]: [] for slot in required_slots}
+        required_slots = _mapping(required_slots, where)
+        for order, (slot_name, mappings) in enumerate(required_slots.items(), start=1):
+            where = f"forms.{name}.required_slots.{slot_name}"
+            if slot_name not in self.slots:
+                raise HTTPException(400, f"{where}: slot is not declared in the domain")
+            required_id = _new_id()
+            self.buffer.add(FormRequiredSlot, {
+                "id": required_id,
+                "form_id": form_id,
+                "slot_id": self.slots[slot_name],
+                "order": order,
+                "required": True,
+            })
+            for mapping in _list(mappings, where):
+                mapping = _mapping(mapping, where)
+                self.buffer.add(FormSlotMapping, {
+                    "id": _new_id(),
+                    "form_required_slot_id": required_id,
+                    "mapping_type": mapping.get("type"),
+                    "entity_id": self.entity_id(mapping.get("entity"), where),
+                    "intent": _intent_filter(mapping.get("intent"), where),
+                    "not_intent": _intent_filter(mapping.get("not_intent"), where),
+                    "value": _text(mapping.get("value")),
+                })
+
+    def add_response(self, name: str, variants: list):
+        response_id = self.responses[name] = _new_id()
+        self.buffer.add(
+            Response, {"id": response_id, "version_id": self.version_id, "name": name}
+        )
+
+        # The export lists variants by descending priority.
+        for position, variant in enumerate(variants):
+            where = f"responses.{name}[{position}]"
+            variant = _mapping(variant, where)
+            variant_id = _new_id()
+            self.buffer.add(ResponseVariant, {
+                "id": variant_id,
+                "response_id": response_id,
+                "language_id": None,
+                "priority": len(variants) - position,
+            })
+            conditions = _list(variant.get("condition"), f"{where}.condition")
+            for index, condition in enumerate(conditions):
+                condition = _mapping(condition, f"{where}.condition[{index}]")
+                condition_type = condition.get("type", "slot")
+                self.buffer.add(ResponseCondition, {
+                    "id": _new_id(),
+                    "response_variant_id": variant_id,
+                    "condition_type": condition_type,
+                    "slot_name": _text(condition.get("name")),
+                    "slot_value": (
+                        _text(condition.get("value")) if condition_type == "slot" else None
+                    ),
+                    "order_index": index,
+                })
+            components = [key for key in variant if key in COMPONENT_TYPES]
+            for index, key in enumerate(components):
+                self.buffer.add(ResponseComponent, {
+                    "id": _new_id(),
+                    "response_variant_id": variant_id,
+                    "component_type": key,
+                    "payload": variant[key],
+                    "order_index": index,
+                })
+
+    def add_action(self, name: str):
+        if name not in self.actions:
+            self.actions[name] = _new_id()
+            self.buffer.add(
+                Action, {"id": self.actions[name], "version_id": self.version_id, "name": name}
+            )
+
+    # -----------------------------
+    # DATA FILES
+    # -----------------------------
+    def load_data(self, files: RasaProjectFiles) -> List[str]:
+        """Import the NLU data; returns the files that hold stories or rules."""
+        flow_files = []
+        for name in files.data_files:
+            language_id = None
+            has_flows = False
+            with files.open(name) as stream:
+                for key, item in _sections(stream, name, skipped_keys=FLOW_KEYS):
+                    if key in FLOW_KEYS:
+                        has_flows = True
+                    elif item is None:
+                        # An empty section (`nlu:` with no items) or item.
+                        continue
+                    elif key == "nlu":
+                        if language_id is None:
+                            language_id = self._file_language(name)
+                        self.add_nlu_block(item, language_id, name)
+                    elif key == "responses":
+                        self.warn(f"{name}: responses in data files are not imported")
+            if has_flows:
+                flow_files.append(name)
+
+        self.add_synonyms()
+        self.buffer.flush()
+        self._set_entity_flags()
+        return flow_files
+
+    def add_nlu_block(self, block: Any, language_id: str, where: str):
+        if not isinstance(block, dict):
+            raise HTTPException(400, f"{where}: expected a mapping in nlu, got {block!r}")
+        examples = split_examples(block.get("examples"))
+
+        if "intent" in block:
+            name = str(block["intent"])
+            if name not in self.intents:
+                self.warn(f"Intent '{name}' is not in the domain; created")
+            key = (self.add_intent(name), language_id)
+            if key not in self.localizations:
+                self.localizations[key] = _new_id()
+                self.buffer.add(IntentLocalization, {
+                    "id": self.localizations[key],
+                    "intent_id": key[0],
+                    "language_id": language_id,
+                })
+            localization_id = self.localizations[key]
+            for example in examples:
+                self._collect_annotations(example)
+                self.buffer.add(IntentExample, {
+                    "id": _new_id(),
+                    "intent_localization_id": localization_id,
+                    "example": example,
+                })
+
+        elif "regex" in block:
+            self._add_pattern_examples(
+                self.regexes, Regex, RegexExample, "regex", block["regex"], language_id, examples
+            )
+        elif "lookup" in block:
+            self._add_pattern_examples(
+                self.lookups, Lookup, LookupExample, "lookup", block["lookup"], language_id, examples
+            )
+        elif "synonym" in block:
+            self.synonym_blocks.append((_text(block["synonym"]), language_id, examples))
+        else:
+            self.warn(f"{where}: unsupported nlu block {sorted(block)} skipped")
+
+    def _add_pattern_examples(self, owners, model, example_model, kind, name, language_id, examples):
+        """Regex and lookup blocks; duplicates of a stored example are dropped."""
+        name = str(name)
+        if name not in owners:
+            entity_id = self.entities.get(name)
+            if entity_id is None:
+                if (kind, name) not in self.skipped:
+                    self.skipped.add((kind, name))
+                    self.warn(f"{kind.capitalize()} '{name}' has no entity of the same name; skipped")
+                return
+            owners[name] = (_new_id(), set())
+            self.buffer.add(model, {
+                "id": owners[name][0],
+                "version_id": self.version_id,
+                f"{kind}_name": name,
+                "entity_id": entity_id,
+            })
+        owner_id, seen = owners[name]
+        for example in examples:
+            if (language_id, example) not in seen:
+                seen.add((language_id, example))
+                self.buffer.add(example_model, {
+                    "id": _new_id(),
+                    f"{kind}_id": owner_id,
+                    "language_id": language_id,
+                    "example": example,
+                })
+
+    def _collect_annotations(self, example: str):
+        """Remember which entities each annotated synonym value belongs to."""
+        if "](" in example:
+            for annotation in _ANNOTATION_LEGACY.findall(example):
+                entity, _, value = annotation.partition(":")
+                if value:
+                    self.annotated[value.strip()].add(entity.split("@")[0].strip())
+        if "]{" in example:
+            for annotation in _ANNOTATION_JSON.findall(example):
+                try:
+                    data = json.loads(annotation)
+                except ValueError:
+                    continue
+                if isinstance(data, dict) and data.get("entity") and data.get("value") is not None:
+                    self.annotated[_text(data["value"])].add(str(data["entity"]))
+
+    def add_synonyms(self):
+        synonyms: Dict[tuple, tuple] = {}
+        for canonical, language_id, examples in self.synonym_blocks:
+            entity_names = sorted(e for e in self.annotated.get(canonical, ()) if e in self.entities)
+            if not entity_names:
+                self.warn(
+                    f"Synonym '{canonical}' is not annotated on any declared entity "
+                    "in the training examples; skipped"
+                )
+                continue
+            for entity_name in entity_names:
+                key = (canonical, entity_name)
+                if key not in synonyms:
+                    synonyms[key] = (_new_id(), set())
+                    self.buffer.add(Synonym, {
+                        "id": synonyms[key][0],
+                        "version_id": self.version_id,
+                        "canonical_value": canonical,
+                        "entity_id": self.entities[entity_name],
+                    })
+                synonym_id, seen = synonyms[key]
+                for example in examples:
+                    if (language_id, example) not in seen:
+                        seen.add((language_id, example))
+                        self.buffer.add(SynonymExample, {
+                            "id": _new_id(),
+                            "synonym_id": synonym_id,
+                            "language_id": language_id,
+                            "example": example,
+                        })
+        self.synonym_blocks.clear()
+
+    def _set_entity_flags(self):
+        for owners, flag in ((self.regexes, Entity.use_regex), (self.lookups, Entity.use_lookup)):
+            entity_ids = {self.entities[name] for name in owners}
+            if entity_ids:
+                self.db.execute(
+                    update(Entity).where(Entity.id.in_(entity_ids)).values({flag: True})
+                )
+
+    # -----------------------------
+    # STORIES & RULES
+    # -----------------------------
+    def load_flows(self, files: RasaProjectFiles, flow_files: List[str]):
+        """
+        Import stories and rules, writing each one's rows as it is read.
+        They come after all NLU files so that they may use the intents
+        those create, whatever the order of the files.
+        """
+        story_names, rule_names = set(), set()
+        for name in flow_files:
+            with files.open(name) as stream:
+                for key, item in _sections(stream, name, skipped_keys=("nlu",)):
+                    if item is None:
+                        continue
+                    if key == "stories":
+                        self.add_story(item, name, story_names)
+                    elif key == "rules":
+                        self.add_rule(item, name, rule_names)
+        self.buffer.flush()
+
+    def add_story(self, block: Any, where: str, seen: set):
+        if not isinstance(block, dict) or block.get("story") is None:
+            raise HTTPException(400, f"{where}: expected a story with a name")
+        name = _text(block["story"])
+        if name in seen:
+            raise HTTPException(400, f"Duplicate story '{name}'")
+        seen.add(name)
+
+        label = f"story '{name}'"
+        steps = [
+            self.flow_step(StoryWriteStep, raw, f"{label} steps[{i}]")
+            for i, raw in enumerate(block.get("steps") or [])
+        ]
+        for position, step in enumerate(steps):
+            check_story_write_step(step, f"{label} steps[{position}]")
+        refs = self.flow_references(steps, label)
+
+        story_id = _new_id()
+        self.buffer.add(Story, {"id": story_id, "version_id": self.version_id, "name": name})
+        for model, rows in zip(
+            (StoryStep, StorySlotEvent, StoryStepEntity),
+            story_step_rows(story_id, steps, refs),
+        ):
+            for row in rows:
+                self.buffer.add(model, row)
+
+    def add_rule(self, block: Any, where: str, seen: set):
+        if not isinstance(block, dict) or block.get("rule") is None:
+            raise HTTPException(400, f"{where}: expected a rule with a name")
+        name = _text(block["rule"])
+        if name in seen:
+            raise HTTPException(400, f"Duplicate rule '{name}'")
+        seen.add(name)
+
+        label = f"rule '{name}'"
+        conditions = []
+        for i, raw in enumerate(block.get("condition") or []):
+            if isinstance(raw, dict) and "active_loop" in raw:
+                conditions.append(RuleWriteCondition(
+                    condition_type="active_loop", active_loop=_text(raw["active_loop"])
+                ))
+            elif isinstance(raw, dict) and "slot_was_set" in raw:
+                conditions.extend(
+                    RuleWriteCondition(
+                        condition_type="slot",
+                        slot_name=event["slot_name"],
+                        slot_value=event["value"],
+                    )
+                    for event in _slot_events(raw["slot_was_set"])
+                )
+            else:
+                raise HTTPException(400, f"{label} condition[{i}]: unsupported condition")
+        steps = [
+            self.flow_step(RuleWriteStep, raw, f"{label} steps[{i}]")
+            for i, raw in enumerate(block.get("steps") or [])
+        ]
+        for position, step in enumerate(steps):
+            check_rule_write_step(step, f"{label} steps[{position}]")
+        refs = self.flow_references(steps, label)
+
+        rule_id = _new_id()
+        self.buffer.add(Rule, {"id": rule_id, "version_id": self.version_id, "name": name})
+        for model, rows in zip(
+            (RuleCondition, RuleStep, RuleSlotEvent, RuleStepEntity),
+            rule_rows(rule_id, conditions, steps, refs),
+        ):
+            for row in rows:
+                self.buffer.add(model, row)
+
+    def flow_references(self, steps, label: str) -> Dict[str, Dict[str, str]]:
+        """
+        The name -> id maps of everything imported so far, in the shape of
+        resolve_references; raises 400 listing every name they lack.
+        """
+        refs = {
+            "intent": self.intents,
+            "action": self.actions,
+            "response": self.responses,
+            "form": self.forms,
+            "slot": self.slots,
+            "entity": self.entities,
+        }
+        errors = missing_references(collect_step_references(steps), refs)
+        if errors:
+            raise HTTPException(400, f"{label}: " + "; ".join(errors))
+        return refs
+
+    def flow_step(self, schema, raw: Any, where: str):
+        """A stories.yml / rules.yml step as a StoryWriteStep or RuleWriteStep."""
+        if not isinstance(raw, dict):
+            raise HTTPException(400, f"{where}: expected a mapping")
+
+        if "intent" in raw:
+            fields = {
+                "step_type": "intent",
+                "intent_name": _text(raw["intent"]),
+                "entities": _step_entities(raw.get("entities") or [], where),
+            }
+        elif "action" in raw:
+            fields = {"step_type": "action", **self._action_fields(_text(raw["action"]))}
+        elif "active_loop" in raw:
+            fields = {"step_type": "active_loop", "active_loop_value": _text(raw["active_loop"])}
+        elif "slot_was_set" in raw:
+            fields = {"step_type": "slot", "slot_events": _slot_events(raw["slot_was_set"])}
+        elif "checkpoint" in raw:
+            fields = {"step_type": "checkpoint", "checkpoint_name": _text(raw["checkpoint"])}
+        elif "or" in raw:
+            options = raw["or"] or []
+            if not all(isinstance(o, dict) and "intent" in o for o in options):
+                raise HTTPException(400, f"{where}: only intents are supported in OR steps")
+            fields = {"step_type": "or", "or_intents": [_text(o["intent"]) for o in options]}
+        else:
+            raise HTTPException(400, f"{where}: unsupported step {sorted(raw)}")
+
+        try:
+            return schema(**fields)
+        except ValidationError:
+            raise HTTPException(
+                400, f"{where}: {fields['step_type']} steps are not supported here"
+            )
+
+    def _action_fields(self, name: str) -> dict:
+        """An action step names a response, a form or a custom action."""
+        if name in self.responses:
+            return {"response_name": name}
+        if name in self.forms:
+            return {"form_name": name}
+        if name in self.actions:
+            return {"action_name": name}
+        self.warn(f"Action '{name}' is not in the domain; created")
+        self.add_action(name)
+        return {"action_name": name}
+
+
+def _intent_filter(value: Any, where: str) -> Optional[str]:
+    """Mapping intent / not_intent, stored as a single intent name."""
+    if isinstance(value, list):
+        if len(value) > 1:
+            raise HTTPException(400, f"{where}: only one intent per mapping filter is supported")
+        value = value[0] if value else None
+    return _text(value)
+
+
+def _step_entities(raw: list, where: str) -> list:
+    entities = []
+    for item in raw:
+        if isinstance(item, dict) and "entity" in item:
+            entities.append({
+                "entity_key": _text(item["entity"]),
+                "value": _text(item.get("value")),
+                "role": _text(item.get("role")),
+                "group": _text(item.get("group")),
+            })
+        elif isinstance(item, dict) and len(item) == 1:
+            key, value = next(iter(item.items()))
+            entities.append({"entity_key": _text(key), "value": _text(value)})
+        elif isinstance(item, str):
+            entities.append({"entity_key": item})
+        else:
+            raise HTTPException(400, f"{where}: unsupported entity {item!r}")
+    return entities
+
+
+def _slot_events(raw: Any) -> list:
+    """slot_was_set items ({slot: value} or a bare slot name) as slot events."""
+    events = []
+    for item in raw if isinstance(raw, list) else [raw]:
+        if isinstance(item, dict):
+            events.extend(
+                {"slot_name": _text(slot), "value": _text(value)}
+                for slot, value in item.items()
+            )
+        elif item is not None:
+            events.append({"slot_name": _text(item), "value": None})
+    return events
+
+
+def _read_file(files: RasaProjectFiles, name: str, read):
+    with files.open(name) as stream:
+        try:
+            return read(stream)
+        except (yaml.YAMLError, UnicodeDecodeError) as e:
+            raise HTTPException(400, f"{name}: invalid YAML: {e}")
+
+
+def _sections(stream: IO[bytes], name: str, skipped_keys=()):
+    """iter_yaml_sections, with parse errors reported against the file."""
+    try:
+        yield from iter_yaml_sections(stream, skipped_keys=skipped_keys)
+    except (yaml.YAMLError, UnicodeDecodeError, ValueError) as e:
+        raise HTTPException(400, f"{name}: invalid YAML: {e}")
+
+
+# -----------------------------
+# IMPORT
+# -----------------------------
+def import_rasa_project(
+    db: Session,
+    project_code: str,
+    files: RasaProjectFiles,
+    replace: bool = False,
+    language_code: Optional[str] = None,
+) -> dict:
+    """
+    Import `files` into the project's draft version in one transaction.
+
+    The draft must be empty unless `replace` is set, in which case its
+    content (everything but its languages) is deleted first. NLU files
+    named nlu_<code>.yml or placed under data/<code>/ are imported in that
+    language; others in `language_code`, else the draft's default
+    language.
+    """
+    version = get_draft_version(db, project_code)
+    lock_version(db, version.id)
+
+    if not files.domain_files and not files.data_files:
+        raise HTTPException(400, "No domain.yml or data/ files found")
+
+    if not replace:
+        for model in CONTENT_MODELS:
+            if db.query(exists().where(model.version_id == version.id)).scalar():
+                raise HTTPException(
+                    409, "Draft version is not empty; import with replace=true to overwrite it"
+                )
+    delete_version_data(db, version.id, IMPORTED_TABLES)
+
+    importer = _RasaImporter(db, version.id, language_code)
+    importer.load_domain(files)
+    flow_files = importer.load_data(files)
+    importer.load_flows(files, flow_files)
+
+    touch_version(db, version.id)
+    db.commit()
+
+    return {
+        "project_code": project_code,
+        "version_id": version.id,
+        "counts": dict(importer.buffer.counts),
+        "warnings": importer.warnings,
+    }
+
+
+def import_rasa_zip(
+    db: Session,
+    project_code: str,
+    archive: IO[bytes],
+    replace: bool = False,
+    language_code: Optional[str] = None,
+) -> dict:
+    """import_rasa_project for a ZIP archive, e.g. one made by the ZIP export."""
+    try:
+        files = RasaProjectFiles.from_zip(archive)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    return import_rasa_project(db, project_code, files, replace, language_code)
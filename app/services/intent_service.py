@@ -1,18 +1,35 @@
+from itertools import groupby
+from typing import Iterator, List, Optional
+
+from sqlalchemy import literal_column, select
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
 from app.models import (
     Intent,
     Language,
-    VersionLanguage,
     IntentLocalization,
     IntentExample,
 )
-from app.services.common import get_version_by_status, get_draft_version
+from app.services.common import (
+    get_draft_version,
+    get_language_id,
+    get_version_by_status,
+    require_version_language,
+    touch_version,
+)
+from app.services.example_upsert import sync_examples
+from app.core.pagination import PageParams, paginate
+from app.db.reads import fetch_grouped, fetch_rows, select_for
+from app.schemas.intent import IntentResponse
+
+
+EXAMPLES_YIELD_PER = 2000
 
 
 def create_intent(db: Session, project_code: str, intent_name: str):
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     existing = (
         db.query(Intent)
@@ -37,15 +54,19 @@ def create_intent(db: Session, project_code: str, intent_name: str):
     return intent
 
 
-def list_intents(db: Session, project_code: str, status: str):
+def list_intents(
+    db: Session,
+    project_code: str,
+    status: str,
+    page: Optional[PageParams] = None,
+):
     version = get_version_by_status(db, project_code, status)
 
-    return (
-        db.query(Intent)
-        .filter(Intent.version_id == version.id)
-        .order_by(Intent.intent_name)
-        .all()
+    query = (
+        select_for(IntentResponse, Intent)
+        .where(Intent.version_id == version.id)
     )
+    return fetch_rows(db, paginate(query, Intent.intent_name, page))
 
 
 def get_intent(db: Session, project_code: str, status: str, intent_name: str):
@@ -67,6 +88,7 @@ def get_intent(db: Session, project_code: str, status: str, intent_name: str):
 
 def update_intent(db: Session, project_code: str, intent_name: str, payload):
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     intent = (
         db.query(Intent)
@@ -99,6 +121,7 @@ def update_intent(db: Session, project_code: str, intent_name: str, payload):
 
 def delete_intent(db: Session, project_code: str, intent_name: str):
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     intent = (
         db.query(Intent)
@@ -148,52 +171,36 @@ def upsert_intent_examples(
     if not intent:
         raise HTTPException(404, "Intent not found in draft version")
 
-    language = (
-        db.query(Language).filter(Language.language_code == language_code).first()
-    )
-    if not language:
-        raise HTTPException(404, "Language not found")
+    language_id = get_language_id(db, language_code)
 
-    enabled = (
-        db.query(VersionLanguage)
-        .filter(
-            VersionLanguage.version_id == version.id,
-            VersionLanguage.language_id == language.id,
-        )
-        .first()
-    )
-    if not enabled:
-        raise HTTPException(400, "Language not enabled in draft version")
+    require_version_language(db, version.id, language_id)
 
     localization = (
         db.query(IntentLocalization)
         .filter(
             IntentLocalization.intent_id == intent.id,
-            IntentLocalization.language_id == language.id,
+            IntentLocalization.language_id == language_id,
         )
         .first()
     )
 
-    if not localization:
+    created = localization is None
+    if created:
         localization = IntentLocalization(
             intent_id=intent.id,
-            language_id=language.id,
+            language_id=language_id,
         )
         db.add(localization)
         db.flush()
 
-    db.query(IntentExample).filter(
-        IntentExample.intent_localization_id == localization.id
-    ).delete()
-
-    for text in examples:
-        if text.strip():
-            db.add(
-                IntentExample(
-                    intent_localization_id=localization.id,
-                    example=text.strip(),
-                )
-            )
+    counts = sync_examples(
+        db,
+        IntentExample,
+        {"intent_localization_id": localization.id},
+        examples,
+    )
+    if created or counts["added"] or counts["removed"]:
+        touch_version(db, version.id)
 
     db.commit()
 
@@ -201,6 +208,7 @@ def upsert_intent_examples(
         "intent_name": intent_name,
         "language_code": language_code,
         "example_count": len(examples),
+        **counts,
     }
 
 
@@ -223,23 +231,84 @@ def get_intent_examples(
     if not intent:
         raise HTTPException(404, "Intent not found")
 
-    localizations = (
-        db.query(IntentLocalization)
+    localizations = dict(
+        db.query(IntentLocalization.id, Language.language_code)
+        .join(Language, Language.id == IntentLocalization.language_id)
         .filter(IntentLocalization.intent_id == intent.id)
         .all()
     )
+    examples = fetch_grouped(
+        db, IntentExample.intent_localization_id, IntentExample.example, localizations
+    )
 
-    result = {}
-    for loc in localizations:
-        language = db.query(Language).filter(Language.id == loc.language_id).first()
-        examples = (
-            db.query(IntentExample)
-            .filter(IntentExample.intent_localization_id == loc.id)
-            .all()
+    return {
+        language_code: examples[localization_id]
+        for localization_id, language_code in localizations.items()
+    }
+
+
+def iter_intent_examples(
+    db: Session,
+    project_code: str,
+    status: str,
+    intent_names: Optional[List[str]] = None,
+    language_codes: Optional[List[str]] = None,
+) -> Iterator[dict]:
+    """
+    Examples of many intents of a version with one query, streamed.
+
+    Yields {"intent_name": ..., "examples": {language_code: [...]}} per
+    intent, ordered by intent name. Intents without examples are included
+    with an empty mapping; names and codes that do not exist are ignored.
+    """
+    version = get_version_by_status(db, project_code, status)
+
+    localizations = select(
+        IntentLocalization.id,
+        IntentLocalization.intent_id,
+        Language.language_code,
+    ).join(Language, Language.id == IntentLocalization.language_id)
+    if language_codes:
+        localizations = localizations.where(Language.language_code.in_(language_codes))
+    localizations = localizations.subquery()
+
+    query = (
+        select(
+            Intent.id,
+            Intent.intent_name,
+            localizations.c.language_code,
+            IntentExample.example,
         )
-        result[language.language_code] = [ex.example for ex in examples]
+        .outerjoin(localizations, localizations.c.intent_id == Intent.id)
+        .outerjoin(
+            IntentExample,
+            IntentExample.intent_localization_id == localizations.c.id,
+        )
+        .where(Intent.version_id == version.id)
+        .order_by(
+            Intent.intent_name,
+            Intent.id,
+            localizations.c.language_code,
+            IntentExample.created_at,
+            literal_column("intent_examples.ctid"),
+        )
+    )
+    if intent_names:
+        query = query.where(Intent.intent_name.in_(intent_names))
 
-    return result
+    def grouped(rows):
+        for (_, intent_name), intent_rows in groupby(rows, lambda row: row[:2]):
+            examples = {}
+            for _, _, language_code, example in intent_rows:
+                if language_code is None:
+                    continue
+                language_examples = examples.setdefault(language_code, [])
+                if example is not None:
+                    language_examples.append(example)
+            yield {"intent_name": intent_name, "examples": examples}
+
+    rows = db.connection().execution_options(yield_per=EXAMPLES_YIELD_PER).execute(query)
+    return grouped(rows)
 
 
 def delete_intent_examples(
@@ -249,6 +318,7 @@ def delete_intent_examples(
     language_code: str,
 ):
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     intent = (
         db.query(Intent)
@@ -261,17 +331,13 @@ def delete_intent_examples(
     if not intent:
         raise HTTPException(404, "Intent not found")
 
-    language = (
-        db.query(Language).filter(Language.language_code == language_code).first()
-    )
-    if not language:
-        raise HTTPException(404, "Language not found")
+    language_id = get_language_id(db, language_code)
 
     localization = (
         db.query(IntentLocalization)
         .filter(
             IntentLocalization.intent_id == intent.id,
-            IntentLocalization.language_id == language.id,
+            IntentLocalization.language_id == language_id,
         )
         .first()
     )
@@ -1,5 +1,7 @@
 from sqlalchemy.orm import Session
 from app.models.language import Language
+from app.db.reads import fetch_rows, select_for
+from app.schemas.language import LanguageResponse
 
 
 def create_language(db: Session, language_code: str, language_name: str):
@@ -16,4 +18,6 @@ def create_language(db: Session, language_code: str, language_name: str):
 
 def list_languages(db: Session):
     """List all languages."""
-    return db.query(Language).order_by(Language.language_code).all()
+    return fetch_rows(
+        db, select_for(LanguageResponse, Language).order_by(Language.language_code)
+    )
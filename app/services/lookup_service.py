@@ -1,13 +1,26 @@
+from typing import Optional
+
 from sqlalchemy.orm import Session, joinedload
 from fastapi import HTTPException
 
-from app.models import Language, Entity, VersionLanguage
+from app.models import Entity
 from app.models.lookup import Lookup, LookupExample
-from app.services.common import get_version_by_status, get_draft_version
+from app.services.common import (
+    get_draft_version,
+    get_language_id,
+    get_version_by_status,
+    require_version_language,
+    touch_version,
+)
+from app.services.example_upsert import sync_examples
+from app.core.pagination import PageParams, paginate
+from app.db.reads import fetch_rows, select_for
+from app.schemas.lookup import LookupResponse
 
 
 def create_lookup(db: Session, project_code: str, lookup_name: str, entity_key: str):
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     entity = (
         db.query(Entity)
@@ -50,26 +63,21 @@ def create_lookup(db: Session, project_code: str, lookup_name: str, entity_key:
     return lookup
 
 
-def list_lookups(db: Session, project_code: str, status: str):
+def list_lookups(
+    db: Session,
+    project_code: str,
+    status: str,
+    page: Optional[PageParams] = None,
+):
     """List all lookups for a version."""
     version = get_version_by_status(db, project_code, status)
 
-    lookups = (
-        db.query(Lookup)
-        .options(joinedload(Lookup.entity))
-        .filter(Lookup.version_id == version.id)
-        .order_by(Lookup.lookup_name)
-        .all()
+    query = (
+        select_for(LookupResponse, Lookup, entity_key=Entity.entity_key)
+        .join(Entity, Entity.id == Lookup.entity_id)
+        .where(Lookup.version_id == version.id)
     )
-
-    return [
-        {
-            "id": l.id,
-            "lookup_name": l.lookup_name,
-            "entity_key": l.entity.entity_key,
-        }
-        for l in lookups
-    ]
+    return fetch_rows(db, paginate(query, Lookup.lookup_name, page))
 
 
 def get_lookup(db: Session, project_code: str, status: str, lookup_name: str):
@@ -98,6 +106,7 @@ def get_lookup(db: Session, project_code: str, status: str, lookup_name: str):
 def delete_lookup(db: Session, project_code: str, lookup_name: str):
     """Delete a lookup from the draft version."""
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     lookup = (
         db.query(Lookup)
@@ -138,37 +147,18 @@ def upsert_lookup_examples(
     if not lookup:
         raise HTTPException(404, "Lookup not found")
 
-    language = (
-        db.query(Language).filter(Language.language_code == language_code).first()
-    )
-    if not language:
-        raise HTTPException(404, "Language not found")
+    language_id = get_language_id(db, language_code)
 
-    enabled = (
-        db.query(VersionLanguage)
-        .filter(
-            VersionLanguage.version_id == version.id,
-            VersionLanguage.language_id == language.id,
-        )
-        .first()
-    )
-    if not enabled:
-        raise HTTPException(400, "Language not enabled in draft version")
-
-    db.query(LookupExample).filter(
-        LookupExample.lookup_id == lookup.id,
-        LookupExample.language_id == language.id,
-    ).delete()
+    require_version_language(db, version.id, language_id)
 
-    for ex in examples:
-        if ex.strip():
-            db.add(
-                LookupExample(
-                    lookup_id=lookup.id,
-                    language_id=language.id,
-                    example=ex.strip(),
-                )
-            )
+    counts = sync_examples(
+        db,
+        LookupExample,
+        {"lookup_id": lookup.id, "language_id": language_id},
+        examples,
+    )
+    if counts["added"] or counts["removed"]:
+        touch_version(db, version.id)
 
     db.commit()
 
@@ -176,6 +166,7 @@ def upsert_lookup_examples(
         "lookup_name": lookup_name,
         "language_code": language_code,
         "example_count": len(examples),
+        **counts,
     }
 
 
@@ -199,17 +190,13 @@ def get_lookup_examples(
     if not lookup:
         raise HTTPException(404, "Lookup not found")
 
-    language = (
-        db.query(Language).filter(Language.language_code == language_code).first()
-    )
-    if not language:
-        raise HTTPException(404, "Language not found")
+    language_id = get_language_id(db, language_code)
 
     examples = (
         db.query(LookupExample)
         .filter(
             LookupExample.lookup_id == lookup.id,
-            LookupExample.language_id == language.id,
+            LookupExample.language_id == language_id,
         )
         .all()
     )
@@ -228,6 +215,7 @@ def delete_lookup_examples(
     language_code: str,
 ):
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     lookup = (
         db.query(Lookup)
@@ -240,15 +228,11 @@ def delete_lookup_examples(
     if not lookup:
         raise HTTPException(404, "Lookup not found")
 
-    language = (
-        db.query(Language).filter(Language.language_code == language_code).first()
-    )
-    if not language:
-        raise HTTPException(404, "Language not found")
+    language_id = get_language_id(db, language_code)
 
     db.query(LookupExample).filter(
         LookupExample.lookup_id == lookup.id,
-        LookupExample.language_id == language.id,
+        LookupExample.language_id == language_id,
     ).delete()
 
     db.commit()
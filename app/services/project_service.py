@@ -2,6 +2,9 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
 from app.models import Project, Version
+from app.db.reads import fetch_rows, select_for
+from app.schemas.project import ProjectResponse
+from app.utils.resolver_cache import resolver_cache
 
 
 def create_project(db: Session, project_code: str, project_name: str):
@@ -32,10 +35,13 @@ def create_project(db: Session, project_code: str, project_name: str):
     db.add_all([draft_version, production_version])
     db.commit()
     db.refresh(project)
+    resolver_cache.invalidate_project(project_code)
 
     return project
 
 
 def list_projects(db: Session):
     """List all projects."""
-    return db.query(Project).order_by(Project.created_at.desc()).all()
+    return fetch_rows(
+        db, select_for(ProjectResponse, Project).order_by(Project.created_at.desc())
+    )
@@ -1,939 +1,812 @@
+from typing import Iterable, Optional
+
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-import uuid
-from app.models import (
-    VersionLanguage,
-    SessionConfig,
-    Entity,
-    EntityRole,
-    EntityGroup,
-    Intent,
-    IntentLocalization,
-    IntentExample,
-    Slot,
-    SlotMapping,
-    Form,
-    FormRequiredSlot,
-    FormSlotMapping,
-    Action,
-    Response,
-    ResponseVariant,
-    ResponseCondition,
-    ResponseComponent,
-    Story,
-    StoryStep,
-    StorySlotEvent,
-    Rule,
-    RuleStep,
-    RuleSlotEvent,
-    RuleCondition,
-    Regex,
-    RegexExample,
-    Lookup,
-    LookupExample,
-    Synonym,
-    SynonymExample,
-    StoryStepEntity,
-    RuleStepEntity,
-)
-
-
-def delete_version_data(db: Session, version_id: str):
 
+from app.db.engine import SessionLocal
+from app.models import Version
+
+
+class PromotionProgress:
+    """
+    Receives progress of a promotion or rollback. The default implementation
+    ignores everything; promotion jobs record it on the job row.
+    """
+
+    def phase(self, name: str):
+        pass
+
+    def copied(self, table: str, rows: int):
+        pass
+
+
+# Tables owned directly by a version. Everything below them is removed by
+# ON DELETE CASCADE foreign keys.
+VERSION_TABLES = [
+    "stories",
+    "rules",
+    "forms",
+    "slots",
+    "responses",
+    "actions",
+    "lookups",
+    "regexes",
+    "synonyms",
+    "intents",
+    "entities",
+    "version_languages",
+    "session_configs",
+]
+
+# Large leaf tables removed batch by batch by purge_version_chunked, so no
+# single statement holds row locks on the whole version.
+PURGE_BATCHES = [
+    (
+        "intent_examples",
+        """
+        SELECT ie.id
+        FROM intent_examples ie
+        JOIN intent_localizations il ON il.id = ie.intent_localization_id
+        JOIN intents i ON i.id = il.intent_id
+        WHERE i.version_id = :vid
+    """,
+    ),
+    (
+        "story_step_entities",
+        """
+        SELECT se.id
+        FROM story_step_entities se
+        JOIN story_steps ss ON ss.id = se.story_step_id
+        JOIN stories s ON s.id = ss.story_id
+        WHERE s.version_id = :vid
+    """,
+    ),
+    (
+        "story_slot_events",
+        """
+        SELECT sse.id
+        FROM story_slot_events sse
+        JOIN story_steps ss ON ss.id = sse.story_step_id
+        JOIN stories s ON s.id = ss.story_id
+        WHERE s.version_id = :vid
+    """,
+    ),
+    (
+        "story_steps",
+        """
+        SELECT ss.id
+        FROM story_steps ss
+        JOIN stories s ON s.id = ss.story_id
+        WHERE s.version_id = :vid
+    """,
+    ),
+    (
+        "rule_step_entities",
+        """
+        SELECT rse.id
+        FROM rule_step_entities rse
+        JOIN rule_steps rs ON rs.id = rse.rule_step_id
+        JOIN rules r ON r.id = rs.rule_id
+        WHERE r.version_id = :vid
+    """,
+    ),
+    (
+        "rule_slot_events",
+        """
+        SELECT rse.id
+        FROM rule_slot_events rse
+        JOIN rule_steps rs ON rs.id = rse.rule_step_id
+        JOIN rules r ON r.id = rs.rule_id
+        WHERE r.version_id = :vid
+    """,
+    ),
+    (
+        "rule_steps",
+        """
+        SELECT rs.id
+        FROM rule_steps rs
+        JOIN rules r ON r.id = rs.rule_id
+        WHERE r.version_id = :vid
+    """,
+    ),
+    (
+        "lookup_examples",
+        """
+        SELECT le.id
+        FROM lookup_examples le
+        JOIN lookups l ON l.id = le.lookup_id
+        WHERE l.version_id = :vid
+    """,
+    ),
+    (
+        "regex_examples",
+        """
+        SELECT re.id
+        FROM regex_examples re
+        JOIN regexes r ON r.id = re.regex_id
+        WHERE r.version_id = :vid
+    """,
+    ),
+    (
+        "synonym_examples",
+        """
+        SELECT se.id
+        FROM synonym_examples se
+        JOIN synonyms s ON s.id = se.synonym_id
+        WHERE s.version_id = :vid
+    """,
+    ),
+]
+
+PURGE_BATCH_SIZE = 5000
+PURGING_STATUS = "purging"
+
+
+def delete_version_data(
+    db: Session, version_id: str, tables: Iterable[str] = VERSION_TABLES
+):
+    """Delete all data of a version (or of some `tables`) but keep the version row."""
+
+    # Cross references inside a version (story_steps.intent_id, ...) are
+    # deferrable, so the per-table deletes below may run in any order.
+    db.execute(text("SET CONSTRAINTS ALL DEFERRED"))
+
+    for table in tables:
+        db.execute(
+            text(f"DELETE FROM {table} WHERE version_id = :vid"),
+            {"vid": version_id},
+        )
+
+    db.execute(text("SET CONSTRAINTS ALL IMMEDIATE"))
+
+
+def clone_version_data(
+    db: Session,
+    source_id: str,
+    target_id: str,
+    progress: Optional["PromotionProgress"] = None,
+):
+    """
+    Copy every row owned by the source version into the target version.
+
+    Each table is copied with a single INSERT ... SELECT, so the number of
+    statements depends on the number of tables rather than the number of rows.
+    New primary keys are allocated up front in a temporary id map, which the
+    copies join against to rewrite entity, intent, slot, form, action,
+    response and or_group references. The row count of every copy is
+    reported to ``progress`` when given.
+    """
+    params = {"src": source_id, "dst": target_id}
+
+    # Pending ORM state (e.g. a freshly added target Version) must be visible
+    db.flush()
 
     # ================================================================
-    # PHASE 1: Delete rule step children first
+    # PHASE 0: Allocate new ids for every referenced row
     # ================================================================
     db.execute(
         text(
             """
-        DELETE FROM rule_step_entities
-        WHERE rule_step_id IN (
-            SELECT rs.id
-            FROM rule_steps rs
-            JOIN rules r ON r.id = rs.rule_id
-            WHERE r.version_id = :vid
-        )
+        CREATE TEMP TABLE IF NOT EXISTS clone_id_map (
+            kind VARCHAR NOT NULL,
+            old_id VARCHAR NOT NULL,
+            new_id VARCHAR NOT NULL,
+            PRIMARY KEY (kind, old_id)
+        ) ON COMMIT DROP
+    """
+        )
+    )
+
+    db.execute(text("DELETE FROM clone_id_map"))
+
+    db.execute(
+        text(
+            """
+        INSERT INTO clone_id_map (kind, old_id, new_id)
+        SELECT 'entity', id, gen_random_uuid()::text
+        FROM entities WHERE version_id = :src
+        UNION ALL
+        SELECT 'intent', id, gen_random_uuid()::text
+        FROM intents WHERE version_id = :src
+        UNION ALL
+        SELECT 'intent_localization', il.id, gen_random_uuid()::text
+        FROM intent_localizations il
+        JOIN intents i ON i.id = il.intent_id
+        WHERE i.version_id = :src
+        UNION ALL
+        SELECT 'slot', id, gen_random_uuid()::text
+        FROM slots WHERE version_id = :src
+        UNION ALL
+        SELECT 'form', id, gen_random_uuid()::text
+        FROM forms WHERE version_id = :src
+        UNION ALL
+        SELECT 'form_required_slot', frs.id, gen_random_uuid()::text
+        FROM form_required_slots frs
+        JOIN forms f ON f.id = frs.form_id
+        WHERE f.version_id = :src
+        UNION ALL
+        SELECT 'action', id, gen_random_uuid()::text
+        FROM actions WHERE version_id = :src
+        UNION ALL
+        SELECT 'response', id, gen_random_uuid()::text
+        FROM responses WHERE version_id = :src
+        UNION ALL
+        SELECT 'response_variant', rv.id, gen_random_uuid()::text
+        FROM response_variants rv
+        JOIN responses r ON r.id = rv.response_id
+        WHERE r.version_id = :src
+        UNION ALL
+        SELECT 'story', id, gen_random_uuid()::text
+        FROM stories WHERE version_id = :src
+        UNION ALL
+        SELECT 'story_step', ss.id, gen_random_uuid()::text
+        FROM story_steps ss
+        JOIN stories s ON s.id = ss.story_id
+        WHERE s.version_id = :src
+        UNION ALL
+        SELECT 'or_group', g.or_group_id, gen_random_uuid()::text
+        FROM (
+            SELECT DISTINCT ss.or_group_id
+            FROM story_steps ss
+            JOIN stories s ON s.id = ss.story_id
+            WHERE s.version_id = :src AND ss.or_group_id IS NOT NULL
+        ) g
+        UNION ALL
+        SELECT 'rule', id, gen_random_uuid()::text
+        FROM rules WHERE version_id = :src
+        UNION ALL
+        SELECT 'rule_step', rs.id, gen_random_uuid()::text
+        FROM rule_steps rs
+        JOIN rules r ON r.id = rs.rule_id
+        WHERE r.version_id = :src
+        UNION ALL
+        SELECT 'regex', id, gen_random_uuid()::text
+        FROM regexes WHERE version_id = :src
+        UNION ALL
+        SELECT 'lookup', id, gen_random_uuid()::text
+        FROM lookups WHERE version_id = :src
+        UNION ALL
+        SELECT 'synonym', id, gen_random_uuid()::text
+        FROM synonyms WHERE version_id = :src
+    """
+        ),
+        params,
+    )
+
+    # Temp tables are never auto-analyzed; give the planner real row counts
+    db.execute(text("ANALYZE clone_id_map"))
+
+    def copy(statement: str):
+        rows = db.execute(text(statement), params).rowcount
+        if progress is not None:
+            progress.copied(statement.split()[2], rows)
+
+    # ================================================================
+    # PHASE 1: Version config
+    # ================================================================
+    copy(
+        """
+        INSERT INTO version_languages (id, version_id, language_id, is_default)
+        SELECT gen_random_uuid()::text, :dst, language_id, is_default
+        FROM version_languages
+        WHERE version_id = :src
     """
-        ),
-        {"vid": version_id},
     )
 
-    db.execute(
-        text(
-            """
-        DELETE FROM rule_slot_events
-        WHERE rule_step_id IN (
-            SELECT rs.id
-            FROM rule_steps rs
-            JOIN rules r ON r.id = rs.rule_id
-            WHERE r.version_id = :vid
+    copy(
+        """
+        INSERT INTO session_configs (
+            id, version_id, session_expiration_time, carry_over_slots_to_new_session
         )
+        SELECT
+            gen_random_uuid()::text, :dst,
+            session_expiration_time, carry_over_slots_to_new_session
+        FROM session_configs
+        WHERE version_id = :src
     """
-        ),
-        {"vid": version_id},
     )
 
     # ================================================================
-    # PHASE 2: Delete story step children
+    # PHASE 2: Entities and their children
     # ================================================================
-    db.execute(
-        text(
-            """
-        DELETE FROM story_step_entities
-        WHERE story_step_id IN (
-            SELECT ss.id
-            FROM story_steps ss
-            JOIN stories s ON s.id = ss.story_id
-            WHERE s.version_id = :vid
+    copy(
+        """
+        INSERT INTO entities (
+            id, version_id, entity_key, entity_type,
+            use_regex, use_lookup, influence_conversation
         )
+        SELECT
+            m.new_id, :dst, e.entity_key, e.entity_type,
+            e.use_regex, e.use_lookup, e.influence_conversation
+        FROM entities e
+        JOIN clone_id_map m ON m.kind = 'entity' AND m.old_id = e.id
+        WHERE e.version_id = :src
     """
-        ),
-        {"vid": version_id},
     )
 
-    db.execute(
-        text(
-            """
-        DELETE FROM story_slot_events
-        WHERE story_step_id IN (
-            SELECT ss.id
-            FROM story_steps ss
-            JOIN stories s ON s.id = ss.story_id
-            WHERE s.version_id = :vid
-        )
+    copy(
+        """
+        INSERT INTO entity_roles (id, entity_id, role)
+        SELECT gen_random_uuid()::text, m.new_id, er.role
+        FROM entity_roles er
+        JOIN clone_id_map m ON m.kind = 'entity' AND m.old_id = er.entity_id
+    """
+    )
+
+    copy(
+        """
+        INSERT INTO entity_groups (id, entity_id, group_name)
+        SELECT gen_random_uuid()::text, m.new_id, eg.group_name
+        FROM entity_groups eg
+        JOIN clone_id_map m ON m.kind = 'entity' AND m.old_id = eg.entity_id
     """
-        ),
-        {"vid": version_id},
     )
 
     # ================================================================
-    # PHASE 3: Delete steps (these have FK to responses/actions/forms/intents)
-    # MUST be deleted BEFORE responses, actions, forms, intents
+    # PHASE 3: Intents, localizations and examples
     # ================================================================
-    db.execute(
-        text(
-            """
-        DELETE FROM rule_steps
-        WHERE rule_id IN (
-            SELECT id FROM rules WHERE version_id = :vid
-        )
+    copy(
+        """
+        INSERT INTO intents (id, version_id, intent_name)
+        SELECT m.new_id, :dst, i.intent_name
+        FROM intents i
+        JOIN clone_id_map m ON m.kind = 'intent' AND m.old_id = i.id
+        WHERE i.version_id = :src
     """
-        ),
-        {"vid": version_id},
     )
 
-    db.execute(
-        text(
-            """
-        DELETE FROM story_steps
-        WHERE story_id IN (
-            SELECT id FROM stories WHERE version_id = :vid
-        )
+    copy(
+        """
+        INSERT INTO intent_localizations (id, intent_id, language_id)
+        SELECT lm.new_id, im.new_id, il.language_id
+        FROM intent_localizations il
+        JOIN clone_id_map lm
+            ON lm.kind = 'intent_localization' AND lm.old_id = il.id
+        JOIN clone_id_map im ON im.kind = 'intent' AND im.old_id = il.intent_id
+    """
+    )
+
+    copy(
+        """
+        INSERT INTO intent_examples (id, intent_localization_id, example)
+        SELECT gen_random_uuid()::text, m.new_id, ie.example
+        FROM intent_examples ie
+        JOIN clone_id_map m
+            ON m.kind = 'intent_localization' AND m.old_id = ie.intent_localization_id
     """
-        ),
-        {"vid": version_id},
     )
 
     # ================================================================
-    # PHASE 4: Delete rule conditions and parent tables (rules, stories)
+    # PHASE 4: Slots and mappings
     # ================================================================
-    db.execute(
-        text(
-            """
-        DELETE FROM rule_conditions
-        WHERE rule_id IN (
-            SELECT id FROM rules WHERE version_id = :vid
+    copy(
+        """
+        INSERT INTO slots (
+            id, version_id, name, slot_type, influence_conversation,
+            initial_value, "values", min_value, max_value
         )
+        SELECT
+            m.new_id, :dst, s.name, s.slot_type, s.influence_conversation,
+            s.initial_value, s."values", s.min_value, s.max_value
+        FROM slots s
+        JOIN clone_id_map m ON m.kind = 'slot' AND m.old_id = s.id
+        WHERE s.version_id = :src
     """
-        ),
-        {"vid": version_id},
     )
 
-    db.execute(
-        text(
-            """
-        DELETE FROM rules WHERE version_id = :vid
+    copy(
+        """
+        INSERT INTO slot_mappings (
+            id, slot_id, mapping_type, entity_id, role, "group",
+            intent, not_intent, value, conditions, active_loop, priority
+        )
+        SELECT
+            gen_random_uuid()::text, sm_slot.new_id, sm.mapping_type, em.new_id,
+            sm.role, sm."group", sm.intent, sm.not_intent, sm.value,
+            sm.conditions, sm.active_loop, sm.priority
+        FROM slot_mappings sm
+        JOIN clone_id_map sm_slot
+            ON sm_slot.kind = 'slot' AND sm_slot.old_id = sm.slot_id
+        LEFT JOIN clone_id_map em ON em.kind = 'entity' AND em.old_id = sm.entity_id
     """
-        ),
-        {"vid": version_id},
     )
 
-    db.execute(
-        text(
-            """
-        DELETE FROM stories WHERE version_id = :vid
+    # ================================================================
+    # PHASE 5: Forms and their children
+    # ================================================================
+    copy(
+        """
+        INSERT INTO forms (id, version_id, name, ignored_intents)
+        SELECT m.new_id, :dst, f.name, f.ignored_intents
+        FROM forms f
+        JOIN clone_id_map m ON m.kind = 'form' AND m.old_id = f.id
+        WHERE f.version_id = :src
     """
-        ),
-        {"vid": version_id},
     )
 
-    # ================================================================
-    # PHASE 5: Delete forms and their children
-    # ================================================================
-    db.execute(
-        text(
-            """
-        DELETE FROM form_slot_mappings
-        WHERE form_required_slot_id IN (
-            SELECT frs.id
-            FROM form_required_slots frs
-            JOIN forms f ON f.id = frs.form_id
-            WHERE f.version_id = :vid
-        )
+    copy(
+        """
+        INSERT INTO form_required_slots (id, form_id, slot_id, "order", required)
+        SELECT frs_m.new_id, fm.new_id, sm.new_id, frs."order", frs.required
+        FROM form_required_slots frs
+        JOIN clone_id_map frs_m
+            ON frs_m.kind = 'form_required_slot' AND frs_m.old_id = frs.id
+        JOIN clone_id_map fm ON fm.kind = 'form' AND fm.old_id = frs.form_id
+        LEFT JOIN clone_id_map sm ON sm.kind = 'slot' AND sm.old_id = frs.slot_id
     """
-        ),
-        {"vid": version_id},
     )
 
-    db.execute(
-        text(
-            """
-        DELETE FROM form_required_slots
-        WHERE form_id IN (
-            SELECT id FROM forms WHERE version_id = :vid
+    copy(
+        """
+        INSERT INTO form_slot_mappings (
+            id, form_required_slot_id, mapping_type, entity_id,
+            intent, not_intent, value
         )
+        SELECT
+            gen_random_uuid()::text, frs_m.new_id, fsm.mapping_type, em.new_id,
+            fsm.intent, fsm.not_intent, fsm.value
+        FROM form_slot_mappings fsm
+        JOIN clone_id_map frs_m
+            ON frs_m.kind = 'form_required_slot'
+            AND frs_m.old_id = fsm.form_required_slot_id
+        LEFT JOIN clone_id_map em ON em.kind = 'entity' AND em.old_id = fsm.entity_id
     """
-        ),
-        {"vid": version_id},
     )
 
-    db.execute(
-        text(
-            """
-        DELETE FROM forms WHERE version_id = :vid
+    # ================================================================
+    # PHASE 6: Actions
+    # ================================================================
+    copy(
+        """
+        INSERT INTO actions (id, version_id, name, description)
+        SELECT m.new_id, :dst, a.name, a.description
+        FROM actions a
+        JOIN clone_id_map m ON m.kind = 'action' AND m.old_id = a.id
+        WHERE a.version_id = :src
     """
-        ),
-        {"vid": version_id},
     )
 
     # ================================================================
-    # PHASE 6: Delete responses and their children
-    # NOW SAFE - rule_steps and story_steps already deleted
+    # PHASE 7: Responses and their children
     # ================================================================
-    db.execute(
-        text(
-            """
-        DELETE FROM response_components
-        WHERE response_variant_id IN (
-            SELECT rv.id
-            FROM response_variants rv
-            JOIN responses r ON r.id = rv.response_id
-            WHERE r.version_id = :vid
-        )
+    copy(
+        """
+        INSERT INTO responses (id, version_id, name)
+        SELECT m.new_id, :dst, r.name
+        FROM responses r
+        JOIN clone_id_map m ON m.kind = 'response' AND m.old_id = r.id
+        WHERE r.version_id = :src
     """
-        ),
-        {"vid": version_id},
     )
 
-    db.execute(
-        text(
-            """
-        DELETE FROM response_conditions
-        WHERE response_variant_id IN (
-            SELECT rv.id
-            FROM response_variants rv
-            JOIN responses r ON r.id = rv.response_id
-            WHERE r.version_id = :vid
-        )
+    copy(
+        """
+        INSERT INTO response_variants (id, response_id, language_id, priority)
+        SELECT vm.new_id, rm.new_id, rv.language_id, rv.priority
+        FROM response_variants rv
+        JOIN clone_id_map vm ON vm.kind = 'response_variant' AND vm.old_id = rv.id
+        JOIN clone_id_map rm ON rm.kind = 'response' AND rm.old_id = rv.response_id
     """
-        ),
-        {"vid": version_id},
     )
 
-    db.execute(
-        text(
-            """
-        DELETE FROM response_variants
-        WHERE response_id IN (
-            SELECT id FROM responses WHERE version_id = :vid
+    copy(
+        """
+        INSERT INTO response_conditions (
+            id, response_variant_id, condition_type, slot_name, slot_value, order_index
         )
+        SELECT
+            gen_random_uuid()::text, vm.new_id, rc.condition_type,
+            rc.slot_name, rc.slot_value, rc.order_index
+        FROM response_conditions rc
+        JOIN clone_id_map vm
+            ON vm.kind = 'response_variant' AND vm.old_id = rc.response_variant_id
     """
-        ),
-        {"vid": version_id},
     )
 
-    db.execute(
-        text(
-            """
-        DELETE FROM responses WHERE version_id = :vid
+    copy(
+        """
+        INSERT INTO response_components (
+            id, response_variant_id, component_type, payload, order_index
+        )
+        SELECT
+            gen_random_uuid()::text, vm.new_id, rc.component_type,
+            rc.payload, rc.order_index
+        FROM response_components rc
+        JOIN clone_id_map vm
+            ON vm.kind = 'response_variant' AND vm.old_id = rc.response_variant_id
     """
-        ),
-        {"vid": version_id},
     )
 
     # ================================================================
-    # PHASE 7: Delete actions
+    # PHASE 8: Stories, steps and step children
     # ================================================================
-    db.execute(
-        text(
-            """
-        DELETE FROM actions WHERE version_id = :vid
+    copy(
+        """
+        INSERT INTO stories (id, version_id, name)
+        SELECT m.new_id, :dst, s.name
+        FROM stories s
+        JOIN clone_id_map m ON m.kind = 'story' AND m.old_id = s.id
+        WHERE s.version_id = :src
     """
-        ),
-        {"vid": version_id},
     )
 
-    # ================================================================
-    # PHASE 8: Delete slots and mappings
-    # ================================================================
-    db.execute(
-        text(
-            """
-        DELETE FROM slot_mappings
-        WHERE slot_id IN (
-            SELECT id FROM slots WHERE version_id = :vid
+    copy(
+        """
+        INSERT INTO story_steps (
+            id, story_id, timeline_index, step_order, step_type,
+            intent_id, action_id, response_id, form_id,
+            active_loop_value, checkpoint_name, or_group_id
         )
+        SELECT
+            stm.new_id, sm.new_id, ss.timeline_index, ss.step_order, ss.step_type,
+            im.new_id, am.new_id, rm.new_id, fm.new_id,
+            ss.active_loop_value, ss.checkpoint_name, gm.new_id
+        FROM story_steps ss
+        JOIN clone_id_map stm ON stm.kind = 'story_step' AND stm.old_id = ss.id
+        JOIN clone_id_map sm ON sm.kind = 'story' AND sm.old_id = ss.story_id
+        LEFT JOIN clone_id_map im ON im.kind = 'intent' AND im.old_id = ss.intent_id
+        LEFT JOIN clone_id_map am ON am.kind = 'action' AND am.old_id = ss.action_id
+        LEFT JOIN clone_id_map rm ON rm.kind = 'response' AND rm.old_id = ss.response_id
+        LEFT JOIN clone_id_map fm ON fm.kind = 'form' AND fm.old_id = ss.form_id
+        LEFT JOIN clone_id_map gm ON gm.kind = 'or_group' AND gm.old_id = ss.or_group_id
     """
-        ),
-        {"vid": version_id},
     )
 
-    db.execute(
-        text(
-            """
-        DELETE FROM slots WHERE version_id = :vid
+    copy(
+        """
+        INSERT INTO story_slot_events (id, story_step_id, slot_id, value)
+        SELECT gen_random_uuid()::text, stm.new_id, sm.new_id, e.value
+        FROM story_slot_events e
+        JOIN clone_id_map stm ON stm.kind = 'story_step' AND stm.old_id = e.story_step_id
+        LEFT JOIN clone_id_map sm ON sm.kind = 'slot' AND sm.old_id = e.slot_id
     """
-        ),
-        {"vid": version_id},
     )
 
-    # ================================================================
-    # PHASE 9: Delete regex/lookup/synonym (these reference entities!)
-    # MUST be deleted BEFORE entities
-    # ================================================================
-    db.execute(
-        text(
-            """
-        DELETE FROM regex_examples
-        WHERE regex_id IN (
-            SELECT id FROM regexes WHERE version_id = :vid
+    copy(
+        """
+        INSERT INTO story_step_entities (
+            id, story_step_id, entity_id, value, role, "group"
         )
+        SELECT
+            gen_random_uuid()::text, stm.new_id, em.new_id,
+            sse.value, sse.role, sse."group"
+        FROM story_step_entities sse
+        JOIN clone_id_map stm
+            ON stm.kind = 'story_step' AND stm.old_id = sse.story_step_id
+        LEFT JOIN clone_id_map em ON em.kind = 'entity' AND em.old_id = sse.entity_id
     """
-        ),
-        {"vid": version_id},
     )
 
-    db.execute(
-        text(
-            """
-        DELETE FROM regexes WHERE version_id = :vid
+    # ================================================================
+    # PHASE 9: Rules, conditions, steps and step children
+    # ================================================================
+    copy(
+        """
+        INSERT INTO rules (id, version_id, name)
+        SELECT m.new_id, :dst, r.name
+        FROM rules r
+        JOIN clone_id_map m ON m.kind = 'rule' AND m.old_id = r.id
+        WHERE r.version_id = :src
     """
-        ),
-        {"vid": version_id},
     )
 
-    db.execute(
-        text(
-            """
-        DELETE FROM lookup_examples
-        WHERE lookup_id IN (
-            SELECT id FROM lookups WHERE version_id = :vid
+    copy(
+        """
+        INSERT INTO rule_conditions (
+            id, rule_id, condition_type, slot_name, slot_value, active_loop, order_index
         )
+        SELECT
+            gen_random_uuid()::text, m.new_id, rc.condition_type,
+            rc.slot_name, rc.slot_value, rc.active_loop, rc.order_index
+        FROM rule_conditions rc
+        JOIN clone_id_map m ON m.kind = 'rule' AND m.old_id = rc.rule_id
     """
-        ),
-        {"vid": version_id},
     )
 
-    db.execute(
-        text(
-            """
-        DELETE FROM lookups WHERE version_id = :vid
+    copy(
+        """
+        INSERT INTO rule_steps (
+            id, rule_id, step_order, step_type,
+            intent_id, action_id, response_id, form_id, active_loop_value
+        )
+        SELECT
+            rsm.new_id, rm_rule.new_id, rs.step_order, rs.step_type,
+            im.new_id, am.new_id, rm.new_id, fm.new_id, rs.active_loop_value
+        FROM rule_steps rs
+        JOIN clone_id_map rsm ON rsm.kind = 'rule_step' AND rsm.old_id = rs.id
+        JOIN clone_id_map rm_rule ON rm_rule.kind = 'rule' AND rm_rule.old_id = rs.rule_id
+        LEFT JOIN clone_id_map im ON im.kind = 'intent' AND im.old_id = rs.intent_id
+        LEFT JOIN clone_id_map am ON am.kind = 'action' AND am.old_id = rs.action_id
+        LEFT JOIN clone_id_map rm ON rm.kind = 'response' AND rm.old_id = rs.response_id
+        LEFT JOIN clone_id_map fm ON fm.kind = 'form' AND fm.old_id = rs.form_id
     """
-        ),
-        {"vid": version_id},
     )
 
-    db.execute(
-        text(
-            """
-        DELETE FROM synonym_examples
-        WHERE synonym_id IN (
-            SELECT id FROM synonyms WHERE version_id = :vid
-        )
+    copy(
+        """
+        INSERT INTO rule_slot_events (id, rule_step_id, slot_id, value)
+        SELECT gen_random_uuid()::text, rsm.new_id, sm.new_id, e.value
+        FROM rule_slot_events e
+        JOIN clone_id_map rsm ON rsm.kind = 'rule_step' AND rsm.old_id = e.rule_step_id
+        LEFT JOIN clone_id_map sm ON sm.kind = 'slot' AND sm.old_id = e.slot_id
     """
-        ),
-        {"vid": version_id},
     )
 
-    db.execute(
-        text(
-            """
-        DELETE FROM synonyms WHERE version_id = :vid
+    copy(
+        """
+        INSERT INTO rule_step_entities (
+            id, rule_step_id, entity_id, value, role, "group"
+        )
+        SELECT
+            gen_random_uuid()::text, rsm.new_id, em.new_id,
+            rse.value, rse.role, rse."group"
+        FROM rule_step_entities rse
+        JOIN clone_id_map rsm
+            ON rsm.kind = 'rule_step' AND rsm.old_id = rse.rule_step_id
+        LEFT JOIN clone_id_map em ON em.kind = 'entity' AND em.old_id = rse.entity_id
     """
-        ),
-        {"vid": version_id},
     )
 
     # ================================================================
-    # PHASE 10: Delete entities and their children
-    # NOW SAFE - regexes, lookups, synonyms already deleted
+    # PHASE 10: Regexes, lookups and synonyms with their examples
     # ================================================================
-    db.execute(
-        text(
-            """
-        DELETE FROM entity_roles
-        WHERE entity_id IN (
-            SELECT id FROM entities WHERE version_id = :vid
-        )
+    copy(
+        """
+        INSERT INTO regexes (id, version_id, regex_name, entity_id)
+        SELECT m.new_id, :dst, r.regex_name, em.new_id
+        FROM regexes r
+        JOIN clone_id_map m ON m.kind = 'regex' AND m.old_id = r.id
+        LEFT JOIN clone_id_map em ON em.kind = 'entity' AND em.old_id = r.entity_id
+        WHERE r.version_id = :src
     """
-        ),
-        {"vid": version_id},
     )
 
-    db.execute(
-        text(
-            """
-        DELETE FROM entity_groups
-        WHERE entity_id IN (
-            SELECT id FROM entities WHERE version_id = :vid
-        )
+    copy(
+        """
+        INSERT INTO regex_examples (id, regex_id, language_id, example)
+        SELECT gen_random_uuid()::text, m.new_id, ex.language_id, ex.example
+        FROM regex_examples ex
+        JOIN clone_id_map m ON m.kind = 'regex' AND m.old_id = ex.regex_id
     """
-        ),
-        {"vid": version_id},
     )
 
-    db.execute(
-        text(
-            """
-        DELETE FROM entities WHERE version_id = :vid
+    copy(
+        """
+        INSERT INTO lookups (id, version_id, lookup_name, entity_id)
+        SELECT m.new_id, :dst, l.lookup_name, em.new_id
+        FROM lookups l
+        JOIN clone_id_map m ON m.kind = 'lookup' AND m.old_id = l.id
+        LEFT JOIN clone_id_map em ON em.kind = 'entity' AND em.old_id = l.entity_id
+        WHERE l.version_id = :src
     """
-        ),
-        {"vid": version_id},
     )
 
-    # ================================================================
-    # PHASE 11: Delete intents and their children
-    # ================================================================
-    db.execute(
-        text(
-            """
-        DELETE FROM intent_examples
-        WHERE intent_localization_id IN (
-            SELECT il.id
-            FROM intent_localizations il
-            JOIN intents i ON i.id = il.intent_id
-            WHERE i.version_id = :vid
-        )
+    copy(
+        """
+        INSERT INTO lookup_examples (id, lookup_id, language_id, example)
+        SELECT gen_random_uuid()::text, m.new_id, ex.language_id, ex.example
+        FROM lookup_examples ex
+        JOIN clone_id_map m ON m.kind = 'lookup' AND m.old_id = ex.lookup_id
     """
-        ),
-        {"vid": version_id},
     )
 
-    db.execute(
-        text(
-            """
-        DELETE FROM intent_localizations
-        WHERE intent_id IN (
-            SELECT id FROM intents WHERE version_id = :vid
-        )
+    copy(
+        """
+        INSERT INTO synonyms (id, version_id, canonical_value, entity_id)
+        SELECT m.new_id, :dst, s.canonical_value, em.new_id
+        FROM synonyms s
+        JOIN clone_id_map m ON m.kind = 'synonym' AND m.old_id = s.id
+        LEFT JOIN clone_id_map em ON em.kind = 'entity' AND em.old_id = s.entity_id
+        WHERE s.version_id = :src
     """
-        ),
-        {"vid": version_id},
     )
 
-    db.execute(
-        text(
-            """
-        DELETE FROM intents WHERE version_id = :vid
+    copy(
+        """
+        INSERT INTO synonym_examples (id, synonym_id, language_id, example)
+        SELECT gen_random_uuid()::text, m.new_id, ex.language_id, ex.example
+        FROM synonym_examples ex
+        JOIN clone_id_map m ON m.kind = 'synonym' AND m.old_id = ex.synonym_id
     """
-        ),
-        {"vid": version_id},
     )
 
-    # ================================================================
-    # PHASE 12: Delete version config
-    # ================================================================
-    db.execute(
+    id_maps = {
+        "entity": {},
+        "intent": {},
+        "slot": {},
+        "form": {},
+        "action": {},
+        "response": {},
+    }
+    for kind, old_id, new_id in db.execute(
         text(
             """
-        DELETE FROM version_languages WHERE version_id = :vid
+        SELECT kind, old_id, new_id FROM clone_id_map
+        WHERE kind IN ('entity', 'intent', 'slot', 'form', 'action', 'response')
     """
-        ),
-        {"vid": version_id},
-    )
+        )
+    ):
+        id_maps[kind][old_id] = new_id
+
+    return {
+        "entity_map": id_maps["entity"],
+        "intent_map": id_maps["intent"],
+        "slot_map": id_maps["slot"],
+        "form_map": id_maps["form"],
+        "action_map": id_maps["action"],
+        "response_map": id_maps["response"],
+    }
+
+
+def drop_version(db: Session, version):
+    """Delete a version row; its data goes with it through ON DELETE CASCADE."""
+
+    db.execute(text("SET CONSTRAINTS ALL DEFERRED"))
 
     db.execute(
         text(
             """
-        DELETE FROM session_configs WHERE version_id = :vid
+        DELETE FROM versions WHERE id = :vid
     """
         ),
-        {"vid": version_id},
+        {"vid": version.id},
     )
 
+    db.execute(text("SET CONSTRAINTS ALL IMMEDIATE"))
+    db.expire_all()
 
-def clone_version_data(db: Session, source_id: str, target_id: str):
-
-    entity_map = {}
-    intent_map = {}
-    slot_map = {}
-    form_map = {}
-    action_map = {}
-    response_map = {}
-
-    for vl in (
-        db.query(VersionLanguage).filter(VersionLanguage.version_id == source_id).all()
-    ):
-        db.add(
-            VersionLanguage(
-                version_id=target_id,
-                language_id=vl.language_id,
-                is_default=vl.is_default,
-            )
-        )
-
-    sc = db.query(SessionConfig).filter(SessionConfig.version_id == source_id).first()
-    if sc:
-        db.add(
-            SessionConfig(
-                version_id=target_id,
-                session_expiration_time=sc.session_expiration_time,
-                carry_over_slots_to_new_session=sc.carry_over_slots_to_new_session,
-            )
-        )
-
-    for entity in db.query(Entity).filter(Entity.version_id == source_id).all():
-        new_id = str(uuid.uuid4())
-        entity_map[entity.id] = new_id
-
-        db.add(
-            Entity(
-                id=new_id,
-                version_id=target_id,
-                entity_key=entity.entity_key,
-                entity_type=entity.entity_type,
-                use_regex=entity.use_regex,
-                use_lookup=entity.use_lookup,
-                influence_conversation=entity.influence_conversation,
-            )
-        )
-
-        for role in (
-            db.query(EntityRole).filter(EntityRole.entity_id == entity.id).all()
-        ):
-            db.add(EntityRole(entity_id=new_id, role=role.role))
-
-        for group in (
-            db.query(EntityGroup).filter(EntityGroup.entity_id == entity.id).all()
-        ):
-            db.add(EntityGroup(entity_id=new_id, group_name=group.group_name))
-
-    for intent in db.query(Intent).filter(Intent.version_id == source_id).all():
-        new_id = str(uuid.uuid4())
-        intent_map[intent.id] = new_id
-
-        db.add(
-            Intent(
-                id=new_id,
-                version_id=target_id,
-                intent_name=intent.intent_name,
-            )
-        )
-
-        for loc in (
-            db.query(IntentLocalization)
-            .filter(IntentLocalization.intent_id == intent.id)
-            .all()
-        ):
-            new_loc_id = str(uuid.uuid4())
-            db.add(
-                IntentLocalization(
-                    id=new_loc_id,
-                    intent_id=new_id,
-                    language_id=loc.language_id,
-                )
-            )
-
-            for ex in (
-                db.query(IntentExample)
-                .filter(IntentExample.intent_localization_id == loc.id)
-                .all()
-            ):
-                db.add(
-                    IntentExample(
-                        intent_localization_id=new_loc_id,
-                        example=ex.example,
-                    )
-                )
-
-    for slot in db.query(Slot).filter(Slot.version_id == source_id).all():
-        new_id = str(uuid.uuid4())
-        slot_map[slot.id] = new_id
-
-        db.add(
-            Slot(
-                id=new_id,
-                version_id=target_id,
-                name=slot.name,
-                slot_type=slot.slot_type,
-                influence_conversation=slot.influence_conversation,
-                initial_value=slot.initial_value,
-                values=slot.values,
-                min_value=slot.min_value,
-                max_value=slot.max_value,
-            )
-        )
 
-        for mapping in (
-            db.query(SlotMapping).filter(SlotMapping.slot_id == slot.id).all()
-        ):
-            db.add(
-                SlotMapping(
-                    slot_id=new_id,
-                    mapping_type=mapping.mapping_type,
-                    entity_id=(
-                        entity_map.get(mapping.entity_id) if mapping.entity_id else None
-                    ),
-                    role=mapping.role,
-                    group=mapping.group,
-                    intent=mapping.intent,
-                    not_intent=mapping.not_intent,
-                    value=mapping.value,
-                    conditions=mapping.conditions,
-                    active_loop=mapping.active_loop,
-                    priority=mapping.priority,
-                )
-            )
-
-    for form in db.query(Form).filter(Form.version_id == source_id).all():
-        new_id = str(uuid.uuid4())
-        form_map[form.id] = new_id
-
-        db.add(
-            Form(
-                id=new_id,
-                version_id=target_id,
-                name=form.name,
-                ignored_intents=form.ignored_intents,
-            )
-        )
+def retire_version(db: Session, version):
+    """
+    Move a version out of the project's status slots so it can be purged
+    later by purge_version_chunked.
+    """
 
-        for frs in (
-            db.query(FormRequiredSlot).filter(FormRequiredSlot.form_id == form.id).all()
-        ):
-            new_frs_id = str(uuid.uuid4())
-            db.add(
-                FormRequiredSlot(
-                    id=new_frs_id,
-                    form_id=new_id,
-                    slot_id=slot_map.get(frs.slot_id),
-                    order=frs.order,
-                    required=frs.required,
-                )
-            )
-
-            for fsm in (
-                db.query(FormSlotMapping)
-                .filter(FormSlotMapping.form_required_slot_id == frs.id)
-                .all()
-            ):
-                db.add(
-                    FormSlotMapping(
-                        form_required_slot_id=new_frs_id,
-                        mapping_type=fsm.mapping_type,
-                        entity_id=(
-                            entity_map.get(fsm.entity_id) if fsm.entity_id else None
-                        ),
-                        intent=fsm.intent,
-                        not_intent=fsm.not_intent,
-                        value=fsm.value,
-                    )
-                )
-
-    for action in db.query(Action).filter(Action.version_id == source_id).all():
-        new_id = str(uuid.uuid4())
-        action_map[action.id] = new_id
-
-        db.add(
-            Action(
-                id=new_id,
-                version_id=target_id,
-                name=action.name,
-                description=action.description,
-            )
+    leftover = (
+        db.query(Version)
+        .filter(
+            Version.project_id == version.project_id,
+            Version.status == PURGING_STATUS,
         )
+        .first()
+    )
+    if leftover:
+        drop_version(db, leftover)
 
-    for response in db.query(Response).filter(Response.version_id == source_id).all():
-        new_id = str(uuid.uuid4())
-        response_map[response.id] = new_id
+    version.status = PURGING_STATUS
+    db.flush()
 
-        db.add(
-            Response(
-                id=new_id,
-                version_id=target_id,
-                name=response.name,
-            )
-        )
 
-        for variant in (
-            db.query(ResponseVariant)
-            .filter(ResponseVariant.response_id == response.id)
-            .all()
-        ):
-            new_var_id = str(uuid.uuid4())
-            db.add(
-                ResponseVariant(
-                    id=new_var_id,
-                    response_id=new_id,
-                    language_id=variant.language_id,
-                    priority=variant.priority,
-                )
-            )
-
-            for cond in (
-                db.query(ResponseCondition)
-                .filter(ResponseCondition.response_variant_id == variant.id)
-                .all()
-            ):
-                db.add(
-                    ResponseCondition(
-                        response_variant_id=new_var_id,
-                        condition_type=cond.condition_type,
-                        slot_name=cond.slot_name,
-                        slot_value=cond.slot_value,
-                        order_index=cond.order_index,
-                    )
-                )
-
-            for comp in (
-                db.query(ResponseComponent)
-                .filter(ResponseComponent.response_variant_id == variant.id)
-                .all()
-            ):
-                db.add(
-                    ResponseComponent(
-                        response_variant_id=new_var_id,
-                        component_type=comp.component_type,
-                        payload=comp.payload,
-                        order_index=comp.order_index,
-                    )
-                )
-
-    or_group_map = {}
-
-    for story in db.query(Story).filter(Story.version_id == source_id).all():
-        new_id = str(uuid.uuid4())
-        db.add(
-            Story(
-                id=new_id,
-                version_id=target_id,
-                name=story.name,
-            )
-        )
+def purge_version_chunked(version_id: str, batch_size: int = PURGE_BATCH_SIZE):
+    """
+    Delete a retired version in small committed batches, then drop the row.
 
-        for step in db.query(StoryStep).filter(StoryStep.story_id == story.id).all():
-            new_step_id = str(uuid.uuid4())
-            new_or_group_id = None
-
-            if step.or_group_id:
-                if step.or_group_id not in or_group_map:
-                    or_group_map[step.or_group_id] = str(uuid.uuid4())
-                new_or_group_id = or_group_map[step.or_group_id]
-
-            db.add(
-                StoryStep(
-                    id=new_step_id,
-                    story_id=new_id,
-                    timeline_index=step.timeline_index,
-                    step_order=step.step_order,
-                    step_type=step.step_type,
-                    intent_id=(
-                        intent_map.get(step.intent_id) if step.intent_id else None
-                    ),
-                    action_id=(
-                        action_map.get(step.action_id) if step.action_id else None
-                    ),
-                    response_id=(
-                        response_map.get(step.response_id) if step.response_id else None
-                    ),
-                    form_id=form_map.get(step.form_id) if step.form_id else None,
-                    active_loop_value=step.active_loop_value,
-                    checkpoint_name=step.checkpoint_name,
-                    or_group_id=new_or_group_id,
-                )
-            )
-
-            for event in (
-                db.query(StorySlotEvent)
-                .filter(StorySlotEvent.story_step_id == step.id)
-                .all()
-            ):
-                db.add(
-                    StorySlotEvent(
-                        story_step_id=new_step_id,
-                        slot_id=slot_map.get(event.slot_id),
-                        value=event.value,
-                    )
-                )
-
-            for step_entity in (
-                db.query(StoryStepEntity)
-                .filter(StoryStepEntity.story_step_id == step.id)
-                .all()
-            ):
-                db.add(
-                    StoryStepEntity(
-                        story_step_id=new_step_id,
-                        entity_id=entity_map.get(step_entity.entity_id),
-                        value=step_entity.value,
-                        role=step_entity.role,
-                        group=step_entity.group,
-                    )
-                )
-
-    for rule in db.query(Rule).filter(Rule.version_id == source_id).all():
-        new_id = str(uuid.uuid4())
-        db.add(
-            Rule(
-                id=new_id,
-                version_id=target_id,
-                name=rule.name,
-            )
-        )
+    Runs outside the request, with its own session.
+    """
 
-        for cond in (
-            db.query(RuleCondition).filter(RuleCondition.rule_id == rule.id).all()
-        ):
-            db.add(
-                RuleCondition(
-                    rule_id=new_id,
-                    condition_type=cond.condition_type,
-                    slot_name=cond.slot_name,
-                    slot_value=cond.slot_value,
-                    active_loop=cond.active_loop,
-                    order_index=cond.order_index,
-                )
-            )
-
-        for step in db.query(RuleStep).filter(RuleStep.rule_id == rule.id).all():
-            new_step_id = str(uuid.uuid4())
-            db.add(
-                RuleStep(
-                    id=new_step_id,
-                    rule_id=new_id,
-                    step_order=step.step_order,
-                    step_type=step.step_type,
-                    intent_id=(
-                        intent_map.get(step.intent_id) if step.intent_id else None
+    db = SessionLocal()
+    try:
+        for table, ids_query in PURGE_BATCHES:
+            while True:
+                deleted = db.execute(
+                    text(
+                        f"""
+                    DELETE FROM {table}
+                    WHERE id IN ({ids_query} LIMIT :batch)
+                """
                     ),
-                    action_id=(
-                        action_map.get(step.action_id) if step.action_id else None
-                    ),
-                    response_id=(
-                        response_map.get(step.response_id) if step.response_id else None
-                    ),
-                    form_id=form_map.get(step.form_id) if step.form_id else None,
-                    active_loop_value=step.active_loop_value,
-                )
-            )
-
-            for event in (
-                db.query(RuleSlotEvent)
-                .filter(RuleSlotEvent.rule_step_id == step.id)
-                .all()
-            ):
-                db.add(
-                    RuleSlotEvent(
-                        rule_step_id=new_step_id,
-                        slot_id=slot_map.get(event.slot_id),
-                        value=event.value,
-                    )
-                )
-
-            for step_entity in (
-                db.query(RuleStepEntity)
-                .filter(RuleStepEntity.rule_step_id == step.id)
-                .all()
-            ):
-                db.add(
-                    RuleStepEntity(
-                        rule_step_id=new_step_id,
-                        entity_id=entity_map.get(step_entity.entity_id),
-                        value=step_entity.value,
-                        role=step_entity.role,
-                        group=step_entity.group,
-                    )
-                )
-
-    for regex in db.query(Regex).filter(Regex.version_id == source_id).all():
-        new_id = str(uuid.uuid4())
-        db.add(
-            Regex(
-                id=new_id,
-                version_id=target_id,
-                regex_name=regex.regex_name,
-                entity_id=entity_map.get(regex.entity_id),
-            )
-        )
-
-        for ex in (
-            db.query(RegexExample).filter(RegexExample.regex_id == regex.id).all()
-        ):
-            db.add(
-                RegexExample(
-                    regex_id=new_id,
-                    language_id=ex.language_id,
-                    example=ex.example,
-                )
-            )
-
-    for lookup in db.query(Lookup).filter(Lookup.version_id == source_id).all():
-        new_id = str(uuid.uuid4())
-        db.add(
-            Lookup(
-                id=new_id,
-                version_id=target_id,
-                lookup_name=lookup.lookup_name,
-                entity_id=entity_map.get(lookup.entity_id),
-            )
-        )
-
-        for ex in (
-            db.query(LookupExample).filter(LookupExample.lookup_id == lookup.id).all()
-        ):
-            db.add(
-                LookupExample(
-                    lookup_id=new_id,
-                    language_id=ex.language_id,
-                    example=ex.example,
-                )
-            )
-
-    for synonym in db.query(Synonym).filter(Synonym.version_id == source_id).all():
-        new_id = str(uuid.uuid4())
-        db.add(
-            Synonym(
-                id=new_id,
-                version_id=target_id,
-                canonical_value=synonym.canonical_value,
-                entity_id=entity_map.get(synonym.entity_id),
-            )
-        )
-
-        for ex in (
-            db.query(SynonymExample)
-            .filter(SynonymExample.synonym_id == synonym.id)
-            .all()
-        ):
-            db.add(
-                SynonymExample(
-                    synonym_id=new_id,
-                    language_id=ex.language_id,
-                    example=ex.example,
-                )
-            )
-
-    db.flush()
-
-    return {
-        "entity_map": entity_map,
-        "intent_map": intent_map,
-        "slot_map": slot_map,
-        "form_map": form_map,
-        "action_map": action_map,
-        "response_map": response_map,
-    }
+                    {"vid": version_id, "batch": batch_size},
+                ).rowcount
+                db.commit()
+                if deleted < batch_size:
+                    break
+
+        version = db.get(Version, version_id)
+        if version:
+            drop_version(db, version)
+            db.commit()
+    finally:
+        db.close()
 
 
 def increment_version_label(label: str) -> str:
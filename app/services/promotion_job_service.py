@@ -0,0 +1,294 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import func, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+
+from app.db.engine import SessionLocal, engine
+from app.models import Project, PromotionJob
+from app.services.promotion_helpers import PromotionProgress
+from app.services.promotion_service import promote_draft_to_production
+from app.services.rollback_service import rollback_production
+
+
+JOB_RUNNERS = {
+    "promote": promote_draft_to_production,
+    "rollback": rollback_production,
+}
+
+ACTIVE_STATUSES = ("queued", "running")
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="promotion-job")
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobProgress(PromotionProgress):
+    """
+    Records progress on the job row through a dedicated connection, so it is
+    visible while the promotion transaction is still open.
+
+    The connection also holds a session advisory lock on the job id for as
+    long as the job runs. A job that is 'running' but whose lock is free was
+    left behind by a dead worker and may be taken over.
+    """
+
+    def __init__(self, job_id: str, db: Session):
+        self.job_id = job_id
+        self.db = db
+        self.conn = engine.connect()
+        self.rows = {}
+        self.locked = False
+
+    def claim(self):
+        """Lock the job and mark it running. Returns (kind, project_code)."""
+
+        self.locked = self.conn.execute(
+            text("SELECT pg_try_advisory_lock(hashtext(:id))"),
+            {"id": self.job_id},
+        ).scalar()
+        if not self.locked:
+            self.conn.commit()
+            return None
+
+        row = self.conn.execute(
+            text(
+                """
+            UPDATE promotion_jobs j
+            SET status = 'running',
+                phase = NULL,
+                rows_copied = '{}',
+                started_at = now(),
+                finished_at = NULL
+            FROM projects p
+            WHERE j.id = :id
+              AND p.id = j.project_id
+              AND j.status IN ('queued', 'running')
+              AND NOT j.cancel_requested
+            RETURNING j.kind, p.project_code
+        """
+            ),
+            {"id": self.job_id},
+        ).first()
+        self.conn.commit()
+        return row
+
+    def phase(self, name: str):
+        self._update("phase = :phase", {"phase": name})
+
+        if name == "committing":
+            # Flip the status inside the promotion transaction, so a worker
+            # dying right after the commit never re-runs a finished job.
+            self.db.execute(
+                text(
+                    """
+                UPDATE promotion_jobs
+                SET status = 'succeeded', finished_at = now()
+                WHERE id = :id
+            """
+                ),
+                {"id": self.job_id},
+            )
+
+    def copied(self, table: str, rows: int):
+        self.rows[table] = self.rows.get(table, 0) + rows
+        self._update(
+            "rows_copied = CAST(:rows AS json)",
+            {"rows": json.dumps(self.rows)},
+        )
+
+    def finish(self, status: str, result=None, error=None):
+        self.conn.execute(
+            text(
+                """
+            UPDATE promotion_jobs
+            SET status = :status,
+                result = CAST(:result AS json),
+                error = :error,
+                finished_at = COALESCE(finished_at, now())
+            WHERE id = :id
+        """
+            ),
+            {
+                "id": self.job_id,
+                "status": status,
+                "result": json.dumps(result) if result is not None else None,
+                "error": error,
+            },
+        )
+        self.conn.commit()
+
+    def close(self):
+        if self.locked:
+            self.conn.execute(
+                text("SELECT pg_advisory_unlock(hashtext(:id))"),
+                {"id": self.job_id},
+            )
+            self.conn.commit()
+        self.conn.close()
+
+    def _update(self, assignment: str, params: dict):
+        cancel_requested = self.conn.execute(
+            text(
+                f"""
+            UPDATE promotion_jobs SET {assignment}
+            WHERE id = :id
+            RETURNING cancel_requested
+        """
+            ),
+            {"id": self.job_id, **params},
+        ).scalar()
+        self.conn.commit()
+        if cancel_requested:
+            raise JobCancelled()
+
+
+def run_promotion_job(job_id: str):
+    """Execute a queued job. Safe to call from several workers at once."""
+
+    db = SessionLocal()
+    progress = JobProgress(job_id, db)
+    try:
+        claimed = progress.claim()
+        if not claimed:
+            return
+        kind, project_code = claimed
+
+        try:
+            result = JOB_RUNNERS[kind](db, project_code, progress=progress)
+            progress.finish("succeeded", result=result)
+        except JobCancelled:
+            db.rollback()
+            progress.finish("cancelled")
+        except HTTPException as exc:
+            db.rollback()
+            detail = exc.detail
+            if not isinstance(detail, str):
+                detail = json.dumps(detail)
+            progress.finish("failed", error=detail)
+        except Exception as exc:
+            db.rollback()
+            progress.finish("failed", error=str(exc))
+    finally:
+        progress.close()
+        db.close()
+
+
+def _raise_if_active(db: Session, project_id: str) -> None:
+    active = (
+        db.query(PromotionJob)
+        .filter(
+            PromotionJob.project_id == project_id,
+            PromotionJob.status.in_(ACTIVE_STATUSES),
+        )
+        .first()
+    )
+    if active:
+        raise HTTPException(
+            409,
+            f"Job '{active.id}' is already {active.status} for this project",
+        )
+
+
+def submit_promotion_job(db: Session, project_code: str, kind: str) -> dict:
+    project = db.query(Project).filter(Project.project_code == project_code).first()
+    if not project:
+        raise HTTPException(404, "Project not found")
+
+    _raise_if_active(db, project.id)
+
+    job = PromotionJob(project_id=project.id, kind=kind, status="queued", rows_copied={})
+    db.add(job)
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent submit won: uq_promotion_job_active_project allows
+        # one queued or running job per project.
+        db.rollback()
+        _raise_if_active(db, project.id)
+        raise HTTPException(409, "Another job was just submitted for this project")
+
+    _executor.submit(run_promotion_job, job.id)
+    return get_promotion_job(db, project_code, job.id)
+
+
+def get_promotion_job(db: Session, project_code: str, job_id: str) -> dict:
+    row = (
+        db.query(
+            PromotionJob,
+            func.extract(
+                "epoch",
+                func.coalesce(PromotionJob.finished_at, func.now())
+                - PromotionJob.started_at,
+            ),
+        )
+        .join(Project, Project.id == PromotionJob.project_id)
+        .filter(
+            Project.project_code == project_code,
+            PromotionJob.id == job_id,
+        )
+        .first()
+    )
+    if not row:
+        raise HTTPException(404, "Job not found")
+
+    job, elapsed = row
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "phase": job.phase,
+        "rows_copied": job.rows_copied or {},
+        "result": job.result,
+        "error": job.error,
+        "cancel_requested": job.cancel_requested,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+        "elapsed_seconds": float(elapsed) if elapsed is not None else None,
+    }
+
+
+def cancel_promotion_job(db: Session, project_code: str, job_id: str) -> dict:
+    job = get_promotion_job(db, project_code, job_id)
+    if job["status"] not in ACTIVE_STATUSES:
+        raise HTTPException(409, f"Job is already {job['status']}")
+
+    # A queued job is cancelled right away; a running one stops at its next
+    # progress report and rolls back.
+    db.execute(
+        text(
+            """
+        UPDATE promotion_jobs
+        SET cancel_requested = true,
+            status = CASE WHEN status = 'queued' THEN 'cancelled' ELSE status END,
+            finished_at = CASE WHEN status = 'queued' THEN now() ELSE finished_at END
+        WHERE id = :id
+    """
+        ),
+        {"id": job_id},
+    )
+    db.commit()
+    return get_promotion_job(db, project_code, job_id)
+
+
+def resume_promotion_jobs():
+    """Re-submit jobs left queued or running by a previous worker."""
+
+    db = SessionLocal()
+    try:
+        job_ids = [
+            job_id
+            for (job_id,) in db.query(PromotionJob.id)
+            .filter(PromotionJob.status.in_(ACTIVE_STATUSES))
+            .order_by(PromotionJob.created_at)
+        ]
+    finally:
+        db.close()
+
+    for job_id in job_ids:
+        _executor.submit(run_promotion_job, job_id)
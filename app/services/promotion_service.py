@@ -1,19 +1,30 @@
+from typing import Optional
+
 from sqlalchemy.orm import Session
-from fastapi import HTTPException
+from fastapi import BackgroundTasks, HTTPException
 
 from app.models import Project, Version, VersionLanguage
 from app.services.promotion_helpers import (
-    delete_version_data,
+    drop_version,
+    retire_version,
+    purge_version_chunked,
     clone_version_data,
     increment_version_label,
+    PromotionProgress,
 )
 from app.services.guard_service import validate_all_intents_for_version
+from app.utils.export_cache import export_cache
+from app.utils.resolver_cache import resolver_cache
 
 
 def promote_draft_to_production(
     db: Session,
     project_code: str,
+    background_tasks: Optional[BackgroundTasks] = None,
+    progress: Optional[PromotionProgress] = None,
 ):
+    progress = progress or PromotionProgress()
+    progress.phase("validating")
 
     project = db.query(Project).filter(Project.project_code == project_code).first()
     if not project:
@@ -54,6 +65,10 @@ def promote_draft_to_production(
     draft_version_label = draft.version_label
     new_draft_version_label = increment_version_label(draft_version_label)
 
+    # Promotion re-labels version rows instead of copying their data:
+    # locked -> archived and draft -> locked are status swaps, so only the
+    # new editable draft needs a physical copy.
+    progress.phase("dropping_archive")
     existing_archive = (
         db.query(Version)
         .filter(
@@ -62,45 +77,48 @@ def promote_draft_to_production(
         )
         .first()
     )
+    # Versions that stop being locked; their cached exports are dropped.
+    unlocked_version_ids = [production.id]
     if existing_archive:
-        delete_version_data(db, existing_archive.id)
-        db.delete(existing_archive)
-        db.flush()
-
-    archive = Version(
-        project_id=project.id,
-        version_label=production.version_label,
-        status="archived",
-    )
-    db.add(archive)
-    db.flush()
+        unlocked_version_ids.append(existing_archive.id)
 
-    clone_version_data(db, production.id, archive.id)
-
-    delete_version_data(db, production.id)
-    clone_version_data(db, draft.id, production.id)
+    if existing_archive:
+        if background_tasks is None:
+            drop_version(db, existing_archive)
+        else:
+            retire_version(db, existing_archive)
 
-    production.version_label = draft_version_label
+    progress.phase("swapping_versions")
+    production.status = "archived"
+    db.flush()
 
-    delete_version_data(db, draft.id)
-    db.delete(draft)
+    draft.status = "locked"
     db.flush()
 
     new_draft = Version(
         project_id=project.id,
         version_label=new_draft_version_label,
         status="draft",
-        parent_version_id=production.id,
+        parent_version_id=draft.id,
     )
     db.add(new_draft)
     db.flush()
 
-    clone_version_data(db, production.id, new_draft.id)
+    progress.phase("cloning_draft")
+    clone_version_data(db, draft.id, new_draft.id, progress)
 
+    progress.phase("committing")
     db.commit()
 
+    for version_id in unlocked_version_ids:
+        export_cache.invalidate_version(version_id)
+    resolver_cache.invalidate_project(project_code)
+
+    if existing_archive and background_tasks is not None:
+        background_tasks.add_task(purge_version_chunked, existing_archive.id)
+
     return {
         "message": "Promotion successful",
-        "production_version": production.version_label,
+        "production_version": draft_version_label,
         "new_draft_version": new_draft.version_label,
     }
@@ -1,14 +1,27 @@
+from typing import Optional
+
 from sqlalchemy.orm import Session, joinedload
 from fastapi import HTTPException
 
-from app.models import Language, Entity, VersionLanguage
+from app.models import Entity
 from app.models.regex import Regex, RegexExample
-from app.services.common import get_version_by_status, get_draft_version
+from app.services.common import (
+    get_draft_version,
+    get_language_id,
+    get_version_by_status,
+    require_version_language,
+    touch_version,
+)
+from app.services.example_upsert import sync_examples
+from app.core.pagination import PageParams, paginate
+from app.db.reads import fetch_rows, select_for
+from app.schemas.regex import RegexResponse
 
 
 def create_regex(db: Session, project_code: str, regex_name: str, entity_key: str):
     """Create a new regex in the draft version."""
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     entity = (
         db.query(Entity)
@@ -48,26 +61,21 @@ def create_regex(db: Session, project_code: str, regex_name: str, entity_key: st
     return regex
 
 
-def list_regexes(db: Session, project_code: str, status: str):
+def list_regexes(
+    db: Session,
+    project_code: str,
+    status: str,
+    page: Optional[PageParams] = None,
+):
     """List all regexes for a version."""
     version = get_version_by_status(db, project_code, status)
 
-    regexes = (
-        db.query(Regex)
-        .options(joinedload(Regex.entity))
-        .filter(Regex.version_id == version.id)
-        .order_by(Regex.regex_name)
-        .all()
+    query = (
+        select_for(RegexResponse, Regex, entity_key=Entity.entity_key)
+        .join(Entity, Entity.id == Regex.entity_id)
+        .where(Regex.version_id == version.id)
     )
-
-    return [
-        {
-            "id": r.id,
-            "regex_name": r.regex_name,
-            "entity_key": r.entity.entity_key,
-        }
-        for r in regexes
-    ]
+    return fetch_rows(db, paginate(query, Regex.regex_name, page))
 
 
 def get_regex(db: Session, project_code: str, status: str, regex_name: str):
@@ -96,6 +104,7 @@ def get_regex(db: Session, project_code: str, status: str, regex_name: str):
 def delete_regex(db: Session, project_code: str, regex_name: str):
     """Delete a regex from the draft version."""
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     regex = (
         db.query(Regex)
@@ -136,37 +145,18 @@ def upsert_regex_examples(
     if not regex:
         raise HTTPException(404, "Regex not found")
 
-    language = (
-        db.query(Language).filter(Language.language_code == language_code).first()
-    )
-    if not language:
-        raise HTTPException(404, "Language not found")
+    language_id = get_language_id(db, language_code)
 
-    enabled = (
-        db.query(VersionLanguage)
-        .filter(
-            VersionLanguage.version_id == version.id,
-            VersionLanguage.language_id == language.id,
-        )
-        .first()
-    )
-    if not enabled:
-        raise HTTPException(400, "Language not enabled in draft version")
-
-    db.query(RegexExample).filter(
-        RegexExample.regex_id == regex.id,
-        RegexExample.language_id == language.id,
-    ).delete()
+    require_version_language(db, version.id, language_id)
 
-    for ex in examples:
-        if ex.strip():
-            db.add(
-                RegexExample(
-                    regex_id=regex.id,
-                    language_id=language.id,
-                    example=ex.strip(),
-                )
-            )
+    counts = sync_examples(
+        db,
+        RegexExample,
+        {"regex_id": regex.id, "language_id": language_id},
+        examples,
+    )
+    if counts["added"] or counts["removed"]:
+        touch_version(db, version.id)
 
     db.commit()
 
@@ -174,6 +164,7 @@ def upsert_regex_examples(
         "regex_name": regex_name,
         "language_code": language_code,
         "example_count": len(examples),
+        **counts,
     }
 
 
@@ -198,17 +189,13 @@ def get_regex_examples(
     if not regex:
         raise HTTPException(404, "Regex not found")
 
-    language = (
-        db.query(Language).filter(Language.language_code == language_code).first()
-    )
-    if not language:
-        raise HTTPException(404, "Language not found")
+    language_id = get_language_id(db, language_code)
 
     examples = (
         db.query(RegexExample)
         .filter(
             RegexExample.regex_id == regex.id,
-            RegexExample.language_id == language.id,
+            RegexExample.language_id == language_id,
         )
         .all()
     )
@@ -228,6 +215,7 @@ def delete_regex_examples(
 ):
     """Delete all examples for a regex in a specific language."""
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     regex = (
         db.query(Regex)
@@ -240,15 +228,11 @@ def delete_regex_examples(
     if not regex:
         raise HTTPException(404, "Regex not found")
 
-    language = (
-        db.query(Language).filter(Language.language_code == language_code).first()
-    )
-    if not language:
-        raise HTTPException(404, "Language not found")
+    language_id = get_language_id(db, language_code)
 
     db.query(RegexExample).filter(
         RegexExample.regex_id == regex.id,
-        RegexExample.language_id == language.id,
+        RegexExample.language_id == language_id,
     ).delete()
 
     db.commit()
@@ -1,31 +1,20 @@
+from typing import Optional
+
 from sqlalchemy.orm import Session, joinedload
 from fastapi import HTTPException
 
 from app.models import (
     Response, ResponseVariant, ResponseCondition, ResponseComponent,
-    Version, Project, Language
+    Language
 )
 from app.schemas.response import (
-    ResponseCreate, ResponseUpdate,
+    ResponseCreate, ResponseUpdate, ResponseResponse,
     ResponseVariantCreate, ResponseVariantUpdate,
     ResponseComponentCreate
 )
-
-
-def get_version_by_status(db: Session, project_code: str, status: str) -> Version:
-    """Get version by project code and status."""
-    project = db.query(Project).filter(Project.project_code == project_code).first()
-    if not project:
-        raise HTTPException(404, "Project not found")
-    
-    version = db.query(Version).filter(
-        Version.project_id == project.id,
-        Version.status == status
-    ).first()
-    if not version:
-        raise HTTPException(404, f"Version with status '{status}' not found")
-    
-    return version
+from app.services.common import get_version_by_status, touch_version
+from app.core.pagination import PageParams, paginate
+from app.db.reads import fetch_rows, select_for
 
 
 # ============================================================
@@ -35,6 +24,7 @@ def get_version_by_status(db: Session, project_code: str, status: str) -> Versio
 def create_response(db: Session, project_code: str, payload: ResponseCreate) -> Response:
     """Create a new response in the draft version."""
     version = get_version_by_status(db, project_code, "draft")
+    touch_version(db, version.id)
     
     # Check for duplicate
     existing = db.query(Response).filter(
@@ -62,13 +52,20 @@ def create_response(db: Session, project_code: str, payload: ResponseCreate) ->
     return response
 
 
-def list_responses(db: Session, project_code: str, status: str) -> list:
+def list_responses(
+    db: Session,
+    project_code: str,
+    status: str,
+    page: Optional[PageParams] = None,
+) -> list:
     """List all responses for a version."""
     version = get_version_by_status(db, project_code, status)
     
-    return db.query(Response).filter(
-        Response.version_id == version.id
-    ).order_by(Response.name).all()
+    query = (
+        select_for(ResponseResponse, Response)
+        .where(Response.version_id == version.id)
+    )
+    return fetch_rows(db, paginate(query, Response.name, page))
 
 
 def get_response(db: Session, project_code: str, status: str, response_name: str) -> Response:
@@ -96,6 +93,7 @@ def get_response(db: Session, project_code: str, status: str, response_name: str
 def update_response(db: Session, project_code: str, response_name: str, payload: ResponseUpdate) -> Response:
     """Update a response in the draft version."""
     version = get_version_by_status(db, project_code, "draft")
+    touch_version(db, version.id)
     
     response = db.query(Response).filter(
         Response.version_id == version.id,
@@ -131,6 +129,7 @@ def update_response(db: Session, project_code: str, response_name: str, payload:
 def delete_response(db: Session, project_code: str, response_name: str) -> None:
     """Delete a response from the draft version."""
     version = get_version_by_status(db, project_code, "draft")
+    touch_version(db, version.id)
     
     response = db.query(Response).filter(
         Response.version_id == version.id,
@@ -155,6 +154,7 @@ def add_response_variant(
 ) -> ResponseVariant:
     """Add a variant to a response."""
     version = get_version_by_status(db, project_code, "draft")
+    touch_version(db, version.id)
     
     response = db.query(Response).filter(
         Response.version_id == version.id,
@@ -230,6 +230,7 @@ def list_response_variants(db: Session, project_code: str, status: str, response
 def delete_response_variant(db: Session, project_code: str, response_name: str, variant_id: str) -> None:
     """Delete a variant from a response."""
     version = get_version_by_status(db, project_code, "draft")
+    touch_version(db, version.id)
     
     response = db.query(Response).filter(
         Response.version_id == version.id,
@@ -264,6 +265,7 @@ def upsert_response_with_variants(
     This is a convenience method for bulk operations.
     """
     version = get_version_by_status(db, project_code, "draft")
+    touch_version(db, version.id)
     
     # Validate name
     if not response_name.startswith("utter_"):
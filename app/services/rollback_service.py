@@ -1,17 +1,27 @@
+from typing import Optional
+
 from sqlalchemy.orm import Session
-from fastapi import HTTPException
+from fastapi import BackgroundTasks, HTTPException
 
 from app.models import Project, Version
 from app.services.promotion_helpers import (
-    delete_version_data,
-    clone_version_data,
+    drop_version,
+    retire_version,
+    purge_version_chunked,
+    PromotionProgress,
 )
+from app.utils.export_cache import export_cache
+from app.utils.resolver_cache import resolver_cache
 
 
 def rollback_production(
     db: Session,
     project_code: str,
+    background_tasks: Optional[BackgroundTasks] = None,
+    progress: Optional[PromotionProgress] = None,
 ):
+    progress = progress or PromotionProgress()
+    progress.phase("validating")
 
     project = db.query(Project).filter(Project.project_code == project_code).first()
     if not project:
@@ -41,18 +51,34 @@ def rollback_production(
             "No archived version available for rollback",
         )
 
-    delete_version_data(db, production.id)
-    clone_version_data(db, archive.id, production.id)
+    # The archived version already holds the previous production data,
+    # so rolling back is a status swap rather than a copy.
+    restored_label = archive.version_label
+    # The restored version gets a new stamp, so its old cache entries are
+    # as dead as those of the dropped one.
+    unlocked_version_ids = [production.id, archive.id]
 
-    production.version_label = archive.version_label
-    production.status = "locked"
+    progress.phase("dropping_production")
+    if background_tasks is None:
+        drop_version(db, production)
+    else:
+        retire_version(db, production)
 
-    delete_version_data(db, archive.id)
-    db.delete(archive)
+    progress.phase("restoring_archive")
+    archive.status = "locked"
+    db.flush()
 
+    progress.phase("committing")
     db.commit()
 
+    for version_id in unlocked_version_ids:
+        export_cache.invalidate_version(version_id)
+    resolver_cache.invalidate_project(project_code)
+
+    if background_tasks is not None:
+        background_tasks.add_task(purge_version_chunked, production.id)
+
     return {
         "message": "Rollback successful",
-        "production_version": production.version_label,
+        "production_version": restored_label,
     }
@@ -1,3 +1,7 @@
+import uuid
+from typing import Optional
+
+from sqlalchemy import delete
 from sqlalchemy.orm import Session, joinedload
 from fastapi import HTTPException
 
@@ -14,12 +18,27 @@ from app.models import (
     Entity,
 )
 from app.models.rule import RuleStepEntity
-from app.services.common import get_version_by_status, get_draft_version
+from app.services.common import (
+    get_version_by_status,
+    get_draft_version,
+    lock_version,
+    touch_version,
+)
+from app.services.flow_write import (
+    check_action_step,
+    collect_step_references,
+    insert_rows,
+    resolve_references,
+)
+from app.core.pagination import PageParams, paginate
+from app.db.reads import fetch_rows, select_for
+from app.schemas.rule import RuleResponse
 
 
 def create_rule(db: Session, project_code: str, payload):
     """Create a new rule in the draft version."""
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     existing = (
         db.query(Rule)
@@ -42,13 +61,20 @@ def create_rule(db: Session, project_code: str, payload):
     return rule
 
 
-def list_rules(db: Session, project_code: str, status: str):
+def list_rules(
+    db: Session,
+    project_code: str,
+    status: str,
+    page: Optional[PageParams] = None,
+):
     """List all rules for a version."""
     version = get_version_by_status(db, project_code, status)
 
-    return (
-        db.query(Rule).filter(Rule.version_id == version.id).order_by(Rule.name).all()
+    query = (
+        select_for(RuleResponse, Rule)
+        .where(Rule.version_id == version.id)
     )
+    return fetch_rows(db, paginate(query, Rule.name, page))
 
 
 def get_rule(db: Session, project_code: str, status: str, rule_name: str):
@@ -72,6 +98,7 @@ def get_rule(db: Session, project_code: str, status: str, rule_name: str):
 def update_rule(db: Session, project_code: str, rule_name: str, payload):
     """Update a rule in the draft version."""
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     rule = (
         db.query(Rule)
@@ -105,6 +132,7 @@ def update_rule(db: Session, project_code: str, rule_name: str, payload):
 def delete_rule(db: Session, project_code: str, rule_name: str):
     """Delete a rule from the draft version."""
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     rule = (
         db.query(Rule)
@@ -140,6 +168,7 @@ def add_rule_condition(db: Session, rule_id: str, payload):
     rule = db.query(Rule).filter(Rule.id == rule_id).first()
     if not rule:
         raise HTTPException(404, "Rule not found")
+    touch_version(db, rule.version_id)
 
     condition = RuleCondition(
         rule_id=rule.id,
@@ -186,6 +215,7 @@ def update_rule_condition(db: Session, condition_id: str, payload):
     condition = db.query(RuleCondition).filter(RuleCondition.id == condition_id).first()
     if not condition:
         raise HTTPException(404, "Rule condition not found")
+    touch_version(db, condition.rule.version_id)
 
     if payload.condition_type is not None:
         condition.condition_type = payload.condition_type
@@ -208,6 +238,7 @@ def delete_rule_condition(db: Session, condition_id: str):
     condition = db.query(RuleCondition).filter(RuleCondition.id == condition_id).first()
     if not condition:
         raise HTTPException(404, "Rule condition not found")
+    touch_version(db, condition.rule.version_id)
 
     db.delete(condition)
     db.commit()
@@ -231,6 +262,7 @@ def add_rule_step(db: Session, rule_id: str, payload):
     rule = db.query(Rule).filter(Rule.id == rule_id).first()
     if not rule:
         raise HTTPException(404, "Rule not found")
+    touch_version(db, rule.version_id)
 
     # Validate action step - must have exactly one of action_name, response_name, or form_name
     if payload.step_type == "action":
@@ -412,6 +444,7 @@ def update_rule_step(db: Session, step_id: str, payload):
     )
     if not step:
         raise HTTPException(404, "Rule step not found")
+    touch_version(db, step.rule.version_id)
 
     if payload.step_type is not None:
         step.step_type = payload.step_type
@@ -508,6 +541,7 @@ def delete_rule_step(db: Session, step_id: str):
     step = db.query(RuleStep).filter(RuleStep.id == step_id).first()
     if not step:
         raise HTTPException(404, "Rule step not found")
+    touch_version(db, step.rule.version_id)
 
     # Delete related data
     db.query(RuleSlotEvent).filter(RuleSlotEvent.rule_step_id == step.id).delete()
@@ -532,6 +566,7 @@ def add_rule_slot_event(db: Session, step_id: str, payload):
     )
     if not step:
         raise HTTPException(404, "Rule step not found")
+    touch_version(db, step.rule.version_id)
 
     slot = (
         db.query(Slot)
@@ -560,6 +595,7 @@ def delete_rule_slot_event(db: Session, event_id: str):
     event = db.query(RuleSlotEvent).filter(RuleSlotEvent.id == event_id).first()
     if not event:
         raise HTTPException(404, "Rule slot event not found")
+    touch_version(db, event.step.rule.version_id)
 
     db.delete(event)
     db.commit()
@@ -580,6 +616,7 @@ def add_rule_step_entity(db: Session, step_id: str, payload):
     )
     if not step:
         raise HTTPException(404, "Rule step not found")
+    touch_version(db, step.rule.version_id)
 
     if step.step_type != "intent":
         raise HTTPException(400, "Entity annotations are only allowed for intent steps")
@@ -647,6 +684,144 @@ def delete_rule_step_entity(db: Session, entity_id: str):
     entity = db.query(RuleStepEntity).filter(RuleStepEntity.id == entity_id).first()
     if not entity:
         raise HTTPException(404, "Rule step entity not found")
+    touch_version(db, entity.step.rule.version_id)
 
     db.delete(entity)
     db.commit()
+
+
+# -------------------------------------------------
+# RULE BATCH WRITE
+# -------------------------------------------------
+
+
+def write_rule(db: Session, project_code: str, rule_name: str, payload):
+    """
+    Create or replace a whole rule in the draft version.
+
+    The rule is created if missing; otherwise its conditions and steps
+    (with their slot events and entities) are replaced. Names are resolved
+    with one query per type and each table is written with bulk INSERTs,
+    all in one transaction.
+    """
+    version = get_draft_version(db, project_code)
+
+    for position, step in enumerate(payload.steps):
+        check_rule_write_step(step, f"steps[{position}]")
+
+    refs = resolve_references(db, version.id, collect_step_references(payload.steps))
+
+    # Concurrent writes of a new name would otherwise both insert it and
+    # the loser would fail on uq_rule_name_per_version.
+    lock_version(db, version.id)
+
+    rule = (
+        db.query(Rule)
+        .filter(
+            Rule.version_id == version.id,
+            Rule.name == rule_name,
+        )
+        .with_for_update()
+        .first()
+    )
+    created = rule is None
+    if created:
+        rule = Rule(name=rule_name, version_id=version.id)
+        db.add(rule)
+        db.flush()
+    else:
+        # Slot events and entities go with their steps (ON DELETE CASCADE).
+        db.execute(delete(RuleCondition).where(RuleCondition.rule_id == rule.id))
+        db.execute(delete(RuleStep).where(RuleStep.rule_id == rule.id))
+
+    condition_rows, step_rows, event_rows, entity_rows = rule_rows(
+        rule.id, payload.conditions, payload.steps, refs
+    )
+    insert_rows(db, RuleCondition, condition_rows)
+    insert_rows(db, RuleStep, step_rows)
+    insert_rows(db, RuleSlotEvent, event_rows)
+    insert_rows(db, RuleStepEntity, entity_rows)
+
+    touch_version(db, version.id)
+    db.commit()
+
+    return {
+        "id": rule.id,
+        "name": rule.name,
+        "created": created,
+        "conditions": len(condition_rows),
+        "steps": len(step_rows),
+        "slot_events": len(event_rows),
+        "entities": len(entity_rows),
+    }
+
+
+def check_rule_write_step(step, where: str) -> None:
+    """Apply the per-step endpoints' rules to one step of a batch."""
+    if step.step_type == "action":
+        check_action_step(step, where)
+    if step.entities and step.step_type != "intent":
+        raise HTTPException(
+            400, f"{where}: entity annotations are only allowed for intent steps"
+        )
+
+
+def rule_rows(rule_id: str, conditions, steps, refs):
+    """
+    Build the rule_conditions, rule_steps, rule_slot_events and
+    rule_step_entities rows of checked `conditions` and `steps`, with names
+    resolved through `refs` (see app.services.flow_write.resolve_references).
+    """
+    condition_rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "rule_id": rule_id,
+            "condition_type": condition.condition_type,
+            "slot_name": condition.slot_name,
+            "slot_value": condition.slot_value,
+            "active_loop": condition.active_loop,
+            "order_index": (
+                position if condition.order_index is None else condition.order_index
+            ),
+        }
+        for position, condition in enumerate(conditions)
+    ]
+
+    step_rows, event_rows, entity_rows = [], [], []
+    for position, step in enumerate(steps):
+        step_id = str(uuid.uuid4())
+        step_rows.append(
+            {
+                "id": step_id,
+                "rule_id": rule_id,
+                "step_order": position if step.step_order is None else step.step_order,
+                "step_type": step.step_type,
+                "intent_id": refs["intent"].get(step.intent_name),
+                "action_id": refs["action"].get(step.action_name),
+                "response_id": refs["response"].get(step.response_name),
+                "form_id": refs["form"].get(step.form_name),
+                "active_loop_value": step.active_loop_value,
+            }
+        )
+        for event in step.slot_events or []:
+            event_rows.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "rule_step_id": step_id,
+                    "slot_id": refs["slot"][event.slot_name],
+                    "value": event.value,
+                }
+            )
+        for entity in step.entities or []:
+            entity_rows.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "rule_step_id": step_id,
+                    "entity_id": refs["entity"][entity.entity_key],
+                    "value": entity.value,
+                    "role": entity.role,
+                    "group": entity.group,
+                }
+            )
+
+    return condition_rows, step_rows, event_rows, entity_rows
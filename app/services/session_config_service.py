@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
 from app.models import Project, Version, SessionConfig
+from app.services.common import touch_version
 
 
 def upsert_session_config(db: Session, project_code: str, payload):
@@ -20,6 +21,7 @@ def upsert_session_config(db: Session, project_code: str, payload):
     )
     if not version:
         raise HTTPException(404, "Draft version not found")
+    touch_version(db, version.id)
 
     config = (
         db.query(SessionConfig).filter(SessionConfig.version_id == version.id).first()
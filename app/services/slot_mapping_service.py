@@ -1,7 +1,7 @@
 from sqlalchemy.orm import Session, joinedload
 from fastapi import HTTPException
 from app.models import Slot, SlotMapping, Entity, Intent
-from app.services.common import get_version_by_status, get_draft_version
+from app.services.common import get_version_by_status, get_draft_version, touch_version
 
 
 def add_slot_mapping(db: Session, project_code: str, slot_name: str, payload):
@@ -16,6 +16,7 @@ def add_slot_mapping(db: Session, project_code: str, slot_name: str, payload):
     - custom: Custom action fills slot
     """
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     slot = (
         db.query(Slot)
@@ -178,6 +179,7 @@ def update_slot_mapping(
 ):
     """Update a slot mapping."""
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     slot = (
         db.query(Slot)
@@ -263,6 +265,7 @@ def delete_slot_mapping(
 ):
     """Delete a slot mapping."""
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     slot = (
         db.query(Slot)
@@ -1,8 +1,13 @@
+from typing import Optional
+
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
 from app.models import Slot, SlotMapping
-from app.services.common import get_version_by_status, get_draft_version
+from app.services.common import get_version_by_status, get_draft_version, touch_version
+from app.core.pagination import PageParams, paginate
+from app.db.reads import fetch_rows, select_for
+from app.schemas.slot import SlotResponse
 
 
 def validate_slot_payload(payload):
@@ -35,6 +40,7 @@ def validate_slot_payload(payload):
 
 def create_slot(db: Session, project_code: str, payload):
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     existing = (
         db.query(Slot)
@@ -67,12 +73,19 @@ def create_slot(db: Session, project_code: str, payload):
     return slot
 
 
-def list_slots(db: Session, project_code: str, status: str):
+def list_slots(
+    db: Session,
+    project_code: str,
+    status: str,
+    page: Optional[PageParams] = None,
+):
     version = get_version_by_status(db, project_code, status)
 
-    return (
-        db.query(Slot).filter(Slot.version_id == version.id).order_by(Slot.name).all()
+    query = (
+        select_for(SlotResponse, Slot)
+        .where(Slot.version_id == version.id)
     )
+    return fetch_rows(db, paginate(query, Slot.name, page))
 
 
 def get_slot(db: Session, project_code: str, status: str, slot_name: str):
@@ -94,6 +107,7 @@ def get_slot(db: Session, project_code: str, status: str, slot_name: str):
 
 def update_slot(db: Session, project_code: str, slot_name: str, payload):
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     slot = (
         db.query(Slot)
@@ -141,6 +155,7 @@ def update_slot(db: Session, project_code: str, slot_name: str, payload):
 
 def delete_slot(db: Session, project_code: str, slot_name: str):
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     slot = (
         db.query(Slot)
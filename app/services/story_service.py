@@ -1,4 +1,7 @@
 import uuid
+from collections import defaultdict
+from typing import Optional
+from sqlalchemy import delete
 from sqlalchemy.orm import Session, joinedload
 from fastapi import HTTPException
 
@@ -14,12 +17,27 @@ from app.models import (
     Entity,
 )
 from app.models.story import StoryStepEntity
-from app.services.common import get_version_by_status, get_draft_version
+from app.services.common import (
+    get_version_by_status,
+    get_draft_version,
+    lock_version,
+    touch_version,
+)
+from app.services.flow_write import (
+    check_action_step,
+    collect_step_references,
+    insert_rows,
+    resolve_references,
+)
+from app.core.pagination import PageParams, paginate
+from app.db.reads import fetch_rows, select_for
+from app.schemas.story import StoryResponse
 
 
 def create_story(db: Session, project_code: str, payload):
     """Create a new story in the draft version."""
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     existing = (
         db.query(Story)
@@ -42,16 +60,20 @@ def create_story(db: Session, project_code: str, payload):
     return story
 
 
-def list_stories(db: Session, project_code: str, status: str):
+def list_stories(
+    db: Session,
+    project_code: str,
+    status: str,
+    page: Optional[PageParams] = None,
+):
     """List all stories for a version."""
     version = get_version_by_status(db, project_code, status)
 
-    return (
-        db.query(Story)
-        .filter(Story.version_id == version.id)
-        .order_by(Story.name)
-        .all()
+    query = (
+        select_for(StoryResponse, Story)
+        .where(Story.version_id == version.id)
     )
+    return fetch_rows(db, paginate(query, Story.name, page))
 
 
 def get_story(db: Session, project_code: str, status: str, story_name: str):
@@ -75,6 +97,7 @@ def get_story(db: Session, project_code: str, status: str, story_name: str):
 def update_story(db: Session, project_code: str, story_name: str, payload):
     """Update a story in the draft version."""
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     story = (
         db.query(Story)
@@ -108,6 +131,7 @@ def update_story(db: Session, project_code: str, story_name: str, payload):
 def delete_story(db: Session, project_code: str, story_name: str):
     """Delete a story from the draft version."""
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     story = (
         db.query(Story)
@@ -154,6 +178,7 @@ def add_story_step(db: Session, story_id: str, payload):
     story = db.query(Story).filter(Story.id == story_id).first()
     if not story:
         raise HTTPException(404, "Story not found")
+    touch_version(db, story.version_id)
 
     # Handle OR condition
     if payload.step_type == "or":
@@ -391,6 +416,7 @@ def update_story_step(db: Session, step_id: str, payload):
     )
     if not step:
         raise HTTPException(404, "Story step not found")
+    touch_version(db, step.story.version_id)
 
     if payload.step_type is not None:
         step.step_type = payload.step_type
@@ -494,6 +520,7 @@ def delete_story_step(db: Session, step_id: str):
     step = db.query(StoryStep).filter(StoryStep.id == step_id).first()
     if not step:
         raise HTTPException(404, "Story step not found")
+    touch_version(db, step.story.version_id)
 
     # Delete related data
     db.query(StorySlotEvent).filter(StorySlotEvent.story_step_id == step.id).delete()
@@ -533,6 +560,7 @@ def add_story_slot_event(db: Session, step_id: str, payload):
     )
     if not step:
         raise HTTPException(404, "Story step not found")
+    touch_version(db, step.story.version_id)
 
     slot = (
         db.query(Slot)
@@ -562,6 +590,7 @@ def delete_story_slot_event(db: Session, event_id: str):
     event = db.query(StorySlotEvent).filter(StorySlotEvent.id == event_id).first()
     if not event:
         raise HTTPException(404, "Story slot event not found")
+    touch_version(db, event.step.story.version_id)
 
     db.delete(event)
     db.commit()
@@ -582,6 +611,7 @@ def add_story_step_entity(db: Session, step_id: str, payload):
     )
     if not step:
         raise HTTPException(404, "Story step not found")
+    touch_version(db, step.story.version_id)
 
     if step.step_type != "intent":
         raise HTTPException(400, "Entity annotations are only allowed for intent steps")
@@ -649,6 +679,165 @@ def delete_story_step_entity(db: Session, entity_id: str):
     entity = db.query(StoryStepEntity).filter(StoryStepEntity.id == entity_id).first()
     if not entity:
         raise HTTPException(404, "Story step entity not found")
+    touch_version(db, entity.step.story.version_id)
 
     db.delete(entity)
     db.commit()
+
+
+# -------------------------------------------------
+# STORY BATCH WRITE
+# -------------------------------------------------
+
+
+def write_story(db: Session, project_code: str, story_name: str, payload):
+    """
+    Create or replace a whole story in the draft version.
+
+    The story is created if missing; otherwise its steps (with their slot
+    events and entities) are replaced. Names are resolved with one query
+    per type and each table is written with bulk INSERTs, all in one
+    transaction.
+    """
+    version = get_draft_version(db, project_code)
+
+    for position, step in enumerate(payload.steps):
+        check_story_write_step(step, f"steps[{position}]")
+
+    refs = resolve_references(db, version.id, collect_step_references(payload.steps))
+
+    # Concurrent writes of a new name would otherwise both insert it and
+    # the loser would fail on uq_story_name_per_version.
+    lock_version(db, version.id)
+
+    story = (
+        db.query(Story)
+        .filter(
+            Story.version_id == version.id,
+            Story.name == story_name,
+        )
+        .with_for_update()
+        .first()
+    )
+    created = story is None
+    if created:
+        story = Story(name=story_name, version_id=version.id)
+        db.add(story)
+        db.flush()
+    else:
+        # Slot events and entities go with their steps (ON DELETE CASCADE).
+        db.execute(delete(StoryStep).where(StoryStep.story_id == story.id))
+
+    step_rows, event_rows, entity_rows = story_step_rows(story.id, payload.steps, refs)
+    insert_rows(db, StoryStep, step_rows)
+    insert_rows(db, StorySlotEvent, event_rows)
+    insert_rows(db, StoryStepEntity, entity_rows)
+
+    touch_version(db, version.id)
+    db.commit()
+
+    return {
+        "id": story.id,
+        "name": story.name,
+        "created": created,
+        "steps": len(step_rows),
+        "slot_events": len(event_rows),
+        "entities": len(entity_rows),
+    }
+
+
+def check_story_write_step(step, where: str) -> None:
+    """Apply the per-step endpoints' rules to one step of a batch."""
+    if step.step_type == "or":
+        if not step.or_intents or len(step.or_intents) < 2:
+            raise HTTPException(400, f"{where}: OR condition requires at least 2 intents")
+        if step.entities or step.slot_events:
+            raise HTTPException(
+                400, f"{where}: OR steps cannot have entities or slot events"
+            )
+        return
+
+    if step.step_type == "action":
+        check_action_step(step, where)
+
+    if step.entities and step.step_type != "intent":
+        raise HTTPException(
+            400, f"{where}: entity annotations are only allowed for intent steps"
+        )
+
+
+def story_step_rows(story_id: str, steps, refs):
+    """
+    Build the story_steps, story_slot_events and story_step_entities rows of
+    checked `steps`, with names resolved through `refs` (see
+    app.services.flow_write.resolve_references).
+    """
+    step_rows, event_rows, entity_rows = [], [], []
+    next_order = defaultdict(int)
+
+    for step in steps:
+        step_order = step.step_order
+        if step_order is None:
+            step_order = next_order[step.timeline_index]
+        next_order[step.timeline_index] = step_order + 1
+
+        row = {
+            "story_id": story_id,
+            "timeline_index": step.timeline_index,
+            "step_order": step_order,
+            "step_type": step.step_type,
+            "intent_id": None,
+            "action_id": None,
+            "response_id": None,
+            "form_id": None,
+            "active_loop_value": step.active_loop_value,
+            "checkpoint_name": step.checkpoint_name,
+            "or_group_id": None,
+        }
+
+        if step.step_type == "or":
+            or_group_id = str(uuid.uuid4())
+            for intent_name in step.or_intents:
+                step_rows.append(
+                    {
+                        **row,
+                        "id": str(uuid.uuid4()),
+                        "intent_id": refs["intent"][intent_name],
+                        "or_group_id": or_group_id,
+                    }
+                )
+            continue
+
+        step_id = str(uuid.uuid4())
+        step_rows.append(
+            {
+                **row,
+                "id": step_id,
+                "intent_id": refs["intent"].get(step.intent_name),
+                "action_id": refs["action"].get(step.action_name),
+                "response_id": refs["response"].get(step.response_name),
+                "form_id": refs["form"].get(step.form_name),
+            }
+        )
+        for event in step.slot_events or []:
+            event_rows.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "story_step_id": step_id,
+                    "slot_id": refs["slot"][event.slot_name],
+                    "value": event.value,
+                }
+            )
+        for entity in step.entities or []:
+            entity_rows.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "story_step_id": step_id,
+                    "entity_id": refs["entity"][entity.entity_key],
+                    "value": entity.value,
+                    "role": entity.role,
+                    "group": entity.group,
+                }
+            )
+
+    return step_rows, event_rows, entity_rows
@@ -1,9 +1,21 @@
-from sqlalchemy.orm import Session, joinedload
+from typing import Optional
+
+from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
-from app.models import Language, Entity, VersionLanguage
+from app.models import Entity
 from app.models.synonym import Synonym, SynonymExample
-from app.services.common import get_version_by_status, get_draft_version
+from app.services.common import (
+    get_draft_version,
+    get_language_id,
+    get_version_by_status,
+    require_version_language,
+    touch_version,
+)
+from app.services.example_upsert import sync_examples
+from app.core.pagination import PageParams, paginate
+from app.db.reads import fetch_rows, select_for
+from app.schemas.synonym import SynonymListResponse
 
 
 def upsert_synonym(db: Session, project_code: str, payload):
@@ -24,24 +36,9 @@ def upsert_synonym(db: Session, project_code: str, payload):
     if entity.entity_type != "text":
         raise HTTPException(400, "Synonyms are allowed only for text entities")
 
-    language = (
-        db.query(Language)
-        .filter(Language.language_code == payload.language_code)
-        .first()
-    )
-    if not language:
-        raise HTTPException(404, "Language not found")
+    language_id = get_language_id(db, payload.language_code)
 
-    enabled = (
-        db.query(VersionLanguage)
-        .filter(
-            VersionLanguage.version_id == version.id,
-            VersionLanguage.language_id == language.id,
-        )
-        .first()
-    )
-    if not enabled:
-        raise HTTPException(400, "Language not enabled in draft version")
+    require_version_language(db, version.id, language_id)
 
     synonym = (
         db.query(Synonym)
@@ -53,7 +50,8 @@ def upsert_synonym(db: Session, project_code: str, payload):
         .first()
     )
 
-    if not synonym:
+    created = synonym is None
+    if created:
         synonym = Synonym(
             version_id=version.id,
             entity_id=entity.id,
@@ -62,21 +60,14 @@ def upsert_synonym(db: Session, project_code: str, payload):
         db.add(synonym)
         db.flush()
 
-    # Replace examples
-    db.query(SynonymExample).filter(
-        SynonymExample.synonym_id == synonym.id,
-        SynonymExample.language_id == language.id,
-    ).delete()
-
-    for ex in payload.examples:
-        if ex.strip():
-            db.add(
-                SynonymExample(
-                    synonym_id=synonym.id,
-                    language_id=language.id,
-                    example=ex.strip(),
-                )
-            )
+    counts = sync_examples(
+        db,
+        SynonymExample,
+        {"synonym_id": synonym.id, "language_id": language_id},
+        payload.examples,
+    )
+    if created or counts["added"] or counts["removed"]:
+        touch_version(db, version.id)
 
     db.commit()
 
@@ -85,29 +76,25 @@ def upsert_synonym(db: Session, project_code: str, payload):
         "canonical_value": payload.canonical_value,
         "language_code": payload.language_code,
         "example_count": len(payload.examples),
+        **counts,
     }
 
 
-def list_synonyms(db: Session, project_code: str, status: str):
+def list_synonyms(
+    db: Session,
+    project_code: str,
+    status: str,
+    page: Optional[PageParams] = None,
+):
     """List all synonyms for a version."""
     version = get_version_by_status(db, project_code, status)
 
-    synonyms = (
-        db.query(Synonym)
-        .options(joinedload(Synonym.entity))
-        .filter(Synonym.version_id == version.id)
-        .order_by(Synonym.canonical_value)
-        .all()
+    query = (
+        select_for(SynonymListResponse, Synonym, entity_key=Entity.entity_key)
+        .join(Entity, Entity.id == Synonym.entity_id)
+        .where(Synonym.version_id == version.id)
     )
-
-    return [
-        {
-            "id": s.id,
-            "entity_key": s.entity.entity_key,
-            "canonical_value": s.canonical_value,
-        }
-        for s in synonyms
-    ]
+    return fetch_rows(db, paginate(query, Synonym.canonical_value, page))
 
 
 def get_synonym(
@@ -153,6 +140,7 @@ def get_synonym(
 def delete_synonym(db: Session, project_code: str, entity_key: str, canonical_value: str):
     """Delete a synonym from the draft version."""
     version = get_draft_version(db, project_code)
+    touch_version(db, version.id)
 
     entity = (
         db.query(Entity)
@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
 from app.models import Project, Version, Language, ProjectLanguage, VersionLanguage
+from app.services.common import touch_version
 
 
 def add_language_to_draft_version(
@@ -24,6 +25,7 @@ def add_language_to_draft_version(
     )
     if not draft_version:
         raise HTTPException(404, "Draft version not found")
+    touch_version(db, draft_version.id)
 
     language = (
         db.query(Language).filter(Language.language_code == language_code).first()
@@ -2,17 +2,23 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
 from app.models import Project, Version
+from app.db.reads import fetch_rows, select_for
+from app.schemas.version import VersionResponse
+from app.services.promotion_helpers import PURGING_STATUS
 
 
 def list_project_versions(db: Session, project_code: str):
-    """List all versions for a project."""
+    """List the versions of a project, leaving out ones being purged."""
     project = db.query(Project).filter(Project.project_code == project_code).first()
     if not project:
         raise HTTPException(404, "Project not found")
 
-    return (
-        db.query(Version)
-        .filter(Version.project_id == project.id)
-        .order_by(Version.created_at.desc())
-        .all()
+    return fetch_rows(
+        db,
+        select_for(VersionResponse, Version)
+        .where(
+            Version.project_id == project.id,
+            Version.status != PURGING_STATUS,
+        )
+        .order_by(Version.created_at.desc()),
     )
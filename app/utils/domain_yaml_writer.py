@@ -1,3 +1,5 @@
+from typing import Any, Iterator, Tuple
+
 from sqlalchemy.orm import Session, joinedload
 
 from app.models import (
@@ -17,37 +19,17 @@ from app.models import (
     Action,
     SessionConfig,
 )
+from app.db.reads import fetch_grouped
+from app.utils.yaml_stream import stream_yaml_sections
 
 
-def export_domain_yaml(db: Session, version_id: str) -> dict:
+def iter_domain_sections(db: Session, version_id: str) -> Iterator[Tuple[str, Any]]:
     """
-    Export complete RASA domain.yml structure.
-
-    Returns a dict that can be serialized to YAML.
+    Yield the top-level (key, value) sections of domain.yml in output order.
+    Empty sections are skipped; each section is built only when requested.
     """
 
-    domain = {
-        "version": "3.1",
-        "intents": [],
-        "entities": [],
-        "slots": {},
-        "forms": {},
-        "responses": {},
-        "actions": [],
-    }
-
-    # =========================================================
-    # SESSION CONFIG
-    # =========================================================
-    session_config = (
-        db.query(SessionConfig).filter(SessionConfig.version_id == version_id).first()
-    )
-
-    if session_config:
-        domain["session_config"] = {
-            "session_expiration_time": session_config.session_expiration_time,
-            "carry_over_slots_to_new_session": session_config.carry_over_slots_to_new_session,
-        }
+    yield "version", "3.1"
 
     # =========================================================
     # INTENTS
@@ -58,25 +40,28 @@ def export_domain_yaml(db: Session, version_id: str) -> dict:
         .order_by(Intent.intent_name)
         .all()
     )
-    domain["intents"] = [i.intent_name for i in intents]
+    if intents:
+        yield "intents", [i.intent_name for i in intents]
 
     # =========================================================
     # ENTITIES (with roles and groups)
     # =========================================================
     entities = (
-        db.query(Entity)
-        .options(
-            joinedload(Entity.roles),
-            joinedload(Entity.groups),
-        )
+        db.query(Entity.id, Entity.entity_key)
         .filter(Entity.version_id == version_id)
         .order_by(Entity.entity_key)
         .all()
     )
+    entity_ids = [entity.id for entity in entities]
+    entity_roles = fetch_grouped(db, EntityRole.entity_id, EntityRole.role, entity_ids)
+    entity_groups = fetch_grouped(
+        db, EntityGroup.entity_id, EntityGroup.group_name, entity_ids
+    )
 
+    entities_yaml = []
     for entity in entities:
-        roles = [r.role for r in entity.roles]
-        groups = [g.group_name for g in entity.groups]
+        roles = entity_roles[entity.id]
+        groups = entity_groups[entity.id]
 
         if roles or groups:
             entity_def = {}
@@ -85,9 +70,12 @@ def export_domain_yaml(db: Session, version_id: str) -> dict:
             if groups:
                 entity_def["groups"] = groups
 
-            domain["entities"].append({entity.entity_key: entity_def})
+            entities_yaml.append({entity.entity_key: entity_def})
         else:
-            domain["entities"].append(entity.entity_key)
+            entities_yaml.append(entity.entity_key)
+
+    if entities_yaml:
+        yield "entities", entities_yaml
 
     # =========================================================
     # SLOTS (with mappings, conditions, and values)
@@ -102,6 +90,7 @@ def export_domain_yaml(db: Session, version_id: str) -> dict:
         .all()
     )
 
+    slots_yaml = {}
     for slot in slots:
         slot_def = {
             "type": slot.slot_type,
@@ -160,7 +149,10 @@ def export_domain_yaml(db: Session, version_id: str) -> dict:
         if mappings:
             slot_def["mappings"] = mappings
 
-        domain["slots"][slot.name] = slot_def
+        slots_yaml[slot.name] = slot_def
+
+    if slots_yaml:
+        yield "slots", slots_yaml
 
     # =========================================================
     # FORMS (with required slots, mappings, and values)
@@ -178,6 +170,7 @@ def export_domain_yaml(db: Session, version_id: str) -> dict:
         .all()
     )
 
+    forms_yaml = {}
     for form in forms:
         form_def = {}
 
@@ -213,7 +206,10 @@ def export_domain_yaml(db: Session, version_id: str) -> dict:
             required_slots[frs.slot.name] = mappings
 
         form_def["required_slots"] = required_slots
-        domain["forms"][form.name] = form_def
+        forms_yaml[form.name] = form_def
+
+    if forms_yaml:
+        yield "forms", forms_yaml
 
     # =========================================================
     # RESPONSES (with variants, conditions, and components)
@@ -230,6 +226,7 @@ def export_domain_yaml(db: Session, version_id: str) -> dict:
         .all()
     )
 
+    responses_yaml = {}
     for response in responses:
         variants_yaml = []
 
@@ -302,7 +299,10 @@ def export_domain_yaml(db: Session, version_id: str) -> dict:
             if variant_def:
                 variants_yaml.append(variant_def)
 
-        domain["responses"][response.name] = variants_yaml if variants_yaml else []
+        responses_yaml[response.name] = variants_yaml if variants_yaml else []
+
+    if responses_yaml:
+        yield "responses", responses_yaml
 
     # =========================================================
     # ACTIONS
@@ -315,22 +315,33 @@ def export_domain_yaml(db: Session, version_id: str) -> dict:
     )
 
     # Only include custom actions, not utterances (those are in responses)
-    domain["actions"] = [a.name for a in actions]
+    if actions:
+        yield "actions", [a.name for a in actions]
 
     # =========================================================
-    # CLEAN UP EMPTY SECTIONS
+    # SESSION CONFIG
     # =========================================================
-    if not domain["intents"]:
-        del domain["intents"]
-    if not domain["entities"]:
-        del domain["entities"]
-    if not domain["slots"]:
-        del domain["slots"]
-    if not domain["forms"]:
-        del domain["forms"]
-    if not domain["responses"]:
-        del domain["responses"]
-    if not domain["actions"]:
-        del domain["actions"]
-
-    return domain
+    session_config = (
+        db.query(SessionConfig).filter(SessionConfig.version_id == version_id).first()
+    )
+    if session_config:
+        yield "session_config", {
+            "session_expiration_time": session_config.session_expiration_time,
+            "carry_over_slots_to_new_session": session_config.carry_over_slots_to_new_session,
+        }
+
+
+def export_domain_yaml(db: Session, version_id: str) -> dict:
+    """
+    Export complete RASA domain.yml structure.
+
+    Returns a dict that can be serialized to YAML.
+    """
+    return dict(iter_domain_sections(db, version_id))
+
+
+def stream_domain_yaml(db: Session, version_id: str) -> Iterator[str]:
+    """
+    Stream RASA domain.yml text, one top-level section at a time.
+    """
+    return stream_yaml_sections(iter_domain_sections(db, version_id))
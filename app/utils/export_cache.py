@@ -0,0 +1,200 @@
+"""
+Cache for rendered export artifacts of locked versions.
+
+A locked version never changes in place: drafts are the only versions
+that accept writes, and a version only becomes locked (or stops being
+locked) through promotion or rollback. Entries are keyed by
+(version_id, stamp, artifact, language), where the stamp is taken from the
+version row and moves whenever its status is swapped, so an entry can
+never be served for content other than the one it was rendered from.
+
+Artifacts are filled the first time they are requested. The bytes are
+captured while they are streamed to the client and only stored once the
+response has been sent completely.
+"""
+
+import contextlib
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Iterable, Iterator, Optional, Tuple
+
+from app.core.config import settings
+
+
+CacheKey = Tuple[str, str, str, str]
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class ExportCache:
+    """No-op cache, used when caching is disabled."""
+
+    def get(self, key: CacheKey) -> Optional[Iterator[bytes]]:
+        return None
+
+    def fill(self, key: CacheKey, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """Pass `chunks` through, storing them under `key` once exhausted."""
+        yield from chunks
+
+    def invalidate_version(self, version_id: str):
+        pass
+
+
+class MemoryExportCache(ExportCache):
+    """In-process LRU bounded by the total size of the stored artifacts."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                return None
+            self._entries.move_to_end(key)
+        return iter([data])
+
+    def fill(self, key, chunks):
+        parts = []
+        size = 0
+        for chunk in chunks:
+            if parts is not None:
+                size += len(chunk)
+                if size > self.max_bytes:
+                    # Could never fit: stream it without keeping a copy.
+                    parts = None
+                else:
+                    parts.append(chunk)
+            yield chunk
+
+        if parts is not None:
+            self._put(key, b"".join(parts))
+
+    def invalidate_version(self, version_id):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == version_id]:
+                self.size -= len(self._entries.pop(key))
+
+    def _put(self, key, data: bytes):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+
+            self._entries[key] = data
+            self.size += len(data)
+
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+
+class DiskExportCache(ExportCache):
+    """
+    Artifacts stored as files under `<directory>/<version_id>/`, shared by
+    every worker process. The least recently read files are removed once
+    the directory grows past `max_bytes`.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            handle = open(path, "rb")
+        except FileNotFoundError:
+            return None
+
+        # The modification time doubles as the last-access time for eviction.
+        os.utime(path)
+        return self._read(handle)
+
+    def fill(self, key, chunks):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handle = tempfile.NamedTemporaryFile(
+            dir=os.path.dirname(path), prefix=".tmp-", delete=False
+        )
+
+        completed = False
+        try:
+            with handle:
+                for chunk in chunks:
+                    handle.write(chunk)
+                    yield chunk
+            try:
+                os.replace(handle.name, path)
+                completed = True
+            except FileNotFoundError:
+                # invalidate_version removed the directory meanwhile: the
+                # response is complete, the artifact is just not cached.
+                pass
+        finally:
+            if not completed:
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(handle.name)
+
+        self._evict()
+
+    def invalidate_version(self, version_id):
+        shutil.rmtree(os.path.join(self.directory, version_id), ignore_errors=True)
+
+    def _path(self, key) -> str:
+        version_id, stamp, artifact, language = key
+        name = hashlib.sha256(f"{stamp}\0{artifact}\0{language}".encode()).hexdigest()
+        return os.path.join(self.directory, version_id, name)
+
+    def _read(self, handle) -> Iterator[bytes]:
+        with handle:
+            while True:
+                chunk = handle.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    return
+                yield chunk
+
+    def _evict(self):
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.startswith(".tmp-"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+def create_export_cache() -> ExportCache:
+    backend = settings.EXPORT_CACHE_BACKEND
+    if backend == "memory":
+        return MemoryExportCache(settings.EXPORT_CACHE_MAX_BYTES)
+    if backend == "disk":
+        return DiskExportCache(settings.EXPORT_CACHE_DIR, settings.EXPORT_CACHE_MAX_BYTES)
+    if backend == "none":
+        return ExportCache()
+    raise ValueError(f"Unknown EXPORT_CACHE_BACKEND '{backend}'")
+
+
+export_cache = create_export_cache()
@@ -1,3 +1,6 @@
+from typing import Dict, List, Optional
+
+from sqlalchemy import literal_column, select
 from sqlalchemy.orm import Session, joinedload
 
 from app.models import (
@@ -25,77 +28,135 @@ from app.models import (
 # -------------------------------------------------
 
 
-def fetch_intents(db: Session, version_id: str, language_code: str) -> dict:
+class NluExampleSource:
+    """Where the examples of one NLU kind live and how they are joined."""
+
+    def __init__(self, owner, name_column, example, language_column, *joins):
+        self.owner = owner
+        self.name_column = name_column
+        self.example = example
+        self.language_column = language_column
+        self.joins = joins
+
+    def select(self, *columns):
+        query = select(*columns).select_from(self.owner)
+        for target, onclause in self.joins:
+            query = query.join(target, onclause)
+        return query
+
+    @property
+    def example_order(self):
+        """Insertion order; ctid breaks created_at ties."""
+        return (
+            self.example.created_at,
+            literal_column(f"{self.example.__tablename__}.ctid"),
+        )
+
+
+NLU_EXAMPLE_SOURCES = {
+    "intent": NluExampleSource(
+        Intent,
+        Intent.intent_name,
+        IntentExample,
+        IntentLocalization.language_id,
+        (IntentLocalization, IntentLocalization.intent_id == Intent.id),
+        (IntentExample, IntentExample.intent_localization_id == IntentLocalization.id),
+    ),
+    "regex": NluExampleSource(
+        Regex,
+        Regex.regex_name,
+        RegexExample,
+        RegexExample.language_id,
+        (RegexExample, RegexExample.regex_id == Regex.id),
+    ),
+    "lookup": NluExampleSource(
+        Lookup,
+        Lookup.lookup_name,
+        LookupExample,
+        LookupExample.language_id,
+        (LookupExample, LookupExample.lookup_id == Lookup.id),
+    ),
+    "synonym": NluExampleSource(
+        Synonym,
+        Synonym.canonical_value,
+        SynonymExample,
+        SynonymExample.language_id,
+        (SynonymExample, SynonymExample.synonym_id == Synonym.id),
+    ),
+}
+
+
+def fetch_nlu_examples(
+    db: Session,
+    version_id: str,
+    kind: str,
+    language_codes: Optional[List[str]] = None,
+) -> Dict[str, Dict[str, List[str]]]:
     """
+    Examples of one NLU kind ("intent", "regex", "lookup" or "synonym")
+    for the given languages, or for every language when `language_codes`
+    is None, read in a single pass.
+
     Returns:
     {
-        intent_name: [example, example, ...]
+        language_code: {
+            name: [example, example, ...]
+        }
     }
-    """
-    # First get the language
-    language = (
-        db.query(Language).filter(Language.language_code == language_code).first()
-    )
-
-    if not language:
-        return {}
 
-    result = {}
+    Languages are filtered in SQL and examples keep their insertion order.
+    Rows are read as plain tuples.
+    """
+    source = NLU_EXAMPLE_SOURCES[kind]
 
-    # Query intents with their localizations and examples
-    intents = (
-        db.query(Intent)
-        .options(
-            joinedload(Intent.localizations).joinedload(IntentLocalization.examples)
+    query = (
+        source.select(
+            Language.language_code,
+            source.name_column,
+            source.example.example,
+        )
+        .join(Language, Language.id == source.language_column)
+        .where(source.owner.version_id == version_id)
+        .order_by(
+            Language.language_code,
+            source.name_column,
+            source.owner.id,
+            *source.example_order,
         )
-        .filter(Intent.version_id == version_id)
-        .all()
     )
+    if language_codes is not None:
+        query = query.where(Language.language_code.in_(language_codes))
 
-    for intent in intents:
-        # Find localization for this language
-        for localization in intent.localizations:
-            if localization.language_id == language.id:
-                examples = [ex.example for ex in localization.examples]
-                if examples:
-                    result[intent.intent_name] = examples
-                break
+    result = {}
+    for language_code, name, example in db.execute(query).tuples():
+        result.setdefault(language_code, {}).setdefault(name, []).append(example)
 
     return result
 
 
-def fetch_regexes(db: Session, version_id: str, language_code: str) -> dict:
+def fetch_intents(db: Session, version_id: str, language_code: str) -> dict:
     """
     Returns:
     {
-        regex_name: [pattern, pattern, ...]
+        intent_name: [example, example, ...]
     }
     """
-    language = (
-        db.query(Language).filter(Language.language_code == language_code).first()
+    return fetch_nlu_examples(db, version_id, "intent", [language_code]).get(
+        language_code, {}
     )
 
-    if not language:
-        return {}
-
-    result = {}
 
-    regexes = (
-        db.query(Regex)
-        .options(joinedload(Regex.examples))
-        .filter(Regex.version_id == version_id)
-        .all()
+def fetch_regexes(db: Session, version_id: str, language_code: str) -> dict:
+    """
+    Returns:
+    {
+        regex_name: [pattern, pattern, ...]
+    }
+    """
+    return fetch_nlu_examples(db, version_id, "regex", [language_code]).get(
+        language_code, {}
     )
 
-    for regex in regexes:
-        examples = [
-            ex.example for ex in regex.examples if ex.language_id == language.id
-        ]
-        if examples:
-            result[regex.regex_name] = examples
-
-    return result
-
 
 def fetch_lookups(db: Session, version_id: str, language_code: str) -> dict:
     """
@@ -104,31 +165,10 @@ def fetch_lookups(db: Session, version_id: str, language_code: str) -> dict:
         lookup_name: [value, value, ...]
     }
     """
-    language = (
-        db.query(Language).filter(Language.language_code == language_code).first()
-    )
-
-    if not language:
-        return {}
-
-    result = {}
-
-    lookups = (
-        db.query(Lookup)
-        .options(joinedload(Lookup.examples))
-        .filter(Lookup.version_id == version_id)
-        .all()
+    return fetch_nlu_examples(db, version_id, "lookup", [language_code]).get(
+        language_code, {}
     )
 
-    for lookup in lookups:
-        examples = [
-            ex.example for ex in lookup.examples if ex.language_id == language.id
-        ]
-        if examples:
-            result[lookup.lookup_name] = examples
-
-    return result
-
 
 def fetch_synonyms(db: Session, version_id: str, language_code: str) -> dict:
     """
@@ -137,29 +177,10 @@ def fetch_synonyms(db: Session, version_id: str, language_code: str) -> dict:
         canonical_value: [synonym, synonym, ...]
     }
     """
-    language = (
-        db.query(Language).filter(Language.language_code == language_code).first()
+    return fetch_nlu_examples(db, version_id, "synonym", [language_code]).get(
+        language_code, {}
     )
 
-    if not language:
-        return {}
-
-    result = {}
-
-    synonyms = (
-        db.query(Synonym)
-        .options(joinedload(Synonym.examples))
-        .filter(Synonym.version_id == version_id)
-        .all()
-    )
-
-    for syn in synonyms:
-        examples = [ex.example for ex in syn.examples if ex.language_id == language.id]
-        if examples:
-            result[syn.canonical_value] = examples
-
-    return result
-
 
 # -------------------------------------------------
 # STORY QUERIES
@@ -0,0 +1,255 @@
+"""
+Flat loaders for stories and rules.
+
+Eager-loading the step relationships joins one-to-many collections
+(slot events, entity annotations, conditions) into a single result set,
+so the rows grow as steps x slot events x entities and have to be
+de-duplicated again in Python. Here each table is read once for the whole
+version with a flat query, every query ordered by the same story (rule)
+order. The rows of one story are then taken from each query in turn and
+assembled in memory, so only one story is held at a time.
+
+Steps, slot events, entity annotations and conditions are plain Core rows;
+steps carry `intent_name`, `action_name`, `response_name` and `form_name`
+instead of the related objects.
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterator, List, Tuple
+
+from sqlalchemy import literal_column, select
+from sqlalchemy.orm import Session
+
+from app.models import (
+    Action,
+    Entity,
+    Form,
+    Intent,
+    Response,
+    Rule,
+    RuleCondition,
+    RuleSlotEvent,
+    RuleStep,
+    Slot,
+    Story,
+    StorySlotEvent,
+    StoryStep,
+)
+from app.models.rule import RuleStepEntity
+from app.models.story import StoryStepEntity
+from app.utils.partitions import OrderedPartitions
+
+
+YIELD_PER = 2000
+
+
+def _ctid(model):
+    """Physical row order, used to keep insertion order when created_at ties."""
+    return literal_column(f"{model.__tablename__}.ctid")
+
+
+def _stream(db: Session, query) -> Iterator[tuple]:
+    # Plain Core rows; the ORM row processing is not needed for tuples.
+    return db.connection().execution_options(yield_per=YIELD_PER).execute(query)
+
+
+def _by_step(rows: Iterator[tuple]) -> Dict[str, List[tuple]]:
+    grouped = defaultdict(list)
+    for row in rows:
+        grouped[row.step_id].append(row)
+    return grouped
+
+
+class _FlowTables:
+    """The tables that make up stories or rules."""
+
+    def __init__(
+        self,
+        owner,
+        step,
+        step_owner,
+        step_order,
+        slot_event,
+        slot_event_step,
+        step_entity,
+        step_entity_step,
+    ):
+        self.owner = owner
+        self.step = step
+        self.step_owner = step_owner
+        self.step_order = step_order
+        self.slot_event = slot_event
+        self.slot_event_step = slot_event_step
+        self.step_entity = step_entity
+        self.step_entity_step = step_entity_step
+
+
+_STORY_TABLES = _FlowTables(
+    Story, StoryStep, StoryStep.story_id,
+    (StoryStep.timeline_index, StoryStep.step_order),
+    StorySlotEvent, StorySlotEvent.story_step_id,
+    StoryStepEntity, StoryStepEntity.story_step_id,
+)
+
+_RULE_TABLES = _FlowTables(
+    Rule, RuleStep, RuleStep.rule_id,
+    (RuleStep.step_order,),
+    RuleSlotEvent, RuleSlotEvent.rule_step_id,
+    RuleStepEntity, RuleStepEntity.rule_step_id,
+)
+
+
+def _owners(db: Session, tables: _FlowTables, version_id: str) -> List[tuple]:
+    owner = tables.owner
+    return db.execute(
+        select(owner.id, owner.name)
+        .where(owner.version_id == version_id)
+        .order_by(owner.name, owner.id)
+    ).all()
+
+
+def _partitions(
+    db: Session,
+    tables: _FlowTables,
+    version_id: str,
+    positions: Dict[str, int],
+) -> Tuple[OrderedPartitions, OrderedPartitions, OrderedPartitions]:
+    """
+    Steps, slot events and entity annotations of a version, one query
+    each, ordered by owner. The first column of every row is the owner id.
+    """
+    owner, step = tables.owner, tables.step
+    owner_order = (owner.name, owner.id)
+
+    def position(row):
+        # Owners created after the owner list was read belong to nothing.
+        return positions.get(row[0], -1)
+
+    # -------------------------------------------------
+    # STEPS
+    # -------------------------------------------------
+    steps = (
+        select(
+            tables.step_owner.label("owner_id"),
+            step.__table__,
+            Intent.intent_name,
+            Action.name.label("action_name"),
+            Response.name.label("response_name"),
+            Form.name.label("form_name"),
+        )
+        .select_from(step)
+        .join(owner, owner.id == tables.step_owner)
+        .outerjoin(Intent, Intent.id == step.intent_id)
+        .outerjoin(Action, Action.id == step.action_id)
+        .outerjoin(Response, Response.id == step.response_id)
+        .outerjoin(Form, Form.id == step.form_id)
+        .where(owner.version_id == version_id)
+        .order_by(*owner_order, *tables.step_order, step.created_at, _ctid(step))
+    )
+
+    # -------------------------------------------------
+    # SLOT EVENTS
+    # -------------------------------------------------
+    slot_event = tables.slot_event
+    slot_events = (
+        select(
+            tables.step_owner.label("owner_id"),
+            tables.slot_event_step.label("step_id"),
+            Slot.name.label("slot_name"),
+            slot_event.value,
+        )
+        .select_from(slot_event)
+        .join(step, step.id == tables.slot_event_step)
+        .join(owner, owner.id == tables.step_owner)
+        .outerjoin(Slot, Slot.id == slot_event.slot_id)
+        .where(owner.version_id == version_id)
+        .order_by(*owner_order, slot_event.created_at, _ctid(slot_event))
+    )
+
+    # -------------------------------------------------
+    # ENTITY ANNOTATIONS
+    # -------------------------------------------------
+    step_entity = tables.step_entity
+    entities = (
+        select(
+            tables.step_owner.label("owner_id"),
+            tables.step_entity_step.label("step_id"),
+            Entity.entity_key,
+            step_entity.value,
+        )
+        .select_from(step_entity)
+        .join(step, step.id == tables.step_entity_step)
+        .join(owner, owner.id == tables.step_owner)
+        .join(Entity, Entity.id == step_entity.entity_id)
+        .where(owner.version_id == version_id)
+        .order_by(*owner_order, step_entity.created_at, _ctid(step_entity))
+    )
+
+    return (
+        OrderedPartitions(_stream(db, steps), position),
+        OrderedPartitions(_stream(db, slot_events), position),
+        OrderedPartitions(_stream(db, entities), position),
+    )
+
+
+def iter_story_rows(
+    db: Session, version_id: str
+) -> Iterator[Tuple[str, List[tuple], Dict[str, list], Dict[str, list]]]:
+    """
+    Yield (story name, steps, slot events by step id, entities by step id)
+    for every story of a VERSION, ordered by name. Steps are ordered by
+    timeline_index, then step_order.
+    """
+    stories = _owners(db, _STORY_TABLES, version_id)
+    positions = {story_id: index for index, (story_id, _) in enumerate(stories)}
+    steps, slot_events, entities = _partitions(db, _STORY_TABLES, version_id, positions)
+
+    for index, (_, name) in enumerate(stories):
+        yield (
+            name,
+            list(steps.take(index)),
+            _by_step(slot_events.take(index)),
+            _by_step(entities.take(index)),
+        )
+
+
+def iter_rule_rows(
+    db: Session, version_id: str
+) -> Iterator[Tuple[str, List[tuple], List[tuple], Dict[str, list], Dict[str, list]]]:
+    """
+    Yield (rule name, conditions, steps, slot events by step id, entities
+    by step id) for every rule of a VERSION, ordered by name. Conditions are
+    ordered by order_index and steps by step_order.
+    """
+    rules = _owners(db, _RULE_TABLES, version_id)
+    positions = {rule_id: index for index, (rule_id, _) in enumerate(rules)}
+    steps, slot_events, entities = _partitions(db, _RULE_TABLES, version_id, positions)
+
+    # -------------------------------------------------
+    # CONDITIONS
+    # -------------------------------------------------
+    conditions = OrderedPartitions(
+        _stream(
+            db,
+            select(RuleCondition.rule_id.label("owner_id"), RuleCondition.__table__)
+            .join(Rule, Rule.id == RuleCondition.rule_id)
+            .where(Rule.version_id == version_id)
+            .order_by(
+                Rule.name,
+                Rule.id,
+                RuleCondition.order_index,
+                RuleCondition.created_at,
+                _ctid(RuleCondition),
+            ),
+        ),
+        lambda row: positions.get(row[0], -1),
+    )
+
+    for index, (_, name) in enumerate(rules):
+        yield (
+            name,
+            list(conditions.take(index)),
+            list(steps.take(index)),
+            _by_step(slot_events.take(index)),
+            _by_step(entities.take(index)),
+        )
@@ -1,159 +1,193 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
 from fastapi import HTTPException
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import case, func, literal, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session
 
 from app.models import (
     Intent,
     IntentLocalization,
     IntentExample,
-    Regex,
-    RegexExample,
-    Lookup,
-    LookupExample,
-    Synonym,
-    SynonymExample,
     Language,
 )
 
+from app.utils.export_queries import NLU_EXAMPLE_SOURCES, NluExampleSource
+from app.utils.partitions import OrderedPartitions
+from app.utils.yaml_stream import stream_yaml_list
+
 MIN_INTENT_EXAMPLES = 10
+YIELD_PER = 500
 
 
-def export_nlu_yaml(db: Session, version_id: str, language_code: str) -> dict:
+def _find_invalid_languages(
+    db: Session, version_id: str, language_ids: List[str]
+) -> Dict[str, str]:
     """
-    Export Rasa nlu.yml for a single VERSION + LANGUAGE
+    Check example counts per intent for every language with one grouped
+    query. Returns {language_id: error message} for languages that cannot
+    be exported.
     """
-
-    # -------------------------------------------------
-    # LANGUAGE
-    # -------------------------------------------------
-    language = (
-        db.query(Language).filter(Language.language_code == language_code).first()
-    )
-    if not language:
-        raise HTTPException(404, f"Language '{language_code}' not found")
-
-    nlu_blocks = []
-
-    # -------------------------------------------------
-    # INTENTS
-    # -------------------------------------------------
-    intents = (
-        db.query(Intent)
-        .options(
-            joinedload(Intent.localizations).joinedload(IntentLocalization.examples)
+    counts = db.execute(
+        select(
+            IntentLocalization.language_id,
+            Intent.intent_name,
+            func.count(IntentExample.id),
         )
-        .filter(Intent.version_id == version_id)
+        .join(IntentLocalization, IntentLocalization.intent_id == Intent.id)
+        .join(
+            IntentExample,
+            IntentExample.intent_localization_id == IntentLocalization.id,
+        )
+        .where(
+            Intent.version_id == version_id,
+            IntentLocalization.language_id.in_(language_ids),
+        )
+        .group_by(IntentLocalization.language_id, Intent.id, Intent.intent_name)
         .order_by(Intent.intent_name)
-        .all()
     )
 
-    for intent in intents:
-        # Find localization for this language
-        localization = None
-        for loc in intent.localizations:
-            if loc.language_id == language.id:
-                localization = loc
-                break
-
-        if not localization:
-            continue
-
-        examples = localization.examples
-        if not examples:
-            continue
-
-        if len(examples) < MIN_INTENT_EXAMPLES:
-            raise HTTPException(
-                400,
-                f"Intent '{intent.intent_name}' has only {len(examples)} examples. "
-                f"Minimum required is {MIN_INTENT_EXAMPLES}.",
+    errors = {}
+    found = set()
+    for language_id, intent_name, example_count in counts:
+        found.add(language_id)
+        if example_count < MIN_INTENT_EXAMPLES and language_id not in errors:
+            errors[language_id] = (
+                f"Intent '{intent_name}' has only {example_count} examples. "
+                f"Minimum required is {MIN_INTENT_EXAMPLES}."
             )
 
-        # Sort by created_at
-        sorted_examples = sorted(examples, key=lambda e: e.created_at)
+    for language_id in language_ids:
+        if language_id not in found:
+            errors[language_id] = "No NLU data found for export"
 
-        nlu_blocks.append(
-            {
-                "intent": intent.intent_name,
-                "examples": "\n".join(f"- {e.example}" for e in sorted_examples),
-            }
-        )
+    return errors
 
-    if not nlu_blocks:
-        raise HTTPException(400, "No NLU data found for export")
 
-    # -------------------------------------------------
-    # REGEX FEATURES
-    # -------------------------------------------------
-    regexes = (
-        db.query(Regex)
-        .options(joinedload(Regex.examples))
-        .filter(Regex.version_id == version_id)
-        .order_by(Regex.regex_name)
-        .all()
-    )
+def _example_groups(rows: Iterable[tuple], group_key: str) -> Iterator[dict]:
+    """
+    Turn (position, owner name, joined examples) rows into
+    {group_key: name, "examples": "- ..."} blocks.
+    """
+    for _, name, examples in rows:
+        yield {group_key: name, "examples": f"- {examples}"}
 
-    for regex in regexes:
-        examples = [ex for ex in regex.examples if ex.language_id == language.id]
 
-        if examples:
-            sorted_examples = sorted(examples, key=lambda e: e.created_at)
-            nlu_blocks.append(
-                {
-                    "regex": regex.regex_name,
-                    "examples": "\n".join(f"- {e.example}" for e in sorted_examples),
-                }
-            )
+def _partitioned_examples(
+    db: Session,
+    source: NluExampleSource,
+    version_id: str,
+    positions: Dict[str, int],
+) -> OrderedPartitions:
+    """
+    One query for the examples of every requested language, one row per
+    owner and language, ordered by language position, then owner name.
 
-    # -------------------------------------------------
-    # LOOKUP TABLES
-    # -------------------------------------------------
-    lookups = (
-        db.query(Lookup)
-        .options(joinedload(Lookup.examples))
-        .filter(Lookup.version_id == version_id)
-        .order_by(Lookup.lookup_name)
-        .all()
+    The examples of an owner are joined into the "- ..." list by the
+    database, in insertion order, so only one row per owner crosses the
+    wire instead of one per example.
+    """
+    language_column = source.language_column
+    position = case(positions, value=language_column)
+    examples = func.string_agg(
+        source.example.example,
+        aggregate_order_by(literal("\n- "), *source.example_order),
     )
 
-    for lookup in lookups:
-        examples = [ex for ex in lookup.examples if ex.language_id == language.id]
+    query = (
+        source.select(position, source.name_column, examples)
+        .where(
+            source.owner.version_id == version_id,
+            language_column.in_(list(positions)),
+        )
+        .group_by(language_column, source.owner.id)
+        .order_by(position, source.name_column, source.owner.id)
+    )
+    # Plain Core rows; the ORM row processing is not needed for tuples.
+    rows = db.connection().execution_options(yield_per=YIELD_PER).execute(query)
+    return OrderedPartitions(rows)
 
-        if examples:
-            sorted_examples = sorted(examples, key=lambda e: e.created_at)
-            nlu_blocks.append(
-                {
-                    "lookup": lookup.lookup_name,
-                    "examples": "\n".join(f"- {e.example}" for e in sorted_examples),
-                }
-            )
+
+def iter_nlu_languages(
+    db: Session, version_id: str, language_codes: List[str]
+) -> Iterator[Tuple[str, Iterator[dict]]]:
+    """
+    Yield (language_code, blocks) for several languages of a VERSION, in the
+    given order.
+
+    Intents, regexes, lookups and synonyms are each read with one query for
+    all languages, partitioned by language while streaming, so the cost does
+    not grow with the number of round trips. The blocks of a language raise
+    HTTPException once iterated if that language cannot be exported; they
+    must be consumed before moving on to the next language.
+    """
 
     # -------------------------------------------------
-    # SYNONYMS
+    # LANGUAGES
     # -------------------------------------------------
-    synonyms = (
-        db.query(Synonym)
-        .options(joinedload(Synonym.examples))
-        .filter(Synonym.version_id == version_id)
-        .order_by(Synonym.canonical_value)
+    language_ids = dict(
+        db.query(Language.language_code, Language.id)
+        .filter(Language.language_code.in_(language_codes))
         .all()
     )
+    positions = {
+        language_ids[code]: index
+        for index, code in enumerate(language_codes)
+        if code in language_ids
+    }
+    errors = _find_invalid_languages(db, version_id, list(positions))
+    exported = {
+        language_id: position
+        for language_id, position in positions.items()
+        if language_id not in errors
+    }
 
-    for synonym in synonyms:
-        examples = [ex for ex in synonym.examples if ex.language_id == language.id]
+    partitions = []
+    if exported:
+        partitions = [
+            (kind, _partitioned_examples(db, source, version_id, exported))
+            for kind, source in NLU_EXAMPLE_SOURCES.items()
+        ]
 
-        if examples:
-            sorted_examples = sorted(examples, key=lambda e: e.created_at)
-            nlu_blocks.append(
-                {
-                    "synonym": synonym.canonical_value,
-                    "examples": "\n".join(f"- {e.example}" for e in sorted_examples),
-                }
-            )
+    def blocks(code: str, language_id: Optional[str]) -> Iterator[dict]:
+        if language_id is None:
+            raise HTTPException(404, f"Language '{code}' not found")
+        if language_id in errors:
+            raise HTTPException(400, errors[language_id])
 
-    # -------------------------------------------------
-    # FINAL YAML STRUCTURE
-    # -------------------------------------------------
-    return {
-        "version": "3.1",
-        "nlu": nlu_blocks,
-    }
+        for group_key, partition in partitions:
+            yield from _example_groups(partition.take(exported[language_id]), group_key)
+
+    for code in language_codes:
+        yield code, blocks(code, language_ids.get(code))
+
+
+def iter_nlu_blocks(db: Session, version_id: str, language_code: str) -> Iterator[dict]:
+    """
+    Yield the nlu.yml blocks of a VERSION + LANGUAGE one at a time,
+    streaming the example rows from the database.
+    """
+    for _, blocks in iter_nlu_languages(db, version_id, [language_code]):
+        yield from blocks
+
+
+def nlu_document(blocks: Iterable[dict]) -> dict:
+    return {"version": "3.1", "nlu": list(blocks)}
+
+
+def stream_nlu_document(blocks: Iterable[dict]) -> Iterator[str]:
+    return stream_yaml_list({"version": "3.1"}, "nlu", blocks)
+
+
+def export_nlu_yaml(db: Session, version_id: str, language_code: str) -> dict:
+    """
+    Export Rasa nlu.yml for a single VERSION + LANGUAGE
+    """
+    return nlu_document(iter_nlu_blocks(db, version_id, language_code))
+
+
+def stream_nlu_yaml(db: Session, version_id: str, language_code: str) -> Iterator[str]:
+    """
+    Stream Rasa nlu.yml text for a single VERSION + LANGUAGE
+    """
+    return stream_nlu_document(iter_nlu_blocks(db, version_id, language_code))
@@ -0,0 +1,34 @@
+from typing import Callable, Iterable, Iterator
+
+
+class OrderedPartitions:
+    """
+    Rows of one query ordered by an integer position, handed out one
+    position at a time. Rows of positions that are skipped or only partly
+    read are discarded when a later position is taken.
+
+    `position` maps a row to its position; rows mapped below the position
+    being taken (for example -1 for rows that belong to nothing requested)
+    are skipped.
+    """
+
+    def __init__(
+        self,
+        rows: Iterable[tuple],
+        position: Callable[[tuple], int] = lambda row: row[0],
+    ):
+        self._rows = iter(rows)
+        self._position = position
+        self._advance()
+
+    def _advance(self):
+        self._row = next(self._rows, None)
+        if self._row is not None:
+            self._row_position = self._position(self._row)
+
+    def take(self, position: int) -> Iterator[tuple]:
+        while self._row is not None and self._row_position < position:
+            self._advance()
+        while self._row is not None and self._row_position == position:
+            yield self._row
+            self._advance()
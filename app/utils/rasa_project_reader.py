@@ -0,0 +1,229 @@
+"""
+Reading a Rasa project (domain.yml + data/*.yml) for import.
+
+`RasaProjectFiles` lists the files of a project given as a ZIP archive
+(such as the one produced by the ZIP export) or as a directory. The
+archive may wrap everything in one top-level folder.
+
+Data files can be very large, so they are not loaded whole:
+`iter_yaml_sections` walks the parser events and builds one item of the
+`nlu`, `stories` and `rules` lists at a time. Memory is bounded by the
+largest single item (e.g. one intent's examples block), not by the file.
+libyaml is used when available, as for the export.
+"""
+
+import os
+import re
+import zipfile
+from typing import IO, Any, Callable, Iterable, Iterator, List, Tuple
+
+import yaml
+from yaml.events import (
+    AliasEvent,
+    MappingEndEvent,
+    MappingStartEvent,
+    ScalarEvent,
+    SequenceEndEvent,
+    SequenceStartEvent,
+    StreamEndEvent,
+)
+from yaml.nodes import MappingNode, ScalarNode, SequenceNode
+
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:  # libyaml not available
+    from yaml import SafeLoader as _Loader
+
+
+YAML_SUFFIXES = (".yml", ".yaml")
+STREAMED_KEYS = ("nlu", "stories", "rules")
+
+_DOMAIN_NAMES = ("domain.yml", "domain.yaml", "domain")
+_DOMAIN_PART = re.compile(r"(^|/)domain(\.ya?ml$|/)")
+
+
+class RasaProjectFiles:
+    """The domain and data files of a Rasa project, opened on demand."""
+
+    def __init__(self, names: Iterable[str], opener: Callable[[str], IO[bytes]]):
+        names = sorted(n for n in names if n.endswith(YAML_SUFFIXES))
+        self._open = opener
+
+        # The project root is the folder of the top-most domain file (or
+        # domain/ directory); without one, the archive root.
+        root = ""
+        domains = [n.split("/") for n in names if _DOMAIN_PART.search(n)]
+        if domains:
+            top = min(domains, key=len)
+            depth = next(i for i, part in enumerate(top) if part in _DOMAIN_NAMES)
+            root = "".join(f"{part}/" for part in top[:depth])
+
+        self.domain_files: List[str] = [
+            n
+            for n in names
+            if n == f"{root}domain.yml"
+            or n == f"{root}domain.yaml"
+            or n.startswith(f"{root}domain/")
+        ]
+        self.data_files: List[str] = [n for n in names if n.startswith(f"{root}data/")]
+
+    @classmethod
+    def from_zip(cls, archive: IO[bytes]) -> "RasaProjectFiles":
+        try:
+            zf = zipfile.ZipFile(archive)
+        except zipfile.BadZipFile:
+            raise ValueError("Not a ZIP archive")
+        names = [info.filename for info in zf.infolist() if not info.is_dir()]
+        return cls(names, zf.open)
+
+    @classmethod
+    def from_directory(cls, path: str) -> "RasaProjectFiles":
+        names = []
+        for folder, _, files in os.walk(path):
+            for name in files:
+                full = os.path.join(folder, name)
+                names.append(os.path.relpath(full, path).replace(os.sep, "/"))
+        return cls(names, lambda name: open(os.path.join(path, name), "rb"))
+
+    def open(self, name: str) -> IO[bytes]:
+        return self._open(name)
+
+
+def load_yaml(stream: IO[bytes]) -> Any:
+    """Load a whole (small) YAML document, e.g. a domain file."""
+    return yaml.load(stream, Loader=_Loader)
+
+
+def _compose(loader, anchors: dict):
+    """Build the node of the next value from parser events."""
+    event = loader.get_event()
+
+    if isinstance(event, AliasEvent):
+        if event.anchor not in anchors:
+            raise yaml.composer.ComposerError(
+                None, None, f"found undefined alias {event.anchor!r}", event.start_mark
+            )
+        return anchors[event.anchor]
+
+    tag = event.tag
+    if isinstance(event, ScalarEvent):
+        if tag is None or tag == "!":
+            tag = loader.resolve(ScalarNode, event.value, event.implicit)
+        node = ScalarNode(
+            tag, event.value, event.start_mark, event.end_mark, style=event.style
+        )
+    elif isinstance(event, SequenceStartEvent):
+        if tag is None or tag == "!":
+            tag = loader.resolve(SequenceNode, None, event.implicit)
+        node = SequenceNode(tag, [], event.start_mark, None)
+        while not loader.check_event(SequenceEndEvent):
+            node.value.append(_compose(loader, anchors))
+        node.end_mark = loader.get_event().end_mark
+    elif isinstance(event, MappingStartEvent):
+        if tag is None or tag == "!":
+            tag = loader.resolve(MappingNode, None, event.implicit)
+        node = MappingNode(tag, [], event.start_mark, None)
+        while not loader.check_event(MappingEndEvent):
+            key = _compose(loader, anchors)
+            node.value.append((key, _compose(loader, anchors)))
+        node.end_mark = loader.get_event().end_mark
+    else:
+        raise yaml.composer.ComposerError(
+            None, None, f"unexpected {type(event).__name__}", event.start_mark
+        )
+
+    if event.anchor is not None:
+        anchors[event.anchor] = node
+    return node
+
+
+def _anchored(event) -> bool:
+    """Whether the event starts a node that aliases may refer to later."""
+    return (
+        isinstance(event, (ScalarEvent, SequenceStartEvent, MappingStartEvent))
+        and event.anchor is not None
+    )
+
+
+def _skip(loader, anchors: dict) -> None:
+    """
+    Consume the events of the next value without building it. Anchored
+    nodes inside it are still built and registered in `anchors`.
+    """
+    depth = 0
+    while True:
+        if _anchored(loader.peek_event()):
+            _compose(loader, anchors)
+        else:
+            event = loader.get_event()
+            if isinstance(event, (SequenceStartEvent, MappingStartEvent)):
+                depth += 1
+            elif isinstance(event, (SequenceEndEvent, MappingEndEvent)):
+                depth -= 1
+        if depth == 0:
+            return
+
+
+def iter_yaml_sections(
+    stream: IO[bytes],
+    streamed_keys: Tuple[str, ...] = STREAMED_KEYS,
+    skipped_keys: Tuple[str, ...] = (),
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Yield the (key, value) pairs of a top-level YAML mapping. The lists
+    under `streamed_keys` are yielded item by item, as (key, item) pairs,
+    each item built only when reached. The values of `skipped_keys` are
+    parsed but not built, and yielded as (key, None). Anchored nodes are
+    always built, so that later aliases resolve; an anchored list under a
+    streamed key is built whole. Empty documents yield nothing.
+    """
+    loader = _Loader(stream)
+    try:
+        loader.get_event()  # StreamStart
+        if loader.check_event(StreamEndEvent):
+            return
+        loader.get_event()  # DocumentStart
+        if not loader.check_event(MappingStartEvent):
+            if loader.construct_document(_compose(loader, {})) is None:
+                return
+            raise ValueError("Expected a mapping at the top level")
+        loader.get_event()
+
+        anchors = {}
+        while not loader.check_event(MappingEndEvent):
+            key = loader.construct_document(_compose(loader, anchors))
+            if key in skipped_keys:
+                _skip(loader, anchors)
+                yield key, None
+            elif (
+                key in streamed_keys
+                and loader.check_event(SequenceStartEvent)
+                and not _anchored(loader.peek_event())
+            ):
+                loader.get_event()
+                while not loader.check_event(SequenceEndEvent):
+                    yield key, loader.construct_document(_compose(loader, anchors))
+                loader.get_event()
+            elif key in streamed_keys:
+                # An anchored list may be aliased later, so it is built whole.
+                value = loader.construct_document(_compose(loader, anchors))
+                if isinstance(value, list):
+                    for item in value:
+                        yield key, item
+                else:
+                    yield key, value
+            else:
+                yield key, loader.construct_document(_compose(loader, anchors))
+    finally:
+        loader.dispose()
+
+
+def split_examples(examples: Any) -> List[str]:
+    """The entries of an nlu.yml `examples: | - ...` block."""
+    if not isinstance(examples, str):
+        return []
+    return [
+        line.strip()[2:].strip()
+        for line in examples.splitlines()
+        if line.strip().startswith("- ")
+    ]
@@ -0,0 +1,77 @@
+"""
+Process-wide cache of (project_code, status) -> version id and
+language_code -> language id.
+
+Nearly every request starts by resolving these. Entries expire after
+RESOLVER_CACHE_TTL seconds and the least recently used are dropped past
+RESOLVER_CACHE_MAX_ENTRIES. A cached version id is only a hint: the
+resolver loads the version by primary key and checks its status, so an
+entry left stale by another worker (e.g. after a promotion) is detected
+and replaced. Promotion, rollback and project creation also invalidate
+the project's entries in this process directly.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from app.core.config import settings
+
+
+class TTLCache:
+    """Thread-safe LRU whose entries expire `ttl` seconds after being set."""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class ResolverCache:
+    def __init__(self, ttl: float, max_entries: int):
+        self.versions = TTLCache(ttl, max_entries)
+        self.languages = TTLCache(ttl, max_entries)
+
+    def invalidate_project(self, project_code: str):
+        for status in ("draft", "locked", "archived"):
+            self.versions.pop((project_code, status))
+
+    def clear(self):
+        self.versions.clear()
+        self.languages.clear()
+
+
+resolver_cache = ResolverCache(
+    settings.RESOLVER_CACHE_TTL, settings.RESOLVER_CACHE_MAX_ENTRIES
+)
@@ -9,91 +9,37 @@ Handles all rule components:
 - action steps can reference: custom actions, response utterances, forms
 """
 
-from sqlalchemy.orm import Session, joinedload
+from typing import Iterator
 
-from app.models import Rule, RuleCondition, RuleStep, RuleSlotEvent
-from app.models.rule import RuleStepEntity
+from sqlalchemy.orm import Session
 
+from app.utils.flow_loader import iter_rule_rows
+from app.utils.yaml_stream import stream_yaml_list
 
-def export_rules_yaml(db: Session, version_id: str) -> dict:
-    """
-    Export RASA rules.yml structure.
-
-    Returns a dict that can be serialized to YAML.
-
-    Example output:
-    ```yaml
-    version: "3.1"
-    rules:
-      - rule: greet user
-        steps:
-          - intent: greet
-          - action: utter_greet
-
-      - rule: user provides email
-        steps:
-          - intent: inform
-            entities:
-              - email: user@test.com
-          - slot_was_set:
-              - email: user@test.com
-          - action: utter_email_received
 
-      - rule: activate request form
-        steps:
-          - intent: request_duplicate_bill
-          - action: request_form
-          - active_loop: request_form
-
-      - rule: submit request form
-        condition:
-          - active_loop: request_form
-        steps:
-          - action: request_form
-          - active_loop: null
-          - slot_was_set:
-              - request_type: duplicate_bill
-          - action: utter_submit_request
-    ```
+def iter_rule_blocks(db: Session, version_id: str) -> Iterator[dict]:
+    """
+    Yield rules.yml entries one rule at a time. Each table is read once
+    for the whole version, see app.utils.flow_loader.
     """
 
-    rules_yaml = []
-
-    # Eager load all relationships
-    rules = (
-        db.query(Rule)
-        .options(
-            joinedload(Rule.conditions),
-            joinedload(Rule.steps).joinedload(RuleStep.intent),
-            joinedload(Rule.steps).joinedload(RuleStep.action),
-            joinedload(Rule.steps).joinedload(RuleStep.response),
-            joinedload(Rule.steps).joinedload(RuleStep.form),
-            joinedload(Rule.steps)
-            .joinedload(RuleStep.slot_events)
-            .joinedload(RuleSlotEvent.slot),
-            joinedload(Rule.steps)
-            .joinedload(RuleStep.entities)
-            .joinedload(RuleStepEntity.entity),
-        )
-        .filter(Rule.version_id == version_id)
-        .order_by(Rule.name)
-        .all()
-    )
-
-    for rule in rules:
+    for (
+        rule_name,
+        sorted_conditions,
+        sorted_steps,
+        slot_events,
+        entities,
+    ) in iter_rule_rows(db, version_id):
         rule_block = {
-            "rule": rule.name,
+            "rule": rule_name,
         }
 
         # -------------------------------------------------
         # CONDITIONS
         # -------------------------------------------------
-        if rule.conditions:
+        if sorted_conditions:
             conditions_yaml = []
 
-            # Sort conditions by order_index
-            sorted_conditions = sorted(rule.conditions, key=lambda c: c.order_index)
-
             for condition in sorted_conditions:
                 if condition.condition_type == "active_loop":
                     # active_loop can be null or a form name
@@ -118,24 +64,21 @@ def export_rules_yaml(db: Session, version_id: str) -> dict:
         # -------------------------------------------------
         steps_yaml = []
 
-        # Sort steps by step_order
-        sorted_steps = sorted(rule.steps, key=lambda s: s.step_order)
-
         for step in sorted_steps:
             # -------------------------
             # INTENT (with entities - NEW)
             # -------------------------
-            if step.step_type == "intent" and step.intent:
-                intent_block = {"intent": step.intent.intent_name}
+            if step.step_type == "intent" and step.intent_name is not None:
+                intent_block = {"intent": step.intent_name}
 
                 # Add entity annotations if present (NEW)
-                if step.entities:
+                if entities[step.id]:
                     entities_list = []
-                    for e in step.entities:
+                    for e in entities[step.id]:
                         if e.value is not None:
-                            entity_entry = {e.entity.entity_key: e.value}
+                            entity_entry = {e.entity_key: e.value}
                         else:
-                            entity_entry = e.entity.entity_key
+                            entity_entry = e.entity_key
                         entities_list.append(entity_entry)
 
                     if entities_list:
@@ -148,12 +91,12 @@ def export_rules_yaml(db: Session, version_id: str) -> dict:
             # -------------------------
             elif step.step_type == "action":
                 # Priority: action > response > form
-                if step.action:
-                    steps_yaml.append({"action": step.action.name})
-                elif step.response:
-                    steps_yaml.append({"action": step.response.name})
-                elif step.form:
-                    steps_yaml.append({"action": step.form.name})
+                if step.action_name is not None:
+                    steps_yaml.append({"action": step.action_name})
+                elif step.response_name is not None:
+                    steps_yaml.append({"action": step.response_name})
+                elif step.form_name is not None:
+                    steps_yaml.append({"action": step.form_name})
 
             # -------------------------
             # ACTIVE LOOP
@@ -168,9 +111,9 @@ def export_rules_yaml(db: Session, version_id: str) -> dict:
             elif step.step_type == "slot":
                 # FIXED: Use list format for slot_was_set
                 slot_list = []
-                for event in step.slot_events:
-                    if event.slot:
-                        slot_list.append({event.slot.name: event.value})
+                for event in slot_events[step.id]:
+                    if event.slot_name is not None:
+                        slot_list.append({event.slot_name: event.value})
 
                 if slot_list:
                     steps_yaml.append({"slot_was_set": slot_list})
@@ -178,9 +121,62 @@ def export_rules_yaml(db: Session, version_id: str) -> dict:
         # Only add rule if it has steps (Rasa requirement)
         if steps_yaml:
             rule_block["steps"] = steps_yaml
-            rules_yaml.append(rule_block)
+            yield rule_block
 
+
+def export_rules_yaml(db: Session, version_id: str) -> dict:
+    """
+    Export RASA rules.yml structure.
+
+    Returns a dict that can be serialized to YAML.
+
+    Example output:
+    ```yaml
+    version: "3.1"
+    rules:
+      - rule: greet user
+        steps:
+          - intent: greet
+          - action: utter_greet
+
+      - rule: user provides email
+        steps:
+          - intent: inform
+            entities:
+              - email: user@test.com
+          - slot_was_set:
+              - email: user@test.com
+          - action: utter_email_received
+
+      - rule: activate request form
+        steps:
+          - intent: request_duplicate_bill
+          - action: request_form
+          - active_loop: request_form
+
+      - rule: submit request form
+        condition:
+          - active_loop: request_form
+        steps:
+          - action: request_form
+          - active_loop: null
+          - slot_was_set:
+              - request_type: duplicate_bill
+          - action: utter_submit_request
+    ```
+    """
     return {
         "version": "3.1",
-        "rules": rules_yaml,
+        "rules": list(iter_rule_blocks(db, version_id)),
     }
+
+
+def stream_rules_yaml(db: Session, version_id: str) -> Iterator[str]:
+    """
+    Stream RASA rules.yml text.
+    """
+    return stream_yaml_list(
+        {"version": "3.1"},
+        "rules",
+        iter_rule_blocks(db, version_id),
+    )
@@ -11,69 +11,33 @@ Handles all story step types:
 - or (OR conditions for multiple intents - NEW)
 """
 
-from sqlalchemy.orm import Session, joinedload
+from typing import Iterator
+
+from sqlalchemy.orm import Session
 from collections import defaultdict
 
-from app.models import Story, StoryStep, StorySlotEvent
-from app.models.story import StoryStepEntity
+from app.utils.flow_loader import iter_story_rows
+from app.utils.yaml_stream import stream_yaml_list
 
 
-def export_stories_yaml(db: Session, version_id: str) -> dict:
-    """
-    Export RASA stories.yml structure.
+def _entities_yaml(entities: list) -> list:
+    return [
+        {e.entity_key: e.value} if e.value is not None else e.entity_key
+        for e in entities
+    ]
 
-    Returns a dict that can be serialized to YAML.
 
-    Example output:
-    ```yaml
-    version: "3.1"
-    stories:
-      - story: greet and request
-        steps:
-          - intent: greet
-          - action: utter_greet
-          - intent: inform
-            entities:
-              - city: Delhi
-          - slot_was_set:
-              - city: Delhi
-          - or:
-              - intent: affirm
-              - intent: deny
-          - action: utter_acknowledge
-    ```
+def iter_story_blocks(db: Session, version_id: str) -> Iterator[dict]:
+    """
+    Yield stories.yml entries one story at a time. Each table is read once
+    for the whole version, see app.utils.flow_loader.
     """
 
-    stories_yaml = []
-
-    # Eager load all relationships
-    stories = (
-        db.query(Story)
-        .options(
-            joinedload(Story.steps).joinedload(StoryStep.intent),
-            joinedload(Story.steps).joinedload(StoryStep.action),
-            joinedload(Story.steps).joinedload(StoryStep.response),
-            joinedload(Story.steps).joinedload(StoryStep.form),
-            joinedload(Story.steps)
-            .joinedload(StoryStep.slot_events)
-            .joinedload(StorySlotEvent.slot),
-            joinedload(Story.steps)
-            .joinedload(StoryStep.entities)
-            .joinedload(StoryStepEntity.entity),
-        )
-        .filter(Story.version_id == version_id)
-        .order_by(Story.name)
-        .all()
-    )
-
-    for story in stories:
+    for story_name, sorted_steps, slot_events, entities in iter_story_rows(
+        db, version_id
+    ):
         steps_yaml = []
 
-        # Sort steps by timeline_index then step_order
-        sorted_steps = sorted(
-            story.steps, key=lambda s: (s.timeline_index, s.step_order)
-        )
-
         # Group OR steps by or_group_id
         or_groups = defaultdict(list)
         processed_or_groups = set()
@@ -92,20 +56,12 @@ def export_stories_yaml(db: Session, version_id: str) -> dict:
                     or_steps = or_groups[step.or_group_id]
                     or_block = []
                     for or_step in or_steps:
-                        if or_step.intent:
-                            intent_block = {"intent": or_step.intent.intent_name}
+                        if or_step.intent_name is not None:
+                            intent_block = {"intent": or_step.intent_name}
                             # Add entity annotations if present
-                            if or_step.entities:
-                                entities_list = []
-                                for e in or_step.entities:
-                                    if e.value is not None:
-                                        entities_list.append(
-                                            {e.entity.entity_key: e.value}
-                                        )
-                                    else:
-                                        entities_list.append(e.entity.entity_key)
-                                if entities_list:
-                                    intent_block["entities"] = entities_list
+                            entities_list = _entities_yaml(entities[or_step.id])
+                            if entities_list:
+                                intent_block["entities"] = entities_list
                             or_block.append(intent_block)
 
                     if or_block:
@@ -116,21 +72,13 @@ def export_stories_yaml(db: Session, version_id: str) -> dict:
             # -------------------------
             # INTENT (with entities - NEW)
             # -------------------------
-            if step.step_type == "intent" and step.intent:
-                intent_block = {"intent": step.intent.intent_name}
+            if step.step_type == "intent" and step.intent_name is not None:
+                intent_block = {"intent": step.intent_name}
 
                 # Add entity annotations if present (NEW)
-                if step.entities:
-                    entities_list = []
-                    for e in step.entities:
-                        if e.value is not None:
-                            entity_entry = {e.entity.entity_key: e.value}
-                        else:
-                            entity_entry = e.entity.entity_key
-                        entities_list.append(entity_entry)
-
-                    if entities_list:
-                        intent_block["entities"] = entities_list
+                entities_list = _entities_yaml(entities[step.id])
+                if entities_list:
+                    intent_block["entities"] = entities_list
 
                 steps_yaml.append(intent_block)
 
@@ -139,12 +87,12 @@ def export_stories_yaml(db: Session, version_id: str) -> dict:
             # -------------------------
             elif step.step_type == "action":
                 # Priority: action > response > form
-                if step.action:
-                    steps_yaml.append({"action": step.action.name})
-                elif step.response:
-                    steps_yaml.append({"action": step.response.name})
-                elif step.form:
-                    steps_yaml.append({"action": step.form.name})
+                if step.action_name is not None:
+                    steps_yaml.append({"action": step.action_name})
+                elif step.response_name is not None:
+                    steps_yaml.append({"action": step.response_name})
+                elif step.form_name is not None:
+                    steps_yaml.append({"action": step.form_name})
 
             # -------------------------
             # ACTIVE LOOP
@@ -158,9 +106,9 @@ def export_stories_yaml(db: Session, version_id: str) -> dict:
             # -------------------------
             elif step.step_type == "slot":
                 slot_list = []
-                for event in step.slot_events:
-                    if event.slot:
-                        slot_list.append({event.slot.name: event.value})
+                for event in slot_events[step.id]:
+                    if event.slot_name is not None:
+                        slot_list.append({event.slot_name: event.value})
 
                 if slot_list:
                     steps_yaml.append({"slot_was_set": slot_list})
@@ -174,14 +122,49 @@ def export_stories_yaml(db: Session, version_id: str) -> dict:
 
         # Rasa requires at least one step
         if steps_yaml:
-            stories_yaml.append(
-                {
-                    "story": story.name,
-                    "steps": steps_yaml,
-                }
-            )
+            yield {
+                "story": story_name,
+                "steps": steps_yaml,
+            }
+
+
+def export_stories_yaml(db: Session, version_id: str) -> dict:
+    """
+    Export RASA stories.yml structure.
+
+    Returns a dict that can be serialized to YAML.
 
+    Example output:
+    ```yaml
+    version: "3.1"
+    stories:
+      - story: greet and request
+        steps:
+          - intent: greet
+          - action: utter_greet
+          - intent: inform
+            entities:
+              - city: Delhi
+          - slot_was_set:
+              - city: Delhi
+          - or:
+              - intent: affirm
+              - intent: deny
+          - action: utter_acknowledge
+    ```
+    """
     return {
         "version": "3.1",
-        "stories": stories_yaml,
+        "stories": list(iter_story_blocks(db, version_id)),
     }
+
+
+def stream_stories_yaml(db: Session, version_id: str) -> Iterator[str]:
+    """
+    Stream RASA stories.yml text.
+    """
+    return stream_yaml_list(
+        {"version": "3.1"},
+        "stories",
+        iter_story_blocks(db, version_id),
+    )
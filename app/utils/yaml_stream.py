@@ -0,0 +1,169 @@
+"""
+YAML emitter for Rasa export files.
+
+Export documents are a small header followed by one long list (nlu,
+stories, rules) or a handful of top-level sections (domain). PyYAML does
+not indent block sequences nested in a mapping, so dumping list items on
+their own produces exactly the lines `yaml.dump` would write for them inside
+the full document. That lets the files be emitted block by block while the
+rows are still being fetched, with output identical to dumping the whole
+dict at once. The one exception is the document end marker (`...`) PyYAML
+writes after a `|+` scalar: it is dropped from the blocks and written once
+at the end of the file, which loads to the same data.
+
+libyaml (CDumper) is used when available. It writes a few strings
+differently from the pure-Python emitter: characters outside the BMP, NEL
+and the Unicode line/paragraph separators, and long quoted scalars that get
+folded at the line width. Batches containing such strings are dumped with
+the pure-Python emitter, so the output never depends on whether libyaml is
+installed.
+"""
+
+import re
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, Tuple
+
+import yaml
+
+try:
+    from yaml import CDumper as _FastDumper
+except ImportError:  # libyaml not available
+    _FastDumper = None
+
+
+BATCH_SIZE = 200
+WIDTH = 1000
+
+# Scalars longer than this may be folded, which libyaml does differently.
+FOLD_SAFE_LENGTH = WIDTH // 4
+
+_C_UNSAFE_CHARS = re.compile("[\x85\u2028\u2029\ufeff\U00010000-\U0010ffff]")
+
+# Anything that stops a string from being written as a literal block: special
+# characters (as judged by the emitter with allow_unicode) or a space before a
+# line break. A trailing space is checked separately.
+_NOT_LITERAL = re.compile(
+    "[^\n\x20-\x7e\x85\xa0-\ud7ff\ue000-\ufefe\uff00-\ufffd\U00010000-\U0010fffe]"
+    "| [\n\x85\u2028\u2029]"
+)
+
+
+class RasaDumper(yaml.Dumper):
+    pass
+
+
+if _FastDumper is not None:
+
+    class RasaFastDumper(_FastDumper):
+        pass
+
+else:
+    RasaFastDumper = None
+
+
+def _str_representer(dumper, data):
+    if "\n" in data:
+        return dumper.represent_scalar("tag:yaml.org,2002:str", data, style="|")
+    return dumper.represent_scalar("tag:yaml.org,2002:str", data)
+
+
+RasaDumper.add_representer(str, _str_representer)
+if RasaFastDumper is not None:
+    RasaFastDumper.add_representer(str, _str_representer)
+
+
+def _is_c_safe(value: str) -> bool:
+    if _C_UNSAFE_CHARS.search(value):
+        return False
+    if len(value) <= FOLD_SAFE_LENGTH:
+        return True
+    # Literal blocks are never folded.
+    return (
+        "\n" in value
+        and not value.endswith(" ")
+        and not _NOT_LITERAL.search(value)
+    )
+
+
+def _strings(data: Any) -> Iterator[str]:
+    if isinstance(data, str):
+        yield data
+    elif isinstance(data, dict):
+        for key, value in data.items():
+            yield from _strings(key)
+            yield from _strings(value)
+    elif isinstance(data, (list, tuple)):
+        for item in data:
+            yield from _strings(item)
+
+
+def dump_yaml(data: Any) -> str:
+    dumper = RasaDumper
+    if RasaFastDumper is not None and all(map(_is_c_safe, _strings(data))):
+        dumper = RasaFastDumper
+
+    return yaml.dump(
+        data,
+        Dumper=dumper,
+        default_flow_style=False,
+        allow_unicode=True,
+        sort_keys=False,
+        width=WIDTH,
+    )
+
+
+# Written after a document whose last block scalar keeps its trailing line
+# breaks (`|+`). It may only appear at the very end of the file.
+DOCUMENT_END = "...\n"
+
+
+def _one_document(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Concatenate chunks dumped as separate documents into one. The document
+    end markers PyYAML writes after open-ended scalars are dropped and a
+    single one is written at the end, where `yaml.dump` of the whole
+    document writes it.
+    """
+    open_ended = False
+    for chunk in chunks:
+        if chunk == DOCUMENT_END or chunk.endswith("\n" + DOCUMENT_END):
+            chunk = chunk[: -len(DOCUMENT_END)]
+            open_ended = True
+        yield chunk
+    if open_ended:
+        yield DOCUMENT_END
+
+
+def stream_yaml_list(
+    header: Dict[str, Any],
+    key: str,
+    items: Iterable[Any],
+    batch_size: int = BATCH_SIZE,
+) -> Iterator[str]:
+    """
+    Emit `{**header, key: list(items)}` as YAML without materialising the
+    list. Items are dumped in batches as they arrive.
+    """
+    return _one_document(_list_chunks(header, key, items, batch_size))
+
+
+def _list_chunks(header, key, items, batch_size) -> Iterator[str]:
+    # Fetch the first batch before emitting anything, so errors raised while
+    # producing items surface before the first chunk.
+    items = iter(items)
+    batch = list(islice(items, batch_size))
+
+    yield dump_yaml(header)
+    if not batch:
+        yield dump_yaml({key: []})
+        return
+
+    yield f"{key}:\n"
+    while batch:
+        yield dump_yaml(batch)
+        batch = list(islice(items, batch_size))
+
+
+def stream_yaml_sections(sections: Iterable[Tuple[str, Any]]) -> Iterator[str]:
+    """Emit a mapping given as (key, value) pairs, one top-level key at a time."""
+    return _one_document(dump_yaml({key: value}) for key, value in sections)
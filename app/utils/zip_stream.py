@@ -0,0 +1,57 @@
+import io
+import time
+import zipfile
+from typing import Iterable, Iterator, Tuple
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, non-seekable buffer drained by the streaming generator."""
+
+    def __init__(self):
+        self._chunks = []
+        self.size = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        self.size = 0
+        return data
+
+
+def stream_zip(
+    members: Iterable[Tuple[str, Iterable[str]]],
+    chunk_size: int = 64 * 1024,
+) -> Iterator[bytes]:
+    """
+    Yield a ZIP archive as bytes while it is being written.
+
+    `members` yields (archive name, text chunks) pairs and is consumed
+    lazily, one member at a time. Compressed bytes are handed out as soon
+    as `chunk_size` of them are buffered, so memory stays bounded by a
+    single chunk rather than the whole archive.
+    """
+    sink = _ChunkSink()
+
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        for name, chunks in members:
+            info = zipfile.ZipInfo(name, date_time=time.localtime(time.time())[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.external_attr = 0o600 << 16
+
+            with zip_file.open(info, "w") as member:
+                for chunk in chunks:
+                    member.write(chunk.encode("utf-8"))
+                    if sink.size >= chunk_size:
+                        yield sink.drain()
+
+            yield sink.drain()
+
+    yield sink.drain()
@@ -0,0 +1,157 @@
+"""
+EXPLAIN ANALYZE the hot access paths with and without the indexes of
+migration 8d41b7e2c9a3 (access_path_indexes).
+
+Builds a synthetic version (1M intent examples and 200k story steps by
+default, see scripts.benchmark_version_delete) and prints the plans of:
+
+  * examples     - one localization's examples in export order
+  * story steps  - one story's steps in timeline order
+  * intent delete - deleting an intent, whose foreign key check scans
+                    story_steps.intent_id and rule_steps.intent_id
+
+"before" runs in a transaction that swaps the migration's indexes back to
+the previous ones and is rolled back, so the schema is left unchanged. It
+holds exclusive locks on the affected tables meanwhile: do not run this
+against a database in use.
+
+Usage:
+    python -m scripts.benchmark_indexes [--examples N] [--steps N]
+"""
+
+import argparse
+import importlib.util
+from pathlib import Path
+
+from sqlalchemy import text
+
+from app.db.engine import SessionLocal, engine
+from app.models import Version
+from app.services.promotion_helpers import drop_version
+from scripts.benchmark_version_delete import cleanup, seed_version
+
+MIGRATION = (
+    Path(__file__).resolve().parents[1]
+    / "alembic"
+    / "versions"
+    / "8d41b7e2c9a3_access_path_indexes.py"
+)
+
+QUERIES = {
+    "examples": """
+        SELECT id, example FROM intent_examples
+        WHERE intent_localization_id = :localization_id
+        ORDER BY created_at
+    """,
+    "story steps": """
+        SELECT id, step_type FROM story_steps
+        WHERE story_id = :story_id
+        ORDER BY timeline_index, step_order
+    """,
+    "intent delete": """
+        DELETE FROM intents WHERE id = :intent_id
+    """,
+}
+
+
+def load_migration():
+    spec = importlib.util.spec_from_file_location("access_path_indexes", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def drop_new_indexes(conn, migration):
+    """Put the indexes back as they were before the migration."""
+    for table, name, _, _ in migration.FOREIGN_KEY_INDEXES:
+        conn.execute(text(f"DROP INDEX {name}"))
+    for table, old_name, old_columns, new_name, _ in migration.REPLACED_INDEXES:
+        conn.execute(text(f"CREATE INDEX {old_name} ON {table} ({', '.join(old_columns)})"))
+        conn.execute(text(f"DROP INDEX {new_name}"))
+
+
+def explain_all(conn, params) -> dict:
+    plans = {}
+    for label, sql in QUERIES.items():
+        rows = conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}"), params)
+        plans[label] = [row[0] for row in rows]
+    return plans
+
+
+def pick_params(db, version_id: str) -> dict:
+    """A localization, a story and an intent no step refers to."""
+    return db.execute(
+        text(
+            """
+        SELECT
+            (SELECT il.id FROM intent_localizations il
+             JOIN intents i ON i.id = il.intent_id
+             WHERE i.version_id = :vid LIMIT 1) AS localization_id,
+            (SELECT id FROM stories WHERE version_id = :vid LIMIT 1) AS story_id,
+            (SELECT i.id FROM intents i
+             WHERE i.version_id = :vid
+               AND NOT EXISTS (SELECT 1 FROM story_steps ss WHERE ss.intent_id = i.id)
+             LIMIT 1) AS intent_id
+    """
+        ),
+        {"vid": version_id},
+    ).mappings().one()
+
+
+def execution_time(lines) -> str:
+    """The Execution Time line of a plan (it includes trigger time)."""
+    for line in lines:
+        if line.startswith("Execution Time:"):
+            return line.split(":", 1)[1].strip()
+    return "?"
+
+
+def print_plans(label: str, plans: dict):
+    print(f"===== {label} =====")
+    for query, lines in plans.items():
+        print(f"--- {query}")
+        print("\n".join(lines))
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--examples", type=int, default=1_000_000)
+    parser.add_argument("--steps", type=int, default=200_000)
+    args = parser.parse_args()
+
+    migration = load_migration()
+    db = SessionLocal()
+    version_id = seed_version(db, args.examples, args.steps)
+    try:
+        params = dict(pick_params(db, version_id))
+        db.commit()
+
+        with engine.connect() as conn:
+            conn.execute(text("ANALYZE"))
+            conn.commit()
+
+            with conn.begin() as trans:
+                drop_new_indexes(conn, migration)
+                before = explain_all(conn, params)
+                trans.rollback()
+
+            with conn.begin() as trans:
+                after = explain_all(conn, params)
+                trans.rollback()
+    finally:
+        db.rollback()
+        drop_version(db, db.get(Version, version_id))
+        db.commit()
+        cleanup(db)
+        db.close()
+
+    print(f"examples={args.examples} story_steps={args.steps}\n")
+    print_plans("before", before)
+    print_plans("after", after)
+    for query in QUERIES:
+        print(f"{query:14} {execution_time(before[query]):>12} -> {execution_time(after[query])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Benchmark story loading for the stories.yml export.
+
+Builds a synthetic version (5k stories of 8 steps by default, with two
+entity annotations per intent step and two slot events per slot step) and
+compares, by rows read from the database and time:
+
+  * joinedload     - Story.steps joinedloaded with all six relationships
+  * selectinload   - the same relationships loaded with one IN query each
+  * flat           - app.utils.flow_loader, one flat query per table
+
+Usage:
+    python -m scripts.benchmark_story_export [--stories N] [--steps N]
+"""
+
+import argparse
+import time
+import uuid
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.db.engine import SessionLocal
+from app.models import Story, StoryStep, StorySlotEvent, Version
+from app.models.story import StoryStepEntity
+from app.services.promotion_helpers import drop_version
+from app.utils.flow_loader import iter_story_rows
+from app.utils.story_yaml_writer import iter_story_blocks
+
+
+def seed_version(db, stories: int, steps: int) -> str:
+    """Create a throwaway project/version filled with synthetic stories."""
+
+    project_id = str(uuid.uuid4())
+    version_id = str(uuid.uuid4())
+    params = {
+        "pid": project_id,
+        "vid": version_id,
+        "code": f"bench-{project_id[:8]}",
+        "stories": stories,
+        "steps": steps,
+    }
+
+    db.execute(
+        text(
+            """
+        INSERT INTO projects (id, project_code, project_name)
+        VALUES (:pid, :code, :code)
+    """
+        ),
+        params,
+    )
+    db.execute(
+        text(
+            """
+        INSERT INTO versions (id, project_id, version_label, status)
+        VALUES (:vid, :pid, 'bench', 'archived')
+    """
+        ),
+        params,
+    )
+
+    # Domain objects referenced by the steps, 20 of each
+    for table, columns, values in (
+        ("intents", "intent_name", "'intent_' || n"),
+        ("responses", "name", "'utter_' || n"),
+        ("actions", "name", "'action_' || n"),
+        ("slots", "name, slot_type", "'slot_' || n, 'text'"),
+        ("entities", "entity_key, entity_type", "'entity_' || n, 'text'"),
+    ):
+        db.execute(
+            text(
+                f"""
+            INSERT INTO {table} (id, version_id, {columns})
+            SELECT gen_random_uuid()::text, :vid, {values}
+            FROM generate_series(0, 19) AS n
+        """
+            ),
+            params,
+        )
+
+    db.execute(
+        text(
+            """
+        INSERT INTO stories (id, version_id, name)
+        SELECT gen_random_uuid()::text, :vid, 'story_' || n
+        FROM generate_series(1, :stories) AS n
+    """
+        ),
+        params,
+    )
+
+    # Steps cycle through intent, response, slot and custom action
+    db.execute(
+        text(
+            """
+        WITH
+            i AS (SELECT array_agg(id) AS ids FROM intents WHERE version_id = :vid),
+            r AS (SELECT array_agg(id) AS ids FROM responses WHERE version_id = :vid),
+            a AS (SELECT array_agg(id) AS ids FROM actions WHERE version_id = :vid)
+        INSERT INTO story_steps (
+            id, story_id, timeline_index, step_order, step_type,
+            intent_id, response_id, action_id
+        )
+        SELECT
+            gen_random_uuid()::text, s.id, 0, n,
+            (ARRAY['intent', 'action', 'slot', 'action'])[n % 4 + 1],
+            CASE WHEN n % 4 = 0 THEN i.ids[n % 20 + 1] END,
+            CASE WHEN n % 4 = 1 THEN r.ids[n % 20 + 1] END,
+            CASE WHEN n % 4 = 3 THEN a.ids[n % 20 + 1] END
+        FROM stories s
+        CROSS JOIN generate_series(0, :steps - 1) AS n
+        CROSS JOIN i CROSS JOIN r CROSS JOIN a
+        WHERE s.version_id = :vid
+    """
+        ),
+        params,
+    )
+    db.execute(
+        text(
+            """
+        WITH e AS (SELECT array_agg(id) AS ids FROM entities WHERE version_id = :vid)
+        INSERT INTO story_step_entities (id, story_step_id, entity_id, value)
+        SELECT gen_random_uuid()::text, t.id, e.ids[(t.step_order + k) % 20 + 1],
+               CASE WHEN k = 0 THEN 'value' END
+        FROM story_steps t
+        JOIN stories s ON s.id = t.story_id
+        CROSS JOIN generate_series(0, 1) AS k
+        CROSS JOIN e
+        WHERE s.version_id = :vid AND t.step_type = 'intent'
+    """
+        ),
+        params,
+    )
+    db.execute(
+        text(
+            """
+        WITH sl AS (SELECT array_agg(id) AS ids FROM slots WHERE version_id = :vid)
+        INSERT INTO story_slot_events (id, story_step_id, slot_id, value)
+        SELECT gen_random_uuid()::text, t.id, sl.ids[(t.step_order + k) % 20 + 1], 'v' || k
+        FROM story_steps t
+        JOIN stories s ON s.id = t.story_id
+        CROSS JOIN generate_series(0, 1) AS k
+        CROSS JOIN sl
+        WHERE s.version_id = :vid AND t.step_type = 'slot'
+    """
+        ),
+        params,
+    )
+
+    db.commit()
+    return version_id
+
+
+def cleanup(db, version_id: str):
+    db.rollback()
+    drop_version(db, db.get(Version, version_id))
+    db.execute(text("DELETE FROM projects WHERE project_code LIKE 'bench-%'"))
+    db.commit()
+
+
+def eager_loaded(db, version_id: str, loader):
+    options = [
+        loader(Story.steps).options(
+            loader(StoryStep.intent),
+            loader(StoryStep.action),
+            loader(StoryStep.response),
+            loader(StoryStep.form),
+            loader(StoryStep.slot_events).options(loader(StorySlotEvent.slot)),
+            loader(StoryStep.entities).options(loader(StoryStepEntity.entity)),
+        )
+    ]
+    return (
+        db.query(Story)
+        .options(*options)
+        .filter(Story.version_id == version_id)
+        .order_by(Story.name)
+        .all()
+    )
+
+
+def flat_loaded(db, version_id: str) -> int:
+    """Load every story with the flat loader; returns the rows read."""
+    rows = 0
+    for _, steps, slot_events, entities in iter_story_rows(db, version_id):
+        rows += 1 + len(steps)
+        rows += sum(len(events) for events in slot_events.values())
+        rows += sum(len(annotations) for annotations in entities.values())
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--stories", type=int, default=5_000)
+    parser.add_argument("--steps", type=int, default=8, help="steps per story")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+
+    # Rows returned by client-side cursors; the flat loader counts its own
+    fetched = []
+
+    def count_rows(conn, cursor, statement, parameters, context, executemany):
+        if cursor.rowcount > 0:
+            fetched.append(cursor.rowcount)
+
+    event.listen(db.bind, "after_cursor_execute", count_rows)
+
+    version_id = seed_version(db, args.stories, args.steps)
+    results = []
+    try:
+        for name, loader in (("joinedload", joinedload), ("selectinload", selectinload)):
+            db.expunge_all()
+            fetched.clear()
+            started = time.perf_counter()
+            eager_loaded(db, version_id, loader)
+            results.append((name, sum(fetched), time.perf_counter() - started))
+
+        db.expunge_all()
+        started = time.perf_counter()
+        rows = flat_loaded(db, version_id)
+        results.append(("flat", rows, time.perf_counter() - started))
+        db.commit()
+
+        started = time.perf_counter()
+        blocks = sum(1 for _ in iter_story_blocks(db, version_id))
+        export = time.perf_counter() - started
+        db.commit()
+    finally:
+        event.remove(db.bind, "after_cursor_execute", count_rows)
+        cleanup(db, version_id)
+        db.close()
+
+    print(f"stories={args.stories} steps_per_story={args.steps}")
+    for name, rows, elapsed in results:
+        print(f"{name:<14} rows={rows:>9}  {elapsed:8.2f}s")
+    print(f"iter_story_blocks ({blocks} stories): {export:8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Benchmark version deletion paths.
+
+Builds a synthetic version (1M intent examples and 200k story steps by
+default) and times:
+
+  * drop_version           - one cascading DELETE in a single transaction
+  * purge_version_chunked  - batched deletes, committed per batch
+
+Usage:
+    python -m scripts.benchmark_version_delete [--examples N] [--steps N]
+"""
+
+import argparse
+import time
+import uuid
+
+from sqlalchemy import text
+
+from app.db.engine import SessionLocal
+from app.models import Version
+from app.services.promotion_helpers import drop_version, purge_version_chunked
+
+
+def seed_version(db, examples: int, steps: int) -> str:
+    """Create a throwaway project/version filled with synthetic rows."""
+
+    project_id = str(uuid.uuid4())
+    version_id = str(uuid.uuid4())
+    params = {
+        "pid": project_id,
+        "vid": version_id,
+        "code": f"bench-{project_id[:8]}",
+        "examples": examples,
+        "steps": steps,
+        "intents": max(examples // 1000, 1),
+        "stories": max(steps // 20, 1),
+    }
+
+    db.execute(
+        text(
+            """
+        INSERT INTO languages (id, language_code, language_name)
+        VALUES (gen_random_uuid()::text, 'bench', 'Benchmark')
+        ON CONFLICT (language_code) DO NOTHING
+    """
+        )
+    )
+    db.execute(
+        text(
+            """
+        INSERT INTO projects (id, project_code, project_name)
+        VALUES (:pid, :code, :code)
+    """
+        ),
+        params,
+    )
+    db.execute(
+        text(
+            """
+        INSERT INTO versions (id, project_id, version_label, status)
+        VALUES (:vid, :pid, 'bench', 'archived')
+    """
+        ),
+        params,
+    )
+
+    db.execute(
+        text(
+            """
+        INSERT INTO intents (id, version_id, intent_name)
+        SELECT gen_random_uuid()::text, :vid, 'intent_' || n
+        FROM generate_series(1, :intents) AS n
+    """
+        ),
+        params,
+    )
+    db.execute(
+        text(
+            """
+        INSERT INTO intent_localizations (id, intent_id, language_id)
+        SELECT gen_random_uuid()::text, i.id, l.id
+        FROM intents i
+        CROSS JOIN languages l
+        WHERE i.version_id = :vid AND l.language_code = 'bench'
+    """
+        ),
+        params,
+    )
+    db.execute(
+        text(
+            """
+        INSERT INTO intent_examples (id, intent_localization_id, example)
+        SELECT gen_random_uuid()::text, il.id, 'example ' || n
+        FROM intent_localizations il
+        JOIN intents i ON i.id = il.intent_id
+        CROSS JOIN generate_series(1, :examples / :intents) AS n
+        WHERE i.version_id = :vid
+    """
+        ),
+        params,
+    )
+
+    db.execute(
+        text(
+            """
+        INSERT INTO stories (id, version_id, name)
+        SELECT gen_random_uuid()::text, :vid, 'story_' || n
+        FROM generate_series(1, :stories) AS n
+    """
+        ),
+        params,
+    )
+    db.execute(
+        text(
+            """
+        INSERT INTO story_steps (
+            id, story_id, timeline_index, step_order, step_type, intent_id
+        )
+        SELECT gen_random_uuid()::text, s.id, 0, n, 'intent',
+               (SELECT id FROM intents WHERE version_id = :vid LIMIT 1)
+        FROM stories s
+        CROSS JOIN generate_series(1, :steps / :stories) AS n
+        WHERE s.version_id = :vid
+    """
+        ),
+        params,
+    )
+
+    db.commit()
+    return version_id
+
+
+def cleanup(db):
+    db.execute(text("DELETE FROM projects WHERE project_code LIKE 'bench-%'"))
+    db.execute(text("DELETE FROM languages WHERE language_code = 'bench'"))
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--examples", type=int, default=1_000_000)
+    parser.add_argument("--steps", type=int, default=200_000)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        version_id = seed_version(db, args.examples, args.steps)
+        started = time.perf_counter()
+        drop_version(db, db.get(Version, version_id))
+        db.commit()
+        single = time.perf_counter() - started
+        cleanup(db)
+
+        version_id = seed_version(db, args.examples, args.steps)
+        started = time.perf_counter()
+        purge_version_chunked(version_id)
+        chunked = time.perf_counter() - started
+        cleanup(db)
+    finally:
+        db.close()
+
+    print(f"examples={args.examples} story_steps={args.steps}")
+    print(f"drop_version (single cascade):  {single:8.2f}s")
+    print(f"purge_version_chunked:          {chunked:8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Check that the streamed YAML emitters write what one `yaml.dump` of the
+whole document writes.
+
+stream_yaml_list and stream_yaml_sections dump batches and sections as
+separate documents and concatenate them. This renders random payloads
+(multi-line strings, strings ending in blank lines, which PyYAML writes as
+open-ended `|+` scalars, quoted and non-ASCII strings) both ways and
+compares the text, and that the streamed text loads back to the payload
+and never has a document end marker (`...`) before the end of the file.
+Needs no database.
+
+Usage:
+    python -m scripts.check_yaml_stream [--cases N] [--seed N]
+"""
+
+import argparse
+import random
+import sys
+
+import yaml
+
+from app.utils.yaml_stream import (
+    DOCUMENT_END,
+    dump_yaml,
+    stream_yaml_list,
+    stream_yaml_sections,
+)
+
+PIECES = ["hello", "", " ", "a: b", "- x", "#", "'", '"', "ü", "\t", "...", "---"]
+ENDINGS = ["", "\n", "\n\n", "\n\n\n", " \n\n"]
+
+
+def random_string(rng: random.Random) -> str:
+    lines = [rng.choice(PIECES) for _ in range(rng.randint(1, 3))]
+    return "\n".join(lines) + rng.choice(ENDINGS)
+
+
+def random_value(rng: random.Random, depth: int = 0):
+    kind = rng.random()
+    if depth > 2 or kind < 0.5:
+        return random_string(rng) if rng.random() < 0.8 else rng.randint(0, 9)
+    if kind < 0.75:
+        return [random_value(rng, depth + 1) for _ in range(rng.randint(0, 3))]
+    return {f"k{i}": random_value(rng, depth + 1) for i in range(rng.randint(0, 3))}
+
+
+def without_document_end(text: str) -> str:
+    if text.endswith("\n" + DOCUMENT_END):
+        return text[: -len(DOCUMENT_END)]
+    return text
+
+
+def check(label: str, expected, chunks) -> bool:
+    """
+    The streamed text must load to the payload and match the one-shot dump
+    line for line. Only the final `...` may differ: whether yaml.dump writes
+    it after an open-ended scalar depends on the emitter it picked.
+    """
+    streamed = "".join(chunks)
+    whole = dump_yaml(expected)
+    if "\n" + DOCUMENT_END in without_document_end(streamed):
+        print(f"--- {label}: document end marker before the end of the file")
+        print(f"streamed: {streamed!r}")
+        return False
+    if (
+        without_document_end(streamed) == without_document_end(whole)
+        and yaml.safe_load(streamed) == yaml.safe_load(whole) == expected
+    ):
+        return True
+    print(f"--- {label}: streamed output differs")
+    print(f"payload:  {expected!r}")
+    print(f"one-shot: {whole!r}")
+    print(f"streamed: {streamed!r}")
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cases", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    failures = 0
+    for case in range(args.cases):
+        items = [random_value(rng) for _ in range(rng.randint(0, 6))]
+        batch_size = rng.randint(1, 4)
+        if not check(
+            f"list #{case} (batch_size={batch_size})",
+            {"version": "3.1", "nlu": items},
+            stream_yaml_list({"version": "3.1"}, "nlu", items, batch_size=batch_size),
+        ):
+            failures += 1
+
+        sections = [(f"s{i}", random_value(rng)) for i in range(rng.randint(1, 4))]
+        if not check(
+            f"sections #{case}",
+            dict(sections),
+            stream_yaml_sections(sections),
+        ):
+            failures += 1
+
+    print(f"{2 * args.cases} documents, {failures} mismatches")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
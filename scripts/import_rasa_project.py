@@ -0,0 +1,62 @@
+"""
+Import a Rasa project into a project's draft version.
+
+PATH is a project directory (with domain.yml and data/) or a ZIP archive,
+such as the one produced by the ZIP export. The draft must be empty unless
+--replace is given.
+
+Usage:
+    python -m scripts.import_rasa_project PROJECT_CODE PATH [--replace] [--language CODE]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from fastapi import HTTPException
+
+from app.db.engine import SessionLocal
+from app.services.import_service import import_rasa_project, import_rasa_zip
+from app.utils.rasa_project_reader import RasaProjectFiles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("project_code")
+    parser.add_argument("path")
+    parser.add_argument("--replace", action="store_true", help="replace the draft's content")
+    parser.add_argument(
+        "--language", help="language of NLU files not named nlu_<code>.yml"
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    start = time.perf_counter()
+    try:
+        if os.path.isdir(args.path):
+            files = RasaProjectFiles.from_directory(args.path)
+            result = import_rasa_project(
+                db, args.project_code, files, args.replace, args.language
+            )
+        else:
+            with open(args.path, "rb") as archive:
+                result = import_rasa_zip(
+                    db, args.project_code, archive, args.replace, args.language
+                )
+    except HTTPException as e:
+        db.rollback()
+        print(f"error: {e.detail}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        db.close()
+
+    print(f"imported into version {result['version_id']} in {time.perf_counter() - start:.1f}s")
+    for table, rows in sorted(result["counts"].items()):
+        print(f"  {table:24} {rows:>10}")
+    for warning in result["warnings"]:
+        print(f"warning: {warning}")
+
+
+if __name__ == "__main__":
+    main()